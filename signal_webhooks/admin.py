@@ -6,10 +6,13 @@
 from django import forms
 from django.contrib import admin
 
+from .breaker import circuit_breakers
 from .settings import webhook_settings
 from .utils import get_webhook_model
 
 if TYPE_CHECKING:
+    from django.http import HttpRequest
+
     from .typing import Any, Union
 
 __all__ = [
@@ -80,6 +83,17 @@ class WebhookAdmin(admin.ModelAdmin):
         "last_failure",
     ]
 
+    def get_list_display(self, request: HttpRequest) -> list[str]:
+        list_display = list(super().get_list_display(request))
+        if webhook_settings.CIRCUIT_BREAKER:
+            list_display.insert(list_display.index("enabled"), "circuit_breaker")
+        return list_display
+
+    @admin.display(description="circuit breaker")
+    def circuit_breaker(self, obj: WebhookModel) -> str:
+        # Breakers are process-local, so this is the state in the process serving the admin.
+        return circuit_breakers.state(obj.endpoint)
+
     def lookup_allowed(self, lookup: str, value: str) -> bool:  # pragma: no cover
         # Don't allow lookups involving auth tokens
         return not lookup.startswith("auth_token") and super().lookup_allowed(lookup, value)
@@ -28,6 +28,8 @@ class Meta:
             "auth_token",
             "enabled",
             "keep_last_response",
+            "max_attempts",
+            "rate_limit",
         ]
 
     def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
@@ -1,13 +1,71 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from django.apps import AppConfig
+from django.core.signals import request_finished, request_started
+from django.db.models.signals import post_delete, post_save
+from django.test.signals import setting_changed
+
+from .settings import SETTING_NAME
+
+if TYPE_CHECKING:
+    from .typing import Any
 
 __all__ = [
     "DjangoSignalWebhooksConfig",
 ]
 
 
+def reset_state_on_setting_changed(**kwargs: Any) -> None:
+    """Clear module level state that depends on the webhook settings."""
+    if kwargs["setting"] != SETTING_NAME:
+        return
+
+    from .breaker import circuit_breakers  # noqa: PLC0415
+    from .cache import webhook_cache  # noqa: PLC0415
+    from .delivery import delivery_loop  # noqa: PLC0415
+    from .ratelimit import rate_limiter  # noqa: PLC0415
+
+    webhook_cache.clear()
+    delivery_loop.reset_client()
+    circuit_breakers.clear()
+    rate_limiter.clear()
+
+
 class DjangoSignalWebhooksConfig(AppConfig):
     name = "signal_webhooks"
     verbose_name = "Django Signal Webhooks"
     default_auto_field = "django.db.models.BigAutoField"
+
+    def ready(self) -> None:
+        from .cache import webhook_cache  # noqa: PLC0415
+        from .handlers import connect_receivers, reconnect_receivers_on_setting_changed  # noqa: PLC0415
+        from .memo import payload_memo  # noqa: PLC0415
+        from .utils import get_webhook_model  # noqa: PLC0415
+
+        connect_receivers()
+        setting_changed.connect(
+            reconnect_receivers_on_setting_changed,
+            dispatch_uid="django-signal-webhooks-reconnect-receivers",
+        )
+
+        webhook_model = get_webhook_model()
+        post_save.connect(
+            webhook_cache.invalidate,
+            sender=webhook_model,
+            dispatch_uid="django-signal-webhooks-cache-post-save",
+        )
+        post_delete.connect(
+            webhook_cache.invalidate,
+            sender=webhook_model,
+            dispatch_uid="django-signal-webhooks-cache-post-delete",
+        )
+
+        request_started.connect(payload_memo.start, dispatch_uid="django-signal-webhooks-memo-request-started")
+        request_finished.connect(payload_memo.end, dispatch_uid="django-signal-webhooks-memo-request-finished")
+        setting_changed.connect(
+            reset_state_on_setting_changed,
+            dispatch_uid="django-signal-webhooks-reset-state",
+        )
+        setting_changed.connect(payload_memo.clear, dispatch_uid="django-signal-webhooks-memo-setting-changed")
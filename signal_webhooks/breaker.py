@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from threading import Lock
+from typing import TYPE_CHECKING
+
+from .settings import webhook_settings
+from .utils import endpoint_host
+
+if TYPE_CHECKING:
+    from .typing import Literal
+
+    BreakerState = Literal["closed", "open", "half-open"]
+    Permit = Literal["request", "probe"]
+
+
+__all__ = [
+    "CircuitBreaker",
+    "CircuitBreakers",
+    "circuit_breakers",
+]
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for a webhook endpoint.
+
+    The breaker is 'closed' while requests are succeeding. The results of the latest
+    'SIGNAL_WEBHOOKS.CIRCUIT_BREAKER_WINDOW' requests are kept, and when at least
+    'SIGNAL_WEBHOOKS.CIRCUIT_BREAKER_MIN_REQUESTS' of them have been made and the rate
+    of failures reaches 'SIGNAL_WEBHOOKS.CIRCUIT_BREAKER_FAILURE_RATE', the breaker 'opens'.
+
+    While the breaker is open, requests are not made at all. After
+    'SIGNAL_WEBHOOKS.CIRCUIT_BREAKER_RESET_TIMEOUT' seconds, the breaker becomes 'half-open',
+    and a single probe request is allowed. If the probe succeeds, the breaker closes again,
+    otherwise it opens for another timeout.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._results: deque[bool] = deque(maxlen=webhook_settings.CIRCUIT_BREAKER_WINDOW)
+        self._opened_at: float | None = None
+        self._probing: bool = False
+
+    @property
+    def state(self) -> BreakerState:
+        if self._opened_at is None:
+            return "closed"
+        if self.retry_after > 0:
+            return "open"
+        return "half-open"
+
+    @property
+    def retry_after(self) -> float:
+        """Number of seconds until the breaker becomes half-open. Zero if not open."""
+        if self._opened_at is None:
+            return 0.0
+        elapsed = time.monotonic() - self._opened_at
+        return max(webhook_settings.CIRCUIT_BREAKER_RESET_TIMEOUT - elapsed, 0.0)
+
+    def allow_request(self) -> bool:
+        """Can a request be made to the endpoint? In half-open state, only one probe request is allowed."""
+        return self.acquire() is not None
+
+    def acquire(self) -> Permit | None:
+        """
+        Acquire permission for a request to the endpoint, or None if the request is not allowed.
+
+        In half-open state, only one probe request is allowed. After its result is recorded
+        or not, the probe must be released with 'release_probe', so that a probe that didn't
+        finish, e.g., because it was cancelled, doesn't keep the breaker from ever closing.
+        """
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return "request"
+            if state == "open" or self._probing:
+                return None
+            self._probing = True
+            return "probe"
+
+    def release_probe(self) -> None:
+        with self._lock:
+            self._probing = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                self._results.clear()
+            self._results.append(True)
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._results.append(False)
+            if self._opened_at is not None:
+                # Probe failed, or a request started before the breaker opened failed.
+                self._opened_at = time.monotonic()
+                self._probing = False
+                return
+
+            if len(self._results) < webhook_settings.CIRCUIT_BREAKER_MIN_REQUESTS:
+                return
+
+            failure_rate = self._results.count(False) / len(self._results)
+            if failure_rate >= webhook_settings.CIRCUIT_BREAKER_FAILURE_RATE:
+                self._opened_at = time.monotonic()
+
+
+class CircuitBreakers:
+    """Process-local circuit breakers by endpoint or endpoint host, see 'SIGNAL_WEBHOOKS.CIRCUIT_BREAKER_SCOPE'."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, endpoint: str) -> CircuitBreaker:
+        key = self.key_for(endpoint)
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(key, CircuitBreaker())
+        return breaker
+
+    def state(self, endpoint: str) -> BreakerState:
+        breaker = self._breakers.get(self.key_for(endpoint))
+        return "closed" if breaker is None else breaker.state
+
+    @staticmethod
+    def key_for(endpoint: str) -> str:
+        if webhook_settings.CIRCUIT_BREAKER_SCOPE == "endpoint":
+            return endpoint
+        return endpoint_host(endpoint)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._breakers.clear()
+
+
+circuit_breakers = CircuitBreakers()
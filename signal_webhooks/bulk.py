@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from contextvars import ContextVar
+from typing import TYPE_CHECKING
+
+from django.db import models, transaction
+
+from .handlers import bulk_webhook_handler, find_hook_handler, should_defer, watched_fields_updated
+from .settings import webhook_settings
+
+if TYPE_CHECKING:
+    from .typing import Any, Iterable, Method, Sequence
+
+
+__all__ = [
+    "BulkWebhookQuerySet",
+    "BulkWebhookQuerySetMixin",
+]
+
+
+# Set during 'bulk_update', which uses 'update' internally.
+_in_bulk_update: ContextVar[bool] = ContextVar("in_bulk_update", default=False)
+
+
+class BulkWebhookQuerySetMixin:
+    """
+    Queryset mixin that sends webhooks for 'bulk_create', 'bulk_update' and 'update'.
+
+    Django doesn't send model signals for these operations, so no webhooks are sent for them
+    by default. With this mixin, each call sends a single webhook with a list of all the created
+    or updated instances. Updated instances are fetched again in a single query after the update.
+
+    Instances are grouped by their 'SIGNAL_WEBHOOKS.FILTER_KWARGS', and each group is sent
+    to the webhooks found for it. The first instance in a group is the instance passed to custom hooks.
+    """
+
+    model: type[models.Model]
+    db: str
+
+    def bulk_create(self, objs: Iterable[models.Model], *args: Any, **kwargs: Any) -> list[models.Model]:
+        objs = super().bulk_create(objs, *args, **kwargs)
+        if self._should_send_webhooks("CREATE"):
+            # Created rows don't have any many-to-many relations yet, so don't query them for each row.
+            # With 'update_conflicts', existing rows might have been updated instead.
+            if not kwargs.get("update_conflicts", False):
+                for obj in objs:
+                    obj._prefetched_objects_cache = {field.name: [] for field in self.model._meta.many_to_many}
+            self._send_webhooks(objs, "CREATE")
+        return objs
+
+    def bulk_update(self, objs: Iterable[models.Model], fields: Sequence[str], *args: Any, **kwargs: Any) -> int:
+        objs = tuple(objs)
+        token = _in_bulk_update.set(True)
+        try:
+            rows = super().bulk_update(objs, fields, *args, **kwargs)
+        finally:
+            _in_bulk_update.reset(token)
+
+        if self._should_send_webhooks("UPDATE", fields):
+            self._send_webhooks([obj.pk for obj in objs], "UPDATE")
+        return rows
+
+    def update(self, **kwargs: Any) -> int:
+        if _in_bulk_update.get() or not self._should_send_webhooks("UPDATE", kwargs):
+            return super().update(**kwargs)
+
+        # Find the updated rows before updating, since the update can change which rows match the filters.
+        pks = list(self.values_list("pk", flat=True))
+        rows = super().update(**kwargs)
+        self._send_webhooks(pks, "UPDATE")
+        return rows
+
+    def _should_send_webhooks(self, method: Method, update_fields: Iterable[str] | None = None) -> bool:
+        if find_hook_handler(self.model, method) is None:
+            return False
+        return update_fields is None or watched_fields_updated(self.model, frozenset(update_fields))
+
+    def _send_webhooks(self, objs_or_pks: list[Any], method: Method) -> None:
+        if not objs_or_pks:
+            return
+
+        def send() -> None:
+            instances = objs_or_pks if method == "CREATE" else self._fetch(objs_or_pks)
+            bulk_webhook_handler(instances, method)
+
+        if should_defer():
+            transaction.on_commit(send, using=self.db)
+            return
+
+        send()
+
+    def _fetch(self, pks: list[Any]) -> list[models.Model]:
+        serialized_fields = webhook_settings.serialized_fields.get(self.model)
+        m2m_fields = [
+            field.name
+            for field in self.model._meta.many_to_many
+            if serialized_fields is None or field.name in serialized_fields
+        ]
+        queryset = self.model._base_manager.using(self.db).filter(pk__in=pks)
+        return list(queryset.prefetch_related(*m2m_fields))
+
+
+class BulkWebhookQuerySet(BulkWebhookQuerySetMixin, models.QuerySet):
+    """Queryset that sends webhooks for 'bulk_create', 'bulk_update' and 'update'."""
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import copy
+import logging
+import time
+import uuid
+from functools import partial
+from threading import Lock
+from typing import TYPE_CHECKING
+from weakref import WeakSet
+
+from django.core.cache import caches
+from django.db import connections, router, transaction
+
+from .settings import webhook_settings
+from .utils import get_webhook_model, reference_for_model
+
+if TYPE_CHECKING:
+    from django.db.backends.base.base import BaseDatabaseWrapper
+    from django.db.models import Model
+
+    from .models import WebhookBase
+    from .typing import Any, Hashable, Method
+
+
+__all__ = [
+    "WebhookCache",
+    "get_hooks_for_model",
+    "has_hooks_for_model",
+    "webhook_cache",
+]
+
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookCache:
+    """
+    Process-local cache for enabled webhooks.
+
+    Webhooks are cached by model reference, method, and the filtering arguments
+    from 'SIGNAL_WEBHOOKS.FILTER_KWARGS'. The cache is cleared when any webhook
+    is saved or deleted, and again when the transaction of the change is committed,
+    or when the webhook settings change.
+
+    If 'SIGNAL_WEBHOOKS.CACHE_HOOKS_BACKEND' is set, a generation token is kept in
+    that Django cache. Saving or deleting a webhook in any process replaces the token,
+    and every process clears its local cache when it sees a token it didn't have before.
+    """
+
+    def __init__(self) -> None:
+        self._hooks: dict[Hashable, list[WebhookBase]] = {}
+        self._lock = Lock()
+        self._generation: str | None = None
+        self._checked_at: float | None = None
+        # Incremented when the cache is cleared, so that webhooks fetched before that are not stored.
+        self._version: int = 0
+        # Connections with uncommitted changes to webhooks.
+        self._dirty: WeakSet[BaseDatabaseWrapper] = WeakSet()
+
+    def get_hooks(self, instance: Model, method: Method, *, copy_hooks: bool = True) -> list[WebhookBase]:
+        self.check_generation()
+        version = self._version
+
+        webhook_model = get_webhook_model()
+        ref = reference_for_model(type(instance))
+        kwargs: dict[str, Any] = webhook_settings.FILTER_KWARGS(instance, method)
+
+        try:
+            key = (ref, method, frozenset(kwargs.items()))
+            hash(key)
+        except TypeError:
+            # Filtering arguments contain unhashable values, e.g., lists for '__in' lookups.
+            return list(webhook_model.objects.get_for_ref(ref, method, **kwargs))
+
+        if self.has_uncommitted_changes(webhook_model):
+            # Webhooks can include changes that are rolled back, so don't cache them.
+            return list(webhook_model.objects.get_for_ref(ref, method, **kwargs))
+
+        hooks = self._hooks.get(key)
+        if hooks is None:
+            hooks = list(webhook_model.objects.get_for_ref(ref, method, **kwargs))
+            with self._lock:
+                # Webhooks changed while they were fetched, so they might be outdated.
+                if version == self._version:
+                    self._hooks[key] = hooks
+
+        if not copy_hooks:
+            return hooks
+
+        # Copy the cached hooks so that updating their delivery results
+        # while sending webhooks doesn't modify the cached objects.
+        return [copy.copy(hook) for hook in hooks]
+
+    def has_uncommitted_changes(self, webhook_model: type[WebhookBase]) -> bool:
+        """Does the transaction of the connection webhooks are read from have uncommitted changes to webhooks?"""
+        connection = connections[router.db_for_read(webhook_model)]
+        if connection not in self._dirty:
+            return False
+        if connection.in_atomic_block:
+            return True
+
+        # Transaction was rolled back, since committing it would have marked it clean.
+        self._dirty.discard(connection)
+        return False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._hooks.clear()
+            self._version += 1
+            self._generation = None
+            self._checked_at = None
+
+    def invalidate(self, using: str | None = None, **kwargs: Any) -> None:  # 'kwargs' for signal compatibility
+        """
+        Clear the cache in this process, and in all other processes sharing the same cache backend.
+
+        Inside a transaction, only the cache in this process is cleared right away, and other
+        processes are notified when the transaction is committed, so that they don't re-cache
+        the webhooks before the change is visible to them. Until the commit, webhooks read
+        through the transaction's connection are not cached, since they include changes
+        that might still be rolled back.
+        """
+        connection = transaction.get_connection(using)
+        if not connection.in_atomic_block:
+            self._publish()
+            return
+
+        with self._lock:
+            self._hooks.clear()
+            self._version += 1
+
+        self._dirty.add(connection)
+        connection.on_commit(partial(self._committed, connection))
+
+    def _committed(self, connection: BaseDatabaseWrapper) -> None:
+        self._dirty.discard(connection)
+        self._publish()
+
+    def _publish(self) -> None:
+        alias: str | None = webhook_settings.CACHE_HOOKS_BACKEND
+        if alias is None:
+            self.clear()
+            return
+
+        generation = uuid.uuid4().hex
+        caches[alias].set(webhook_settings.CACHE_HOOKS_GENERATION_KEY, generation, timeout=None)
+
+        with self._lock:
+            self._hooks.clear()
+            self._version += 1
+            self._generation = generation
+            self._checked_at = time.monotonic()
+
+    def check_generation(self) -> None:
+        """Clear the local cache if webhooks have been changed in another process."""
+        alias: str | None = webhook_settings.CACHE_HOOKS_BACKEND
+        if alias is None:
+            return
+
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < webhook_settings.CACHE_HOOKS_CHECK_INTERVAL:
+            return
+
+        cache = caches[alias]
+        key: str = webhook_settings.CACHE_HOOKS_GENERATION_KEY
+        generation: str | None = cache.get(key)
+        if generation is None:
+            # Generation was evicted, or never set. Use a new one, unless another process got there first.
+            cache.add(key, uuid.uuid4().hex, timeout=None)
+            generation = cache.get(key)
+
+        with self._lock:
+            if generation != self._generation:
+                self._hooks.clear()
+                self._version += 1
+                self._generation = generation
+            self._checked_at = now
+
+
+webhook_cache = WebhookCache()
+
+
+def get_hooks_for_model(instance: Model, method: Method) -> list[WebhookBase]:
+    """Get enabled webhooks for the given model instance and method."""
+    if webhook_settings.CACHE_HOOKS:
+        return webhook_cache.get_hooks(instance, method)
+    return list(get_webhook_model().objects.get_for_model(instance, method=method))
+
+
+def has_hooks_for_model(instance: Model, method: Method) -> bool:
+    """Check if there are any enabled webhooks for the given model instance and method."""
+    if webhook_settings.CACHE_HOOKS:
+        return bool(webhook_cache.get_hooks(instance, method, copy_hooks=False))
+    return get_webhook_model().objects.get_for_model(instance, method=method).exists()
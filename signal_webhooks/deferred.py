@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from weakref import WeakKeyDictionary
+
+if TYPE_CHECKING:
+    from django.db.backends.base.base import BaseDatabaseWrapper
+    from django.db.models import Model
+
+    from .typing import Any, Callable, Hashable, Iterable, JSONData, Method
+
+    Handler = Callable[[Model, Method, JSONData | None], None]
+    BatchHandler = Callable[[list[Model], Method, list[JSONData | None]], None]
+
+
+__all__ = [
+    "DeferredWebhooks",
+    "PendingWebhook",
+    "coalesce",
+    "defer_until_commit",
+    "group_by_origin",
+]
+
+
+# Methods that change the model instance itself, and can be coalesced with each other.
+ROW_METHODS: frozenset[str] = frozenset(("CREATE", "UPDATE", "DELETE"))
+
+
+class PendingWebhook:
+    """
+    Model event waiting for the transaction it happened in to be committed.
+
+    Registered as a callback with 'transaction.on_commit', so that it's only called
+    if the savepoint it was created in is not rolled back.
+    """
+
+    __slots__ = ("committed", "data", "instance", "key", "method", "origin")
+
+    def __init__(
+        self,
+        instance: Model,
+        method: Method,
+        data: JSONData | None = None,
+        origin: Any = None,
+    ) -> None:
+        self.instance = instance
+        self.method = method
+        self.data = data
+        # Model instance or queryset a cascading delete started from, if deletes should be batched.
+        self.origin = origin
+        self.committed = False
+        # Events for the model instance itself are coalesced together,
+        # but events for its many-to-many relations are kept separate by method.
+        # Many-to-many events with data only contain their own changes, so they are not coalesced.
+        group: Hashable = method
+        if method in ROW_METHODS:
+            group = "ROW"
+        elif data is not None:
+            group = id(self)
+        self.key: Hashable = (type(instance), instance.pk, group)
+
+    def __call__(self) -> None:
+        self.committed = True
+
+
+class DeferredWebhooks:
+    """
+    Model events waiting for the current transaction of a database connection to be committed.
+
+    Registered as a callback with 'transaction.on_commit', and kept after the callbacks
+    of all pending events, so that when it's called, it knows which events were committed.
+    """
+
+    def __init__(self, connection: BaseDatabaseWrapper, handler: Handler, batch_handler: BatchHandler) -> None:
+        self.connection = connection
+        self.handler = handler
+        self.batch_handler = batch_handler
+        self.events: list[PendingWebhook] = []
+
+    def add(self, event: PendingWebhook) -> None:
+        self.events.append(event)
+        self.connection.on_commit(event)
+
+        entry = self._commit_hook()
+        if entry is None:
+            self.connection.on_commit(self, robust=True)
+            return
+
+        # Move after the event's callback, keeping the savepoints the callback was registered in.
+        self.connection.run_on_commit.remove(entry)
+        self.connection.run_on_commit.append(entry)
+
+    def is_registered(self) -> bool:
+        """Is this still waiting for the transaction to be committed, i.e., not rolled back or already sent?"""
+        return self._commit_hook() is not None
+
+    def __call__(self) -> None:
+        _deferred_by_connection.pop(self.connection, None)
+        events, self.events = self.events, []
+        for batch in group_by_origin(coalesce(event for event in events if event.committed)):
+            # Batched deletes are always sent as a list, so the payload doesn't depend on the number of rows.
+            if batch[0].origin is None:
+                self.handler(batch[0].instance, batch[0].method, batch[0].data)
+                continue
+
+            self.batch_handler([event.instance for event in batch], batch[0].method, [event.data for event in batch])
+
+    def _commit_hook(self) -> Any:
+        return next((entry for entry in self.connection.run_on_commit if entry[1] is self), None)
+
+
+_deferred_by_connection: WeakKeyDictionary[BaseDatabaseWrapper, DeferredWebhooks] = WeakKeyDictionary()
+
+
+def defer_until_commit(
+    connection: BaseDatabaseWrapper,
+    event: PendingWebhook,
+    handler: Handler,
+    batch_handler: BatchHandler,
+) -> None:
+    """
+    Call the handler for the event after the current transaction of the connection is committed.
+    Events with the same origin and model are sent together with the batch handler.
+    """
+    deferred = _deferred_by_connection.get(connection)
+    if deferred is None or not deferred.is_registered():
+        deferred = DeferredWebhooks(connection, handler, batch_handler)
+        _deferred_by_connection[connection] = deferred
+
+    deferred.add(event)
+
+
+def coalesce(events: Iterable[PendingWebhook]) -> list[PendingWebhook]:
+    """
+    Collapse multiple events for the same model instance into a single event.
+
+    The latest event wins, except that a create followed by updates stays a create.
+    Events keep the position of the first event for the same model instance.
+    """
+    coalesced: dict[Hashable, PendingWebhook] = {}
+    for event in events:
+        previous = coalesced.get(event.key)
+        if previous is not None and previous.method == "CREATE" and event.method == "UPDATE":
+            event.method = "CREATE"
+        coalesced[event.key] = event
+
+    return list(coalesced.values())
+
+
+def group_by_origin(events: Iterable[PendingWebhook]) -> list[list[PendingWebhook]]:
+    """
+    Group delete events that have the same origin and model together.
+
+    Other events are kept in their own groups. Groups keep the position of their first event.
+    """
+    groups: dict[Hashable, list[PendingWebhook]] = {}
+    for i, event in enumerate(events):
+        # The origin is kept alive by the events, so its id is unique among them.
+        key = i if event.origin is None else (id(event.origin), type(event.instance))
+        groups.setdefault(key, []).append(event)
+
+    return list(groups.values())
@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import asyncio
+import atexit
+import logging
+import os
+from contextlib import asynccontextmanager
+from threading import Lock, Thread, current_thread
+from typing import TYPE_CHECKING
+
+import httpx
+
+from .limiter import AdaptiveLimiter
+from .settings import webhook_settings
+from .utils import endpoint_host
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+    from concurrent.futures import Future
+
+    from .limiter import LimiterStats
+    from .typing import Any, Coroutine
+
+
+__all__ = [
+    "DeliveryLoop",
+    "delivery_loop",
+]
+
+
+logger = logging.getLogger(__name__)
+
+
+class DeliveryLoop:
+    """
+    Event loop running in a background thread, used for sending webhooks.
+
+    The loop owns a shared http client, so that connections to webhook endpoints
+    can be kept alive and reused between events. The loop and the client are created
+    when they are first needed, closed when the process exits, and discarded in
+    child processes after a fork.
+
+    If 'SIGNAL_WEBHOOKS.CLIENT_MAX_CONNECTIONS_PER_HOST' is set, each endpoint host
+    gets its own client with its own connection pool, and the number of in-flight
+    requests to each host is limited, so that a slow host cannot use up the connections
+    or block the requests to other hosts.
+
+    If 'SIGNAL_WEBHOOKS.ADAPTIVE_CONCURRENCY' is enabled, the number of in-flight requests
+    to each host is limited by an 'AdaptiveLimiter' instead, which adjusts the limit based on
+    the results recorded with 'record_result'.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: Thread | None = None
+        self._client: httpx.AsyncClient | None = None
+        self._host_clients: dict[str, httpx.AsyncClient] = {}
+        self._host_limiters: dict[str, asyncio.Semaphore | AdaptiveLimiter] = {}
+        # Number of requests using each client, and replaced clients to close when they are no longer in use.
+        # Only accessed in the delivery loop.
+        self._in_use: dict[httpx.AsyncClient, int] = {}
+        self._retired: set[httpx.AsyncClient] = set()
+        self._closing: set[asyncio.Task] = set()
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = Thread(target=self._run_forever, args=(loop,), name="django-signal-webhooks", daemon=True)
+                thread.start()
+                self._loop = loop
+                self._thread = thread
+            return self._loop
+
+    def run(self, coro: Coroutine[Any, Any, Any]) -> Any:
+        """Run the given coroutine in the delivery loop, and wait for its result."""
+        loop = self.start()
+        if current_thread() is self._thread:
+            coro.close()
+            msg = "Cannot wait for a coroutine in the delivery loop from the delivery loop itself."
+            raise RuntimeError(msg)
+
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    def submit(self, coro: Coroutine[Any, Any, Any]) -> Future:
+        """Schedule the given coroutine in the delivery loop without waiting for it."""
+        loop = self.start()
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        future.add_done_callback(_log_exception)
+        return future
+
+    @asynccontextmanager
+    async def client(self) -> AsyncGenerator[httpx.AsyncClient, None]:
+        """
+        Get an http client for sending webhooks.
+
+        In the delivery loop, the shared client is returned. In other event loops,
+        a new client is created and closed after use, since the shared client's
+        connections cannot be used from other event loops.
+        """
+        if asyncio.get_running_loop() is not self._loop:
+            async with build_client() as client:
+                yield client
+            return
+
+        if self._client is None:
+            self._client = build_client()
+
+        async with self._using(self._client) as client:
+            yield client
+
+    @asynccontextmanager
+    async def host_client(self, client: httpx.AsyncClient, endpoint: str) -> AsyncGenerator[httpx.AsyncClient, None]:
+        """
+        Get an http client for sending a webhook to the given endpoint.
+
+        If 'SIGNAL_WEBHOOKS.CLIENT_MAX_CONNECTIONS_PER_HOST' is set, waits until the number of
+        in-flight requests to the endpoint's host is below the limit, and returns the client for
+        that host. If 'SIGNAL_WEBHOOKS.ADAPTIVE_CONCURRENCY' is enabled, the limit is adjusted
+        based on the results of the requests. Otherwise, or outside the delivery loop,
+        the given client is returned.
+        """
+        limit: int | None = webhook_settings.CLIENT_MAX_CONNECTIONS_PER_HOST
+        adaptive: bool = webhook_settings.ADAPTIVE_CONCURRENCY
+        if (limit is None and not adaptive) or asyncio.get_running_loop() is not self._loop:
+            yield client
+            return
+
+        host = endpoint_host(endpoint)
+        limiter = self._host_limiters.get(host)
+        if limiter is None:
+            if adaptive:
+                limiter = AdaptiveLimiter(maximum=limit or webhook_settings.CLIENT_MAX_CONNECTIONS)
+            else:
+                limiter = asyncio.Semaphore(limit)
+            self._host_limiters[host] = limiter
+
+        async with limiter:
+            if limit is None:
+                yield client
+                return
+
+            host_client = self._host_clients.get(host)
+            if host_client is None:
+                host_client = self._host_clients[host] = build_client(max_connections=limit)
+
+            async with self._using(host_client) as host_client:
+                yield host_client
+
+    def record_result(self, endpoint: str, latency: float, ok: bool) -> None:  # noqa: FBT001
+        """
+        Record the result of a request to the given endpoint for adjusting the host's concurrency limit.
+        Should be called before the client from 'host_client' is released.
+
+        :param endpoint: Endpoint the request was sent to.
+        :param latency: Number of seconds the request took.
+        :param ok: Did the request succeed, or fail in a way that doesn't indicate that the host is overloaded?
+        """
+        limiter = self._host_limiters.get(endpoint_host(endpoint))
+        if isinstance(limiter, AdaptiveLimiter):
+            limiter.record(latency, ok)
+
+    def limits(self) -> dict[str, LimiterStats]:
+        """Current adaptive concurrency limits, number of in-flight requests, and lowest latencies by host."""
+        return {
+            host: limiter.stats()
+            for host, limiter in list(self._host_limiters.items())
+            if isinstance(limiter, AdaptiveLimiter)
+        }
+
+    def reset_client(self) -> None:
+        """
+        Replace the shared clients, so that new ones are created with the current settings.
+        The old clients are closed after the requests that are still using them have finished.
+        """
+        with self._lock:
+            loop, clients = self._loop, self._clients()
+            self._client = None
+            self._host_clients = {}
+            self._host_limiters = {}
+
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._retire, clients)
+
+    @asynccontextmanager
+    async def _using(self, client: httpx.AsyncClient) -> AsyncGenerator[httpx.AsyncClient, None]:
+        """Keep track of the requests using the given client in the delivery loop."""
+        self._in_use[client] = self._in_use.get(client, 0) + 1
+        try:
+            yield client
+        finally:
+            self._in_use[client] -= 1
+            if self._in_use[client] == 0:
+                del self._in_use[client]
+                if client in self._retired:
+                    self._retired.discard(client)
+                    self._close(client)
+
+    def _retire(self, clients: list[httpx.AsyncClient]) -> None:
+        """Close the given clients once they are no longer in use. Called in the delivery loop."""
+        for client in clients:
+            if client in self._in_use:
+                self._retired.add(client)
+            else:
+                self._close(client)
+
+    def _close(self, client: httpx.AsyncClient) -> None:
+        task = asyncio.get_running_loop().create_task(client.aclose())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def stop(self, timeout: float | None = 5) -> None:
+        """Wait for pending webhooks, then close the shared client and stop the delivery loop."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            clients = [*self._clients(), *self._retired]
+            self._loop = self._thread = self._client = None
+            self._host_clients = {}
+            self._host_limiters = {}
+            self._retired = set()
+
+        if loop is None or thread is None:
+            return
+
+        try:
+            asyncio.run_coroutine_threadsafe(_wait_for_pending_tasks(timeout), loop).result()
+        except Exception as error:
+            logger.debug("Could not wait for pending webhooks.", exc_info=error)
+
+        for client in clients:
+            try:
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop).result(timeout)
+            except Exception as error:
+                logger.debug("Could not close webhook client.", exc_info=error)
+
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        if not thread.is_alive():
+            loop.close()
+
+    def after_fork(self) -> None:
+        """Forget the parent process' loop and client, since the loop thread doesn't exist in the child."""
+        self._lock = Lock()
+        self._loop = None
+        self._thread = None
+        self._client = None
+        self._host_clients = {}
+        self._host_limiters = {}
+        self._in_use = {}
+        self._retired = set()
+        self._closing = set()
+
+    def _clients(self) -> list[httpx.AsyncClient]:
+        clients = list(self._host_clients.values())
+        if self._client is not None:
+            clients.append(self._client)
+        return clients
+
+    @staticmethod
+    def _run_forever(loop: asyncio.AbstractEventLoop) -> None:
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+
+async def _wait_for_pending_tasks(timeout: float | None) -> None:
+    tasks = asyncio.all_tasks() - {asyncio.current_task()}
+    if tasks:
+        await asyncio.wait(tasks, timeout=timeout)
+
+
+def _log_exception(future: Future) -> None:
+    if future.cancelled():
+        return
+    error = future.exception()
+    if error is not None:
+        logger.error("Webhook task failed.", exc_info=error)
+
+
+def build_client(max_connections: int | None = None) -> httpx.AsyncClient:
+    """
+    Build an http client for sending webhooks.
+
+    :param max_connections: Maximum number of connections in the client's connection pool.
+                            If not given, 'SIGNAL_WEBHOOKS.CLIENT_MAX_CONNECTIONS' is used.
+    """
+    max_keepalive_connections: int | None = webhook_settings.CLIENT_MAX_KEEPALIVE_CONNECTIONS
+    if max_connections is None:
+        max_connections = webhook_settings.CLIENT_MAX_CONNECTIONS
+    elif max_keepalive_connections is not None:
+        max_keepalive_connections = min(max_keepalive_connections, max_connections)
+
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=webhook_settings.CLIENT_KEEPALIVE_EXPIRY,
+    )
+    return httpx.AsyncClient(
+        timeout=webhook_settings.TIMEOUT,
+        follow_redirects=True,
+        limits=limits,
+        http2=webhook_settings.CLIENT_HTTP2,
+    )
+
+
+delivery_loop = DeliveryLoop()
+
+atexit.register(delivery_loop.stop)
+
+if hasattr(os, "register_at_fork"):  # pragma: no branch
+    os.register_at_fork(after_in_child=delivery_loop.after_fork)
@@ -2,8 +2,13 @@
 
 __all__ = [
     "WebhookCancelled",
+    "WebhookCircuitOpen",
 ]
 
 
 class WebhookCancelled(Exception):  # noqa: N818
     """Webhook was cancelled before it was sent."""
+
+
+class WebhookCircuitOpen(Exception):  # noqa: N818
+    """Webhook was not sent, since the circuit breaker for its endpoint is open."""
@@ -1,31 +1,46 @@
 from __future__ import annotations
 
 import asyncio
+import copy
 import datetime
 import logging
+import time
 from threading import Thread
 from typing import TYPE_CHECKING
 
-import httpx
+# Imported at runtime, so that 'signal_webhooks.handlers.httpx' can be patched.
+import httpx  # noqa: TC002
 from asgiref.sync import sync_to_async
-from django.db import models
-from django.db.models.signals import post_delete, post_save
-from django.dispatch import receiver
-
-from .exceptions import WebhookCancelled
-from .settings import webhook_settings
-from .typing import ACTION_TO_METHOD
-from .utils import get_webhook_model, reference_for_model, tasks_as_completed, truncate
+from django.db import router, transaction
+from django.db.models import ManyToManyRel
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from .breaker import circuit_breakers
+from .cache import get_hooks_for_model, has_hooks_for_model
+from .deferred import PendingWebhook, defer_until_commit
+from .delivery import delivery_loop
+from .exceptions import WebhookCancelled, WebhookCircuitOpen
+from .memo import payload_memo
+from .pool import worker_pool
+from .ratelimit import rate_limiter
+from .retry import is_retryable, max_attempts, parse_retry_after, retry_delay, retry_scheduler
+from .settings import SETTING_NAME, webhook_settings
+from .typing import ACTION_TO_METHOD, DeliveryResult
+from .utils import encode_payload, get_webhook_model, m2m_delta_data, reference_for_model, tasks_as_completed, truncate
 
 if TYPE_CHECKING:
+    from django.db import models
     from django.db.models.base import ModelBase
+    from django.db.models.signals import ModelSignal
 
+    from .breaker import CircuitBreaker
     from .models import Webhook
     from .typing import (
         Any,
         Callable,
         ClientKwargs,
-        HooksData,
+        Hashable,
+        Iterable,
         JSONData,
         M2MChangedData,
         Method,
@@ -35,77 +50,323 @@
 
 
 __all__ = [
+    "bulk_webhook_handler",
+    "connect_receivers",
+    "default_async_hook_handler",
     "default_error_handler",
     "default_hook_handler",
+    "disconnect_receivers",
+    "loop_task_handler",
+    "outbox_task_handler",
+    "pool_task_handler",
     "sync_task_handler",
     "thread_task_handler",
     "webhook_delete_handler",
+    "webhook_m2m_handler",
     "webhook_update_create_handler",
 ]
 
 
 logger = logging.getLogger(__name__)
 
+# Signal receivers connected by 'connect_receivers', as (signal, sender, dispatch_uid).
+_connected_receivers: list[tuple[ModelSignal, ModelBase, str]] = []
+
+
+def connect_receivers() -> None:
+    """
+    Connect the webhook signal receivers for the models in 'SIGNAL_WEBHOOKS.HOOKS'.
+
+    Receivers are connected with the models as senders, so that saving or deleting
+    other models doesn't call them at all. Many-to-many changes are received from
+    the through models of the model's many-to-many fields and reverse relations.
+    Receivers connected earlier are disconnected first.
+    """
+    disconnect_receivers()
+
+    for model in {model for model, _ in webhook_settings.hook_table}:
+        _connect(post_save, webhook_update_create_handler, model, webhook_settings.DISPATCH_UID_POST_SAVE)
+        _connect(post_delete, webhook_delete_handler, model, webhook_settings.DISPATCH_UID_POST_DELETE)
+        for through in _m2m_through_models(model):
+            _connect(m2m_changed, webhook_m2m_handler, through, webhook_settings.DISPATCH_UID_M2M_CHANGED)
+
+
+def disconnect_receivers() -> None:
+    """Disconnect the webhook signal receivers connected by 'connect_receivers'."""
+    while _connected_receivers:
+        signal, sender, dispatch_uid = _connected_receivers.pop()
+        signal.disconnect(sender=sender, dispatch_uid=dispatch_uid)
 
-@receiver(post_save, dispatch_uid=webhook_settings.DISPATCH_UID_POST_SAVE)
-def webhook_update_create_handler(sender: ModelBase, **kwargs: Any) -> None:  # noqa: ARG001
+
+def reconnect_receivers_on_setting_changed(**kwargs: Any) -> None:
+    if kwargs["setting"] == SETTING_NAME:
+        connect_receivers()
+
+
+def _connect(signal: ModelSignal, receiver: Callable[..., None], sender: ModelBase, dispatch_uid_prefix: str) -> None:
+    dispatch_uid = f"{dispatch_uid_prefix}-{reference_for_model(sender)}"
+    signal.connect(receiver, sender=sender, dispatch_uid=dispatch_uid)
+    _connected_receivers.append((signal, sender, dispatch_uid))
+
+
+def _m2m_through_models(model: ModelBase) -> set[ModelBase]:
+    throughs: set[ModelBase] = set()
+    for field in model._meta.get_fields():
+        if not field.many_to_many:
+            continue
+        throughs.add(field.through if isinstance(field, ManyToManyRel) else field.remote_field.through)
+    return throughs
+
+
+def webhook_update_create_handler(sender: ModelBase, **kwargs: Any) -> None:
     kwargs: PostSaveData
     method: Method = "CREATE" if kwargs["created"] else "UPDATE"  # type: ignore[assignment]
+    if method == "UPDATE" and not watched_fields_updated(sender, kwargs["update_fields"]):
+        return
     webhook_handler(instance=kwargs["instance"], method=method)
 
 
-@receiver(post_delete, dispatch_uid=webhook_settings.DISPATCH_UID_POST_DELETE)
+def watched_fields_updated(model: ModelBase, update_fields: frozenset[str] | None) -> bool:
+    """Should an update with the given 'update_fields' be sent, based on the model's watched fields?"""
+    if update_fields is None:
+        return True
+    watched_fields = webhook_settings.watched_fields.get(model)
+    return watched_fields is None or not watched_fields.isdisjoint(update_fields)
+
+
 def webhook_delete_handler(sender: ModelBase, **kwargs: Any) -> None:  # noqa: ARG001
     kwargs: PostDeleteData
     method: Method = "DELETE"
-    webhook_handler(instance=kwargs["instance"], method=method)
+    origin = kwargs.get("origin") if webhook_settings.BATCH_CASCADE_DELETES else None
+    webhook_handler(instance=kwargs["instance"], method=method, origin=origin)
 
 
-@receiver(models.signals.m2m_changed, dispatch_uid=webhook_settings.DISPATCH_UID_M2M_CHANGED)
-def webhook_m2m_handler(sender: ModelBase, **kwargs: Any) -> None:  # noqa: ARG001
+def webhook_m2m_handler(sender: ModelBase, **kwargs: Any) -> None:
     kwargs: M2MChangedData
     method: Method | None = ACTION_TO_METHOD.get(kwargs["action"])
     # Don't fire webhooks for pre-actions
     if method is None:
         return
-    webhook_handler(instance=kwargs["instance"], method=method)
 
+    if webhook_settings.PAYLOAD_MEMO:
+        payload_memo.relations_changed(type(kwargs["instance"]), kwargs["model"])
 
-def webhook_handler(instance: models.Model, method: Method) -> None:
-    ref = reference_for_model(type(instance))
+    data: JSONData | None = None
+    if webhook_settings.M2M_DELTA_PAYLOADS:
+        data = m2m_delta_data(kwargs["instance"], method, sender, kwargs["reverse"], kwargs["pk_set"])
+
+    webhook_handler(instance=kwargs["instance"], method=method, data=data)
+
+
+def webhook_handler(
+    instance: models.Model,
+    method: Method,
+    origin: Any = None,
+    data: JSONData | None = None,
+) -> None:
+    if should_defer(origin) and defer_webhook(instance, method, origin, data):
+        return
+
+    start_webhook(instance, method, data)
+
+
+def should_defer(origin: Any = None) -> bool:
+    """
+    Should model events be deferred until the current transaction is committed?
+
+    Events are never deferred when using 'outbox_task_handler', since the outbox entries
+    are saved in the same transaction as the model change. Saving them after the commit
+    would lose the events if the process crashed in between.
+
+    :param origin: Model instance or queryset a cascading delete started from, if deletes should be batched.
+    """
+    if webhook_settings.TASK_HANDLER is outbox_task_handler:
+        return False
+    return webhook_settings.FIRE_ON_COMMIT or origin is not None
+
+
+def start_webhook(instance: models.Model, method: Method, data: JSONData | None = None) -> None:
+    """
+    Find the hook for the model event, and start it with the task handler.
 
-    hook = find_hook_handler(ref, method)
+    :param instance: Model instance the event is for.
+    :param method: Method of the event.
+    :param data: Data to send. If not given, the instance is serialized.
+    """
+    hook = find_hook_handler(type(instance), method)
     if hook is None:
         return
 
+    if not should_serialize(hook, instance, method):
+        return
+
+    if data is None:
+        data = serialize_instance(instance, method)
+        if data is None:
+            return
+
+    webhook_settings.TASK_HANDLER(hook, instance=instance, data=data, method=method)
+
+
+def should_serialize(hook: Callable[..., None], instance: models.Model, method: Method) -> bool:
+    """
+    Should the instance be serialized for the hook? If 'SIGNAL_WEBHOOKS.CHECK_HOOKS_BEFORE_SERIALIZING'
+    is set, instances are not serialized for the default hook handler if there are no enabled webhooks for them.
+    """
+    return not (
+        webhook_settings.CHECK_HOOKS_BEFORE_SERIALIZING
+        and hook is default_hook_handler
+        and not has_hooks_for_model(instance, method)
+    )
+
+
+def bulk_webhook_handler(
+    instances: list[models.Model],
+    method: Method,
+    data: list[JSONData | None] | None = None,
+) -> None:
+    """
+    Start the hook for a bulk operation, with a list of the serialized instances as the data.
+
+    Instances are grouped by their 'SIGNAL_WEBHOOKS.FILTER_KWARGS', so that each group is
+    sent only to the webhooks found for it. The first instance in a group is used for finding
+    the webhooks, and it's the instance passed to the hook. Instances whose webhooks are
+    cancelled by the serializer are left out of the list.
+
+    :param instances: Model instances the event is for.
+    :param method: Method of the event.
+    :param data: Data for each instance, None for instances whose webhooks were cancelled.
+                 If not given, the instances are serialized.
+    """
+    if not instances:
+        return
+
+    hook = find_hook_handler(type(instances[0]), method)
+    if hook is None:
+        return
+
+    for indices in group_by_filter_kwargs(instances, method):
+        instance = instances[indices[0]]
+        if not should_serialize(hook, instance, method):
+            continue
+
+        if data is None:
+            group_data = [serialize_instance(instances[i], method) for i in indices]
+        else:
+            group_data = [data[i] for i in indices]
+
+        group_data = [item_data for item_data in group_data if item_data is not None]
+        if not group_data:
+            continue
+
+        webhook_settings.TASK_HANDLER(hook, instance=instance, data=group_data, method=method)
+
+
+def group_by_filter_kwargs(instances: list[models.Model], method: Method) -> list[list[int]]:
+    """
+    Group the indices of the instances by their 'SIGNAL_WEBHOOKS.FILTER_KWARGS',
+    since instances with different filtering arguments can have different webhooks.
+    Groups keep the position of their first instance.
+    """
+    groups: dict[Hashable, list[int]] = {}
+    for i, instance in enumerate(instances):
+        kwargs: dict[str, Any] = webhook_settings.FILTER_KWARGS(instance, method)
+        try:
+            key: Hashable = frozenset(kwargs.items())
+            hash(key)
+        except TypeError:
+            # Filtering arguments contain unhashable values, e.g., lists for '__in' lookups.
+            key = repr(sorted(kwargs.items()))
+        groups.setdefault(key, []).append(i)
+
+    return list(groups.values())
+
+
+def defer_webhook(
+    instance: models.Model,
+    method: Method,
+    origin: Any = None,
+    data: JSONData | None = None,
+) -> bool:
+    """
+    Defer the model event until the current transaction is committed.
+
+    Events for the same model instance in the same transaction are coalesced, so that
+    only one webhook with the final state of the instance is sent. Delete events are
+    serialized immediately, since the instance no longer exists when the transaction
+    is committed. Delete events with the same origin and model are sent in a single
+    webhook with a list of the deleted instances.
+
+    :param instance: Model instance the event is for.
+    :param method: Method of the event.
+    :param origin: Model instance or queryset a cascading delete started from.
+    :param data: Data to send. If not given, the instance is serialized.
+    :return: Whether the event was deferred. Events outside of transactions are not deferred.
+    """
+    connection = transaction.get_connection(router.db_for_write(type(instance), instance=instance))
+    if not connection.in_atomic_block:
+        return False
+
+    if data is None and method == "DELETE":
+        hook = find_hook_handler(type(instance), method)
+        if hook is not None and should_serialize(hook, instance, method):
+            data = serialize_instance(without_m2m_relations(instance), method)
+
+    defer_until_commit(
+        connection,
+        PendingWebhook(instance, method, data, origin),
+        handler=send_deferred_webhook,
+        batch_handler=send_deferred_webhooks,
+    )
+    return True
+
+
+def send_deferred_webhook(instance: models.Model, method: Method, data: JSONData | None) -> None:
+    # Delete events without data had no hook, or their serialization failed when they were deferred.
+    if method == "DELETE" and data is None:
+        return
+
+    start_webhook(instance, method, data)
+
+
+def send_deferred_webhooks(instances: list[models.Model], method: Method, data: list[JSONData | None]) -> None:
+    # Only delete events are batched, and they are always serialized when they are deferred.
+    bulk_webhook_handler(instances, method, data)
+
+
+def without_m2m_relations(instance: models.Model) -> models.Model:
+    """
+    Copy of a deleted model instance, with its many-to-many relations set as empty.
+
+    Relations are deleted before the instance, so this avoids querying them for each instance.
+    """
+    instance = copy.copy(instance)
+    instance._prefetched_objects_cache = {field.name: [] for field in instance._meta.many_to_many}
+    return instance
+
+
+def serialize_instance(instance: models.Model, method: Method) -> JSONData | None:
+    """Serialize the instance with 'SIGNAL_WEBHOOKS.SERIALIZER'. Returns None if the webhook was cancelled."""
+    ref = reference_for_model(type(instance))
     try:
-        data = webhook_settings.SERIALIZER(instance)
+        # Deleted instances don't have their many-to-many relations, so don't memoize them.
+        if webhook_settings.PAYLOAD_MEMO and method != "DELETE":
+            return payload_memo.serialize(instance)
+        return webhook_settings.SERIALIZER(instance)
     except WebhookCancelled as error:
         logger.info(f"{method.capitalize()} webhook for {ref!r} cancelled before it was sent. Reason given: {error}")
-        return
     except Exception as error:
         logger.exception(
             f"{method.capitalize()} webhook data for {ref!r} could not be created.",
             exc_info=error,
         )
-        return
-
-    webhook_settings.TASK_HANDLER(hook, instance=instance, data=data, method=method)
+    return None
 
 
-def find_hook_handler(ref: str, method: Method) -> Callable | None:
-    hook: Callable | None = ...
-    hooks: HooksData | None = webhook_settings.HOOKS.get(ref)
-
-    if hooks is None:
-        return None
-    if hooks is not ...:
-        hook = hooks.get(method)
-    if hook is None:
-        return None
+def find_hook_handler(model: ModelBase, method: Method) -> Callable | None:
+    hook: Callable | None = webhook_settings.hook_table.get((model, method))
     if hook is ...:
         hook = default_hook_handler
-
     return hook
 
 
@@ -127,16 +388,75 @@ def sync_task_handler(hook: Callable[..., None], **kwargs: Any) -> None:
     hook(**kwargs)
 
 
+def loop_task_handler(hook: Callable[..., Any], **kwargs: Any) -> None:
+    """
+    Run the hook in the delivery loop without waiting for it to finish.
+
+    All webhooks from the process are sent concurrently in the same background event loop,
+    instead of starting a new thread and event loop for each event. The default hook handler
+    looks up the webhooks to fire in a thread pool and then sends them in the loop.
+    Other synchronous hooks are run in a thread pool, and coroutine functions in the loop.
+    """
+    if hook is default_hook_handler:
+        coro = default_async_hook_handler(**kwargs)
+    elif asyncio.iscoroutinefunction(hook):
+        coro = hook(**kwargs)
+    else:
+        coro = sync_to_async(hook, thread_sensitive=False)(**kwargs)
+
+    delivery_loop.submit(coro)
+
+
+def pool_task_handler(hook: Callable[..., None], **kwargs: Any) -> None:
+    """
+    Run the hook in a fixed pool of worker threads.
+
+    Hooks are queued in a bounded queue, so that bulk operations cannot start an unbounded
+    number of threads. See 'SIGNAL_WEBHOOKS.TASK_POOL_FULL_POLICY' for what happens when the queue is full.
+    """
+    worker_pool.submit(hook, **kwargs)
+
+
+def outbox_task_handler(hook: Callable[..., None], **kwargs: Any) -> None:
+    """
+    Save the webhooks to the outbox, to be sent later by the 'runwebhookworker' management command.
+
+    The outbox entries are saved using the current database transaction, so they are only
+    sent if the transaction of the model change is committed. Custom hooks are called directly.
+    """
+    if hook is not default_hook_handler:
+        hook(**kwargs)
+        return
+
+    from .outbox import add_to_outbox  # noqa: PLC0415
+
+    add_to_outbox(**kwargs)
+
+
 def default_hook_handler(instance: models.Model, data: JSONData, method: Method) -> None:
-    hooks: models.QuerySet = get_webhook_model().objects.get_for_model(instance, method=method)
-    if not hooks.exists():
+    hooks, client_kwargs = prepare_webhooks(instance, method)
+    if not hooks:
+        return
+
+    delivery_loop.run(fire_webhooks(hooks, data, client_kwargs))
+
+
+async def default_async_hook_handler(instance: models.Model, data: JSONData, method: Method) -> None:
+    hooks, client_kwargs = await sync_to_async(prepare_webhooks)(instance, method)
+    if not hooks:
         return
 
-    client_kwargs = build_client_kwargs_by_hook_id(hooks)
-    asyncio.run(fire_webhooks(hooks, data, client_kwargs))
+    await fire_webhooks(hooks, data, client_kwargs)
 
 
-def build_client_kwargs_by_hook_id(hooks: models.QuerySet) -> dict[int, ClientKwargs]:
+def prepare_webhooks(instance: models.Model, method: Method) -> tuple[list[Webhook], dict[int, ClientKwargs]]:
+    hooks = get_hooks_for_model(instance, method)
+    if not hooks:
+        return hooks, {}
+    return hooks, build_client_kwargs_by_hook_id(hooks)
+
+
+def build_client_kwargs_by_hook_id(hooks: Iterable[Webhook]) -> dict[int, ClientKwargs]:
     client_kwargs_by_hook_id: dict[int, ClientKwargs] = {}
     for hook in hooks:
         client_kwargs_by_hook_id[hook.id] = webhook_settings.CLIENT_KWARGS(hook)
@@ -145,15 +465,37 @@ def build_client_kwargs_by_hook_id(hooks: models.QuerySet) -> dict[int, ClientKw
     return client_kwargs_by_hook_id
 
 
-async def fire_webhooks(hooks: models.QuerySet, data: JSONData, client_kwargs: dict[int, ClientKwargs]) -> None:
+async def fire_webhooks(
+    hooks: Iterable[Webhook],
+    data: JSONData,
+    client_kwargs: dict[int, ClientKwargs],
+    *,
+    attempt: int = 1,
+    retry: bool = True,
+) -> dict[int, DeliveryResult]:
+    """
+    Send the given data to the given webhooks.
+
+    :param hooks: Webhooks to send.
+    :param data: Data to send.
+    :param client_kwargs: Additional arguments for the http client, by webhook id.
+    :param attempt: Number of the attempt to send the webhooks.
+    :param retry: Should failed webhooks be scheduled to be sent again? See 'retry_scheduler'.
+    :return: Results of sending, by webhook id.
+    """
     futures: set[asyncio.Task] = set()
     hooks_by_name: dict[str, Webhook] = {hook.name: hook for hook in hooks}
+    results: dict[int, DeliveryResult] = {}
+    succeeded: list[Webhook] = []
+    failed: list[Webhook] = []
     webhook_model = get_webhook_model()
+    # Encode the payload once for all webhooks instead of once per request.
+    content = encode_payload(data)
 
-    async with httpx.AsyncClient(timeout=webhook_settings.TIMEOUT, follow_redirects=True) as client:
+    async with delivery_loop.client() as client:
         futures.update(
             asyncio.Task(
-                client.post(hook.endpoint, json=data, **client_kwargs[hook.id]),
+                post_webhook(client, hook, content, client_kwargs[hook.id]),
                 name=hook.name,
             )
             for hook in hooks
@@ -161,31 +503,125 @@ async def fire_webhooks(hooks: models.QuerySet, data: JSONData, client_kwargs: d
 
         async for task in tasks_as_completed(futures):
             hook = hooks_by_name[task.get_name()]
+            results[hook.id] = handle_response(hook, task)
+            (succeeded if results[hook.id].succeeded else failed).append(hook)
+
+    # Only update the fields that changed, so that hooks loaded earlier
+    # (e.g., from the hook cache) don't overwrite newer delivery results.
+    if succeeded:
+        await sync_to_async(webhook_model.objects.bulk_update)(
+            objs=succeeded,
+            fields=["last_success", "last_response"],
+        )
+    if failed:
+        await sync_to_async(webhook_model.objects.bulk_update)(
+            objs=failed,
+            fields=["last_failure", "last_response"],
+        )
+
+    if retry:
+        for hook in failed:
+            schedule_retry(hook, data, attempt, results[hook.id])
+
+    return results
+
+
+async def post_webhook(
+    client: httpx.AsyncClient,
+    hook: Webhook,
+    content: bytes,
+    client_kwargs: ClientKwargs,
+) -> httpx.Response:
+    """
+    Send the webhook, unless the circuit breaker for its endpoint is open.
+    Then, if the webhook has a rate limit, waits until the webhook can be sent within it.
+    The request is sent with the client for the endpoint's host, see 'DeliveryLoop.host_client'.
+    The latency and result of the request are recorded for adjusting the host's concurrency limit.
+
+    :raises WebhookCircuitOpen: Circuit breaker for the webhook's endpoint is open.
+    """
+    # Check the breaker first, so that requests that are not sent don't use up the rate limit.
+    breaker = circuit_breakers.get(hook.endpoint) if webhook_settings.CIRCUIT_BREAKER else None
+    permit = "request" if breaker is None else breaker.acquire()
+    if permit is None:
+        msg = f"Circuit breaker for {circuit_breakers.key_for(hook.endpoint)!r} is open."
+        raise WebhookCircuitOpen(msg)
 
+    try:
+        await rate_limiter.wait(hook)
+
+        async with delivery_loop.host_client(client, hook.endpoint) as host_client:
+            start = time.perf_counter()
             try:
-                response: httpx.Response = task.result()
-            except Exception as error:
-                logger.exception(f"Webhook {hook.name!r} failed.", exc_info=error)
-                hook.last_failure = datetime.datetime.now(tz=datetime.UTC)
-                webhook_settings.ERROR_HANDLER(hook, error)
-                continue
-
-            if response.status_code // 100 == 2:  # noqa: PLR2004
-                hook.last_success = datetime.datetime.now(tz=datetime.UTC)
-                if hook.keep_last_response:
-                    hook.last_response = truncate(response.content.decode())
-
-            else:
-                hook.last_failure = datetime.datetime.now(tz=datetime.UTC)
-                webhook_settings.ERROR_HANDLER(hook, None)
-                if hook.keep_last_response:
-                    hook.last_response = truncate(response.content.decode())
-
-    await sync_to_async(webhook_model.objects.bulk_update)(
-        objs=hooks,
-        fields=[
-            "last_success",
-            "last_failure",
-            "last_response",
-        ],
+                response = await host_client.post(hook.endpoint, content=content, **client_kwargs)
+            except Exception:
+                record_result(hook, breaker, time.perf_counter() - start, ok=False)
+                raise
+
+            # Other failures, e.g., 4xx responses, mean that the receiver is still responding.
+            record_result(hook, breaker, time.perf_counter() - start, ok=not is_retryable(response))
+    finally:
+        # Release the probe even if it was cancelled before its result was recorded.
+        if permit == "probe":
+            breaker.release_probe()
+
+    return response
+
+
+def record_result(hook: Webhook, breaker: CircuitBreaker | None, latency: float, *, ok: bool) -> None:
+    """Record the result of sending a webhook for the endpoint's circuit breaker and concurrency limit."""
+    if breaker is not None:
+        if ok:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+
+    delivery_loop.record_result(hook.endpoint, latency, ok)
+
+
+def handle_response(hook: Webhook, task: asyncio.Task) -> DeliveryResult:
+    """Record the result of sending a webhook on the webhook."""
+    try:
+        response: httpx.Response = task.result()
+    except WebhookCircuitOpen as error:
+        logger.info(f"Webhook {hook.name!r} not sent. {error}")
+        hook.last_failure = datetime.datetime.now(tz=datetime.UTC)
+        webhook_settings.ERROR_HANDLER(hook, error)
+        # Retry when the breaker allows probing the endpoint again. If it already does,
+        # another request is probing the endpoint, so use the normal backoff.
+        retry_after = circuit_breakers.get(hook.endpoint).retry_after
+        return DeliveryResult(succeeded=False, retryable=True, retry_after=retry_after or None)
+    except Exception as error:
+        logger.exception(f"Webhook {hook.name!r} failed.", exc_info=error)
+        hook.last_failure = datetime.datetime.now(tz=datetime.UTC)
+        webhook_settings.ERROR_HANDLER(hook, error)
+        return DeliveryResult(succeeded=False, retryable=is_retryable(None, error))
+
+    if hook.keep_last_response:
+        hook.last_response = truncate(response.content.decode())
+
+    if response.status_code // 100 == 2:  # noqa: PLR2004
+        hook.last_success = datetime.datetime.now(tz=datetime.UTC)
+        return DeliveryResult(succeeded=True)
+
+    hook.last_failure = datetime.datetime.now(tz=datetime.UTC)
+    webhook_settings.ERROR_HANDLER(hook, None)
+    return DeliveryResult(
+        succeeded=False,
+        retryable=is_retryable(response),
+        retry_after=parse_retry_after(response),
     )
+
+
+def schedule_retry(hook: Webhook, data: JSONData, attempt: int, result: DeliveryResult) -> None:
+    """Schedule a failed webhook to be sent again, if it can still be attempted."""
+    if not result.retryable:
+        return
+
+    if attempt >= max_attempts(hook, default=webhook_settings.MAX_ATTEMPTS):
+        if attempt > 1:
+            logger.warning(f"Webhook {hook.name!r} failed after {attempt} attempts. Giving up.")
+        return
+
+    delay = retry_delay(attempt, webhook_settings.RETRY_BACKOFF, result.retry_after)
+    retry_scheduler.schedule(hook, data, attempt + 1, delay)
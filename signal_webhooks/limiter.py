@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import TYPE_CHECKING
+
+from .settings import webhook_settings
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    from .typing import TypedDict
+
+    class LimiterStats(TypedDict):
+        limit: int
+        in_flight: int
+        min_latency: float | None
+
+
+__all__ = [
+    "AdaptiveLimiter",
+]
+
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limiter for requests to a webhook host, which adapts its limit with AIMD
+    (additive increase, multiplicative decrease) based on the results of the requests.
+
+    While requests succeed with stable latency, i.e., within
+    'SIGNAL_WEBHOOKS.ADAPTIVE_CONCURRENCY_LATENCY_TOLERANCE' times the lowest latency
+    of the latest requests, the limit grows by one for each "limit" requests. When a
+    request fails with a connection error, a timeout, or a retryable error response, the
+    limit is multiplied by 'SIGNAL_WEBHOOKS.ADAPTIVE_CONCURRENCY_BACKOFF', at most once
+    per round trip: failures of requests that were started before the last decrease
+    don't decrease the limit again. Successful requests with higher latency leave
+    the limit as is.
+
+    Must only be used from a single event loop.
+    """
+
+    def __init__(self, maximum: int | None = None) -> None:
+        """:param maximum: Upper bound for the limit. None means no upper bound."""
+        self.minimum: int = webhook_settings.ADAPTIVE_CONCURRENCY_MIN
+        self.maximum: float = float("inf") if maximum is None else max(maximum, self.minimum)
+        self.limit: float = min(max(webhook_settings.ADAPTIVE_CONCURRENCY_INITIAL, self.minimum), self.maximum)
+        self.in_flight: int = 0
+        self._latencies: deque[float] = deque(maxlen=100)
+        self._decreased_at: float = float("-inf")
+        self._condition = asyncio.Condition()
+
+    async def __aenter__(self) -> None:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def record(self, latency: float, ok: bool) -> None:  # noqa: FBT001
+        """
+        Adjust the limit based on the result of a request.
+
+        :param latency: Number of seconds the request took.
+        :param ok: Did the request succeed, or fail in a way that doesn't indicate that the host is overloaded?
+        """
+        previous = int(self.limit)
+        now = time.monotonic()
+
+        if not ok:
+            # Requests that were already in flight when the limit was last decreased
+            # failed due to the same congestion, so back off at most once per round trip.
+            if now - latency < self._decreased_at:
+                return
+            self.limit = max(self.limit * webhook_settings.ADAPTIVE_CONCURRENCY_BACKOFF, self.minimum)
+            self._decreased_at = now
+        else:
+            self._latencies.append(latency)
+            if latency <= min(self._latencies) * webhook_settings.ADAPTIVE_CONCURRENCY_LATENCY_TOLERANCE:
+                self.limit = min(self.limit + 1 / self.limit, self.maximum)
+
+        if int(self.limit) != previous:
+            logger.debug(f"Concurrency limit changed from {previous} to {int(self.limit)}.")
+
+    def stats(self) -> LimiterStats:
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "min_latency": min(self._latencies) if self._latencies else None,
+        }
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+from django.core.management import BaseCommand
+from django.db import close_old_connections
+
+from signal_webhooks.models import OutboxEntry
+from signal_webhooks.outbox import default_worker_id, deliver_outbox
+
+if TYPE_CHECKING:
+    from argparse import ArgumentParser
+
+    from signal_webhooks.typing import Any
+
+
+__all__ = [
+    "Command",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Send webhooks saved to the outbox by 'signal_webhooks.handlers.outbox_task_handler'. "
+        "Multiple workers can be run concurrently."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Maximum number of outbox entries to send at once.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Number of seconds to wait before checking the outbox again when it's empty.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit when there are no more webhooks to send, instead of waiting for new ones.",
+        )
+        parser.add_argument(
+            "--worker-id",
+            type=str,
+            default=None,
+            help="Identifier for this worker. Must be unique among running workers. Generated if not given.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        batch_size: int = options["batch_size"]
+        interval: float = options["interval"]
+        once: bool = options["once"]
+        worker_id: str = options["worker_id"] or default_worker_id()
+
+        try:
+            while True:
+                close_old_connections()
+                released = OutboxEntry.objects.release_expired()
+                if released:
+                    self.stdout.write(f"Released {released} outbox entries with expired claims.")
+
+                count = deliver_outbox(batch_size=batch_size, worker_id=worker_id)
+                if count:
+                    self.stdout.write(f"Processed {count} outbox entries.")
+                    continue
+                if once:
+                    break
+                time.sleep(interval)
+
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping webhook worker.")
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING
+
+from django.db import router, transaction
+
+from .serializers import field_plan
+from .settings import webhook_settings
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    from django.db.backends.base.base import BaseDatabaseWrapper
+    from django.db.models import Model
+    from django.db.models.base import ModelBase
+
+    from .typing import Any, Hashable, JSONData
+
+
+__all__ = [
+    "MemoScope",
+    "PayloadMemo",
+    "payload_memo",
+]
+
+
+_DEFERRED = object()
+
+
+class MemoScope:
+    """Memoized data for a single request, or a block of code using 'PayloadMemo.scope'."""
+
+    __slots__ = ("data", "m2m_versions", "savepoints")
+
+    def __init__(self) -> None:
+        self.data: OrderedDict[Hashable, JSONData] = OrderedDict()
+        self.m2m_versions: dict[ModelBase, int] = {}
+        # Savepoints of the transactions data was memoized in, by connection.
+        self.savepoints: dict[BaseDatabaseWrapper, list[str]] = {}
+
+    def clear(self) -> None:
+        self.data.clear()
+        self.m2m_versions.clear()
+        self.savepoints.clear()
+
+
+_scope: ContextVar[MemoScope | None] = ContextVar("payload_memo_scope", default=None)
+
+
+class PayloadMemo:
+    """
+    Short-lived memo for serialized webhook data.
+
+    Data is memoized by model, primary key, and the state of the instance: the values
+    of its concrete fields, and a version for the model's many-to-many relations, which
+    is incremented whenever a many-to-many relation of the model changes. This way,
+    events for an instance whose serialized state hasn't changed reuse the same data,
+    e.g., an update that's saved twice, or many-to-many changes for a model whose
+    many-to-many fields are not serialized (see 'FIELDS' and 'EXCLUDE' in 'HOOKS').
+
+    The memo assumes that 'SIGNAL_WEBHOOKS.SERIALIZER' only depends on these, and that
+    the returned data is not modified. Data is only memoized within a scope: a request,
+    or a block of code using 'scope', e.g., in a management command or a task. Data
+    memoized in a transaction is dropped when the transaction ends, or when a savepoint
+    it was memoized in is rolled back. The memo holds at most 'PAYLOAD_MEMO_SIZE' entries,
+    and is cleared when the webhook settings change.
+    """
+
+    def serialize(self, instance: Model) -> JSONData:
+        scope = _scope.get()
+        if scope is None:
+            return webhook_settings.SERIALIZER(instance)
+
+        key = self.key_for(instance)
+        if key is None:
+            return webhook_settings.SERIALIZER(instance)
+
+        self._check_transactions(scope)
+
+        data = scope.data.get(key)
+        if data is not None:
+            scope.data.move_to_end(key)
+            return data
+
+        data = webhook_settings.SERIALIZER(instance)
+
+        connection = transaction.get_connection(router.db_for_write(type(instance), instance=instance))
+        if connection.in_atomic_block:
+            scope.savepoints[connection] = list(connection.savepoint_ids)
+
+        scope.data[key] = data
+        while len(scope.data) > webhook_settings.PAYLOAD_MEMO_SIZE:
+            scope.data.popitem(last=False)
+
+        return data
+
+    def key_for(self, instance: Model) -> Hashable | None:
+        """Key for the current state of the instance, or None if the instance cannot be memoized."""
+        if instance.pk is None:
+            return None
+
+        model = type(instance)
+        state = tuple(instance.__dict__.get(planned.attname, _DEFERRED) for planned in field_plan(model).fields)
+
+        # Changes to many-to-many relations only matter if they are serialized.
+        serialized_fields = webhook_settings.serialized_fields.get(model)
+        m2m_version: int | None = None
+        if field_plan(model, serialized_fields).m2m_fields:
+            scope = _scope.get()
+            m2m_version = 0 if scope is None else scope.m2m_versions.get(model, 0)
+
+        key = (model, instance.pk, state, m2m_version)
+        try:
+            hash(key)
+        except TypeError:
+            # Field values contain unhashable values, e.g., dicts from JSONFields.
+            return None
+        return key
+
+    def relations_changed(self, *models: ModelBase) -> None:
+        """Many-to-many relations of the given models have changed."""
+        scope = _scope.get()
+        if scope is None:
+            return
+
+        for model in models:
+            scope.m2m_versions[model] = scope.m2m_versions.get(model, 0) + 1
+
+    @contextmanager
+    def scope(self) -> Generator[None, None, None]:
+        """Memoize data within the block, e.g., in a management command or a task."""
+        token = _scope.set(MemoScope())
+        try:
+            yield
+        finally:
+            _scope.reset(token)
+
+    def start(self, **kwargs: Any) -> None:  # 'kwargs' for signal compatibility
+        """Start a new scope, e.g., when a request starts."""
+        _scope.set(MemoScope())
+
+    def end(self, **kwargs: Any) -> None:  # 'kwargs' for signal compatibility
+        """End the current scope, e.g., when a request finishes."""
+        _scope.set(None)
+
+    def clear(self, **kwargs: Any) -> None:  # 'kwargs' for signal compatibility
+        """Clear the data memoized in the current scope."""
+        scope = _scope.get()
+        if scope is not None:
+            scope.clear()
+
+    @staticmethod
+    def _check_transactions(scope: MemoScope) -> None:
+        for connection, savepoints in scope.savepoints.items():
+            if connection.in_atomic_block and connection.savepoint_ids[: len(savepoints)] == savepoints:
+                continue
+
+            # Transaction the data was memoized in has ended, or one of its savepoints was rolled back
+            # (or released), so the data might describe changes that were never committed.
+            scope.clear()
+            return
+
+
+payload_memo = PayloadMemo()
@@ -0,0 +1,89 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:58
+
+import uuid
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("signal_webhooks", "0004_migrate_signal_choices"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboxEntry",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "event_id",
+                    models.UUIDField(
+                        db_index=True,
+                        default=uuid.uuid4,
+                        help_text="Identifies the model event. Shared by all webhooks fired for the same event.",
+                        verbose_name="event id",
+                    ),
+                ),
+                (
+                    "webhook_id",
+                    models.PositiveBigIntegerField(
+                        help_text="Primary key of the webhook to send.", verbose_name="webhook id"
+                    ),
+                ),
+                (
+                    "ref",
+                    models.CharField(
+                        help_text="Dot import notation to the model the event is for.",
+                        max_length=1023,
+                        verbose_name="referenced model",
+                    ),
+                ),
+                (
+                    "method",
+                    models.CharField(
+                        choices=[
+                            ("CREATE", "Create"),
+                            ("UPDATE", "Update"),
+                            ("DELETE", "Delete"),
+                            ("M2M_ADD", "M2M add"),
+                            ("M2M_REMOVE", "M2M remove"),
+                            ("M2M_CLEAR", "M2M clear"),
+                        ],
+                        help_text="Signal that caused the event.",
+                        max_length=255,
+                        verbose_name="method",
+                    ),
+                ),
+                ("payload", models.JSONField(help_text="Data sent to the webhook.", verbose_name="payload")),
+                (
+                    "created",
+                    models.DateTimeField(
+                        auto_now_add=True, help_text="When the event happened.", verbose_name="created"
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="How many times sending the webhook has been attempted.",
+                        verbose_name="attempts",
+                    ),
+                ),
+                (
+                    "next_attempt_at",
+                    models.DateTimeField(
+                        db_index=True,
+                        default=django.utils.timezone.now,
+                        help_text="When sending the webhook should be attempted next.",
+                        verbose_name="next attempt at",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "outbox entry",
+                "verbose_name_plural": "outbox entries",
+                "ordering": ["id"],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("signal_webhooks", "0005_outboxentry"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="outboxentry",
+            name="locked_by",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="Worker that has claimed this entry for sending.",
+                max_length=255,
+                verbose_name="locked by",
+            ),
+        ),
+        migrations.AddField(
+            model_name="outboxentry",
+            name="locked_until",
+            field=models.DateTimeField(
+                default=None,
+                help_text="When the claim of the worker expires, and other workers can claim the entry.",
+                null=True,
+                verbose_name="locked until",
+            ),
+        ),
+    ]
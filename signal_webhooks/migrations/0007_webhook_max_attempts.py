@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:23
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("signal_webhooks", "0006_outboxentry_locked_by_outboxentry_locked_until"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="webhook",
+            name="max_attempts",
+            field=models.PositiveSmallIntegerField(
+                blank=True,
+                default=None,
+                help_text="How many times sending the webhook is attempted. Uses the default from settings if not set.",
+                null=True,
+                validators=[django.core.validators.MinValueValidator(1)],
+                verbose_name="max attempts",
+            ),
+        ),
+    ]
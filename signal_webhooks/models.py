@@ -1,35 +1,53 @@
 from __future__ import annotations
 
+import datetime as dt
+import uuid
 from typing import TYPE_CHECKING
 
-from django.db import models
+from django.core.validators import MinValueValidator
+from django.db import connections, models, transaction
+from django.utils import timezone
 
+from .cache import webhook_cache
 from .fields import TokenField
 from .settings import webhook_settings
-from .typing import MAX_COL_SIZE, METHOD_SIGNALS, SignalChoices
+from .typing import MAX_COL_SIZE, METHOD_SIGNALS, MethodChoices, SignalChoices
 from .utils import decode_cipher_key, is_dict, model_from_reference, reference_for_model
 
 if TYPE_CHECKING:
-    import datetime
-
     from django.db.models import Model
 
     from .typing import Any, Method, Self
 
 
 __all__ = [
+    "OutboxEntry",
     "Webhook",
     "WebhookBase",
 ]
 
 
+# Fields updated after webhooks have been sent. Changing these doesn't invalidate the webhook cache.
+DELIVERY_RESULT_FIELDS: frozenset[str] = frozenset(("last_response", "last_success", "last_failure"))
+
+
 class WebhookQuerySet(models.QuerySet):
     """Webhook queryset."""
 
+    def update(self, **kwargs: Any) -> int:
+        rows = super().update(**kwargs)
+        # 'update()' doesn't send any signals, so invalidate the webhook cache here.
+        if not DELIVERY_RESULT_FIELDS.issuperset(kwargs):
+            webhook_cache.invalidate(using=self.db)
+        return rows
+
     def get_for_model(self, instance: Model, method: Method) -> Self:
         kwargs: dict[str, Any] = webhook_settings.FILTER_KWARGS(instance, method)
+        return self.get_for_ref(reference_for_model(type(instance)), method, **kwargs)
+
+    def get_for_ref(self, ref: str, method: Method, **kwargs: Any) -> Self:
         return self.filter(
-            ref=reference_for_model(type(instance)),
+            ref=ref,
             signal__in=METHOD_SIGNALS[method],
             enabled=True,
             **kwargs,
@@ -89,12 +107,12 @@ class WebhookBase(models.Model):
         verbose_name="keep last response",
         help_text="Should the webhook keep a log of the latest response it got?",
     )
-    created: datetime.datetime = models.DateTimeField(
+    created: dt.datetime = models.DateTimeField(
         auto_now_add=True,
         verbose_name="created",
         help_text="When the webhook was created.",
     )
-    updated: datetime.datetime = models.DateTimeField(
+    updated: dt.datetime = models.DateTimeField(
         auto_now=True,
         verbose_name="updated",
         help_text="When the webhook was last updated.",
@@ -106,18 +124,34 @@ class WebhookBase(models.Model):
         verbose_name="last response",
         help_text="Latest response to this webhook.",
     )
-    last_success: datetime.datetime | None = models.DateTimeField(
+    last_success: dt.datetime | None = models.DateTimeField(
         null=True,
         default=None,
         verbose_name="last success",
         help_text="When the webhook last succeeded.",
     )
-    last_failure: datetime.datetime | None = models.DateTimeField(
+    last_failure: dt.datetime | None = models.DateTimeField(
         null=True,
         default=None,
         verbose_name="last failure",
         help_text="When the webhook last failed.",
     )
+    max_attempts: int | None = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        default=None,
+        validators=[MinValueValidator(1)],
+        verbose_name="max attempts",
+        help_text="How many times sending the webhook is attempted. Uses the default from settings if not set.",
+    )
+    rate_limit: int | None = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        default=None,
+        validators=[MinValueValidator(1)],
+        verbose_name="rate limit",
+        help_text="Maximum number of requests per second sent to the endpoint. Not limited if not set.",
+    )
 
     objects = WebhookQuerySet.as_manager()
 
@@ -147,3 +181,115 @@ class Webhook(WebhookBase):
 
     class Meta(WebhookBase.Meta):
         swappable = "SIGNAL_WEBHOOKS_CUSTOM_MODEL"
+
+
+class OutboxEntryQuerySet(models.QuerySet):
+    """Outbox entry queryset."""
+
+    def due(self, now: dt.datetime | None = None) -> Self:
+        """Entries that should be sent now, and are not claimed by any worker."""
+        now = now or timezone.now()
+        return self.filter(
+            models.Q(locked_until__isnull=True) | models.Q(locked_until__lt=now),
+            next_attempt_at__lte=now,
+        )
+
+    def claim(self, worker_id: str, batch_size: int) -> list[OutboxEntry]:
+        """
+        Claim a batch of due entries for the given worker for 'SIGNAL_WEBHOOKS.OUTBOX_LEASE_DURATION' seconds.
+
+        If the database supports it, rows are locked with 'SELECT ... FOR UPDATE SKIP LOCKED',
+        so that concurrent workers skip each other's rows instead of waiting for them.
+        Otherwise, entries are claimed with a conditional update, which only succeeds
+        for entries that no other worker has claimed in the meantime.
+        """
+        now = timezone.now()
+        locked_until = now + dt.timedelta(seconds=webhook_settings.OUTBOX_LEASE_DURATION)
+
+        if connections[self.db].features.has_select_for_update_skip_locked:
+            with transaction.atomic(using=self.db):
+                ids = list(self.due(now).select_for_update(skip_locked=True).values_list("id", flat=True)[:batch_size])
+                self.filter(id__in=ids).update(locked_by=worker_id, locked_until=locked_until)
+        else:
+            ids = list(self.due(now).values_list("id", flat=True)[:batch_size])
+            self.due(now).filter(id__in=ids).update(locked_by=worker_id, locked_until=locked_until)
+
+        return list(self.filter(id__in=ids, locked_by=worker_id, locked_until=locked_until))
+
+    def extend_lease(self, worker_id: str) -> int:
+        """Extend the lease of entries claimed by the given worker, so that other workers don't reclaim them."""
+        locked_until = timezone.now() + dt.timedelta(seconds=webhook_settings.OUTBOX_LEASE_DURATION)
+        return self.filter(locked_by=worker_id).update(locked_until=locked_until)
+
+    def release_expired(self) -> int:
+        """Release entries whose lease has expired, e.g., because the worker that claimed them crashed."""
+        return self.filter(locked_until__lt=timezone.now()).update(locked_by="", locked_until=None)
+
+
+class OutboxEntry(models.Model):
+    """Webhook waiting to be sent by the 'runwebhookworker' management command."""
+
+    event_id: uuid.UUID = models.UUIDField(
+        default=uuid.uuid4,
+        db_index=True,
+        verbose_name="event id",
+        help_text="Identifies the model event. Shared by all webhooks fired for the same event.",
+    )
+    webhook_id: int = models.PositiveBigIntegerField(
+        verbose_name="webhook id",
+        help_text="Primary key of the webhook to send.",
+    )
+    ref: str = models.CharField(
+        max_length=1023,
+        verbose_name="referenced model",
+        help_text="Dot import notation to the model the event is for.",
+    )
+    method: str = models.CharField(
+        max_length=255,
+        verbose_name="method",
+        help_text="Signal that caused the event.",
+        choices=MethodChoices.choices,
+    )
+    payload: Any = models.JSONField(
+        verbose_name="payload",
+        help_text="Data sent to the webhook.",
+    )
+    created: dt.datetime = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="created",
+        help_text="When the event happened.",
+    )
+    attempts: int = models.PositiveIntegerField(
+        default=0,
+        verbose_name="attempts",
+        help_text="How many times sending the webhook has been attempted.",
+    )
+    next_attempt_at: dt.datetime = models.DateTimeField(
+        default=timezone.now,
+        db_index=True,
+        verbose_name="next attempt at",
+        help_text="When sending the webhook should be attempted next.",
+    )
+    locked_by: str = models.CharField(
+        default="",
+        blank=True,
+        max_length=255,
+        verbose_name="locked by",
+        help_text="Worker that has claimed this entry for sending.",
+    )
+    locked_until: dt.datetime | None = models.DateTimeField(
+        null=True,
+        default=None,
+        verbose_name="locked until",
+        help_text="When the claim of the worker expires, and other workers can claim the entry.",
+    )
+
+    objects = OutboxEntryQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "outbox entry"
+        verbose_name_plural = "outbox entries"
+        ordering = ["id"]
+
+    def __str__(self) -> str:
+        return f"{self.method} {self.ref} ({self.event_id})"
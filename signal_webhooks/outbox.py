@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+import datetime as dt
+import logging
+import os
+import socket
+import uuid
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+from asgiref.sync import sync_to_async
+from django.utils import timezone
+
+from .cache import get_hooks_for_model
+from .delivery import delivery_loop
+from .handlers import build_client_kwargs_by_hook_id, fire_webhooks
+from .models import OutboxEntry
+from .retry import max_attempts, retry_delay
+from .settings import webhook_settings
+from .utils import get_webhook_model, reference_for_model
+
+if TYPE_CHECKING:
+    from django.db.models import Model
+
+    from .models import WebhookBase
+    from .typing import ClientKwargs, DeliveryResult, JSONData, Method
+
+    # Outbox entries for an event, the webhooks to send them to, and the data to send.
+    Delivery = tuple[list[OutboxEntry], list[WebhookBase], JSONData]
+
+
+__all__ = [
+    "add_to_outbox",
+    "default_worker_id",
+    "deliver_outbox",
+]
+
+
+logger = logging.getLogger(__name__)
+
+
+def add_to_outbox(instance: Model, data: JSONData, method: Method) -> None:
+    """Save an outbox entry for each webhook that should be fired for the given model event."""
+    hooks = get_hooks_for_model(instance, method)
+    if not hooks:
+        return
+
+    ref = reference_for_model(type(instance))
+    event_id = uuid.uuid4()
+
+    OutboxEntry.objects.bulk_create(
+        OutboxEntry(
+            event_id=event_id,
+            webhook_id=hook.id,
+            ref=ref,
+            method=method,
+            payload=data,
+        )
+        for hook in hooks
+    )
+
+
+def default_worker_id() -> str:
+    """Identifier for an outbox worker, unique across processes and hosts."""
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+
+def deliver_outbox(batch_size: int = 100, worker_id: str | None = None) -> int:
+    """
+    Send a batch of webhooks from the outbox.
+
+    The batch is claimed for the worker first, so that multiple workers can send
+    webhooks from the same outbox concurrently without sending the same webhook twice.
+
+    Entries for webhooks that were sent successfully, or that no longer exist or
+    are disabled, are removed from the outbox. Failed entries are attempted again with
+    an exponential backoff starting from 'SIGNAL_WEBHOOKS.OUTBOX_RETRY_DELAY' seconds,
+    or after the delay given in a 'Retry-After' header, until the webhook's 'max_attempts'
+    or 'SIGNAL_WEBHOOKS.OUTBOX_MAX_ATTEMPTS' attempts have been made. Entries that failed
+    in a way that won't succeed by retrying, e.g., with a 400 response, are not retried.
+
+    :param batch_size: Maximum number of outbox entries to process.
+    :param worker_id: Identifier for the worker claiming the entries. Generated if not given.
+    :return: Number of outbox entries processed.
+    """
+    worker_id = worker_id or default_worker_id()
+    entries = OutboxEntry.objects.claim(worker_id, batch_size)
+    if not entries:
+        return 0
+
+    webhook_ids = {entry.webhook_id for entry in entries}
+    hooks_by_id = {hook.id: hook for hook in get_webhook_model().objects.filter(id__in=webhook_ids, enabled=True)}
+
+    deliveries, finished = _group_by_event(entries, hooks_by_id)
+
+    client_kwargs: dict[int, ClientKwargs] = build_client_kwargs_by_hook_id(hooks_by_id.values())
+    results = delivery_loop.run(_fire_all(deliveries, client_kwargs, worker_id))
+
+    failed: list[OutboxEntry] = []
+    now = timezone.now()
+
+    for (delivered_entries, _, _), results_by_hook_id in zip(deliveries, results, strict=True):
+        for entry in delivered_entries:
+            result = results_by_hook_id[entry.webhook_id]
+            if result.succeeded:
+                finished.append(entry)
+                continue
+
+            entry.attempts += 1
+            attempts = max_attempts(hooks_by_id[entry.webhook_id], default=webhook_settings.OUTBOX_MAX_ATTEMPTS)
+            if not result.retryable or entry.attempts >= attempts:
+                logger.warning(f"Webhook {entry.webhook_id} for event {entry.event_id} failed. Giving up.")
+                finished.append(entry)
+                continue
+
+            delay = retry_delay(entry.attempts, webhook_settings.OUTBOX_RETRY_DELAY, result.retry_after)
+            entry.next_attempt_at = now + dt.timedelta(seconds=delay)
+            entry.locked_by = ""
+            entry.locked_until = None
+            failed.append(entry)
+
+    if finished:
+        OutboxEntry.objects.filter(id__in=[entry.id for entry in finished]).delete()
+    if failed:
+        OutboxEntry.objects.bulk_update(failed, fields=["attempts", "next_attempt_at", "locked_by", "locked_until"])
+
+    return len(entries)
+
+
+def _group_by_event(
+    entries: list[OutboxEntry],
+    hooks_by_id: dict[int, WebhookBase],
+) -> tuple[list[Delivery], list[OutboxEntry]]:
+    """Group outbox entries by event, and find the entries for webhooks that no longer exist or are disabled."""
+    entries_by_event: defaultdict[uuid.UUID, list[OutboxEntry]] = defaultdict(list)
+    for entry in entries:
+        entries_by_event[entry.event_id].append(entry)
+
+    deliveries: list[Delivery] = []
+    skipped: list[OutboxEntry] = []
+
+    for event_entries in entries_by_event.values():
+        delivered_entries: list[OutboxEntry] = []
+        hooks: list[WebhookBase] = []
+        for entry in event_entries:
+            hook = hooks_by_id.get(entry.webhook_id)
+            if hook is None:
+                skipped.append(entry)
+                continue
+            delivered_entries.append(entry)
+            hooks.append(copy.copy(hook))
+
+        if hooks:
+            deliveries.append((delivered_entries, hooks, event_entries[0].payload))
+
+    return deliveries, skipped
+
+
+async def _fire_all(
+    deliveries: list[Delivery],
+    client_kwargs: dict[int, ClientKwargs],
+    worker_id: str,
+) -> list[dict[int, DeliveryResult]]:
+    heartbeat = asyncio.create_task(_heartbeat(worker_id))
+    try:
+        return await asyncio.gather(
+            # Failed entries are retried from the outbox, so don't schedule retries in memory.
+            *(fire_webhooks(hooks, payload, client_kwargs, retry=False) for _, hooks, payload in deliveries),
+        )
+    finally:
+        heartbeat.cancel()
+
+
+async def _heartbeat(worker_id: str) -> None:
+    """Extend the claim on the worker's outbox entries until cancelled."""
+    while True:
+        await asyncio.sleep(webhook_settings.OUTBOX_LEASE_DURATION / 2)
+        await sync_to_async(OutboxEntry.objects.extend_lease)(worker_id)
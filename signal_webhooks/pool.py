@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import atexit
+import itertools
+import logging
+import os
+from collections import Counter, deque
+from threading import Condition, Thread, current_thread
+from typing import TYPE_CHECKING
+
+from django.db import close_old_connections
+
+from .deferred import ROW_METHODS
+from .settings import webhook_settings
+
+if TYPE_CHECKING:
+    from .typing import Any, Callable, Hashable, Literal, Method
+
+    FullPolicy = Literal["block", "drop_newest", "drop_oldest", "coalesce"]
+
+
+__all__ = [
+    "WorkerPool",
+    "worker_pool",
+]
+
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerPool:
+    """
+    Fixed number of worker threads that run hooks from a bounded queue.
+
+    What happens when the queue is full is defined by 'SIGNAL_WEBHOOKS.TASK_POOL_FULL_POLICY':
+
+    - "block": Wait until there is room in the queue.
+    - "drop_newest": Drop the new hook.
+    - "drop_oldest": Drop the oldest queued hook to make room for the new one.
+    - "coalesce": Replace a queued hook for the same model instance and method with the
+      new one, so that only the latest state is sent. If there is nothing to replace, wait
+      until there is room in the queue. Hooks are coalesced even if the queue is not full.
+      Only hooks with the full data of a single instance are coalesced, not bulk or batched
+      hooks, or many-to-many hooks with delta payloads.
+
+    Hooks submitted from the worker threads themselves, e.g., for a model saved in a hook,
+    are run right away in the worker thread instead of waiting for room in the queue, since
+    waiting could deadlock the pool.
+    """
+
+    def __init__(self) -> None:
+        self._setup()
+
+    def _setup(self) -> None:
+        self._condition = Condition()
+        self._queue: deque[Hashable] = deque()
+        self._jobs: dict[Hashable, tuple[Callable[..., Any], dict[str, Any]]] = {}
+        self._workers: list[Thread] = []
+        self._counter = itertools.count()
+        self._stats: Counter[str] = Counter()
+        self._running = 0
+
+    def submit(self, hook: Callable[..., Any], **kwargs: Any) -> None:
+        policy: FullPolicy = webhook_settings.TASK_POOL_FULL_POLICY
+        key = self._key(hook, kwargs) if policy == "coalesce" else next(self._counter)
+
+        with self._condition:
+            self._start_workers()
+            self._stats["submitted"] += 1
+
+            if key in self._jobs:
+                self._jobs[key] = (hook, kwargs)
+                self._stats["coalesced"] += 1
+                return
+
+            inline = False
+            if self._is_full():
+                # With an empty queue, i.e., 'TASK_POOL_QUEUE_SIZE' of 0, there is no older task to drop.
+                if policy == "drop_newest" or (policy == "drop_oldest" and not self._queue):
+                    self._stats["dropped"] += 1
+                    logger.warning(f"Webhook task queue is full. Dropped the newest task for {hook!r}.")
+                    return
+
+                if policy == "drop_oldest":
+                    dropped = self._queue.popleft()
+                    self._jobs.pop(dropped)
+                    self._stats["dropped"] += 1
+                    logger.warning("Webhook task queue is full. Dropped the oldest task.")
+
+                elif current_thread() in self._workers:
+                    # Task was submitted by another task, e.g., for a model saved in a hook.
+                    # Waiting for room in the queue could deadlock, if all workers are doing the same.
+                    inline = True
+
+                else:
+                    self._condition.wait_for(lambda: not self._is_full())
+
+            if not inline:
+                self._queue.append(key)
+                self._jobs[key] = (hook, kwargs)
+                self._condition.notify_all()
+                return
+
+        failed = self._run(hook, kwargs)
+        with self._condition:
+            self._stats["failed" if failed else "processed"] += 1
+
+    def stats(self) -> dict[str, int]:
+        """Counters for submitted, processed, failed, dropped, and coalesced tasks, and current queue size."""
+        with self._condition:
+            return {
+                "submitted": self._stats["submitted"],
+                "processed": self._stats["processed"],
+                "failed": self._stats["failed"],
+                "dropped": self._stats["dropped"],
+                "coalesced": self._stats["coalesced"],
+                "queued": len(self._queue),
+            }
+
+    def join(self, timeout: float | None = None) -> bool:
+        """Wait until all queued tasks have been processed. Returns False if timeout was reached."""
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._queue and not self._running, timeout=timeout)
+
+    def after_fork(self) -> None:
+        """Forget the parent process' queue and workers, since the worker threads don't exist in the child."""
+        self._setup()
+
+    def _is_full(self) -> bool:
+        return len(self._queue) >= webhook_settings.TASK_POOL_QUEUE_SIZE
+
+    def _start_workers(self) -> None:
+        if self._workers:
+            return
+
+        for i in range(webhook_settings.TASK_POOL_WORKERS):
+            worker = Thread(target=self._work, name=f"django-signal-webhooks-worker-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def _work(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._queue)
+                key = self._queue.popleft()
+                hook, kwargs = self._jobs.pop(key)
+                self._running += 1
+                self._condition.notify_all()
+
+            try:
+                failed = self._run(hook, kwargs)
+            finally:
+                close_old_connections()
+
+            with self._condition:
+                self._running -= 1
+                self._stats["failed" if failed else "processed"] += 1
+                self._condition.notify_all()
+
+    @staticmethod
+    def _run(hook: Callable[..., Any], kwargs: dict[str, Any]) -> bool:
+        """Run the hook. Returns True if it failed."""
+        try:
+            hook(**kwargs)
+        except Exception as error:
+            logger.exception(f"Webhook task {hook!r} failed.", exc_info=error)
+            return True
+        return False
+
+    def _key(self, hook: Callable[..., Any], kwargs: dict[str, Any]) -> Hashable:
+        instance = kwargs.get("instance")
+        if instance is None or instance.pk is None:
+            return next(self._counter)
+
+        # Only full snapshots of a single instance can replace each other. Bulk and batched
+        # payloads contain other instances too, and many-to-many deltas only their own changes.
+        method: Method | None = kwargs.get("method")
+        if isinstance(kwargs.get("data"), list) or (method not in ROW_METHODS and webhook_settings.M2M_DELTA_PAYLOADS):
+            return next(self._counter)
+
+        return (hook, type(instance), instance.pk, method)
+
+
+worker_pool = WorkerPool()
+
+atexit.register(worker_pool.join, timeout=5)
+
+if hasattr(os, "register_at_fork"):  # pragma: no branch
+    os.register_at_fork(after_in_child=worker_pool.after_fork)
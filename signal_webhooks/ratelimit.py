@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+import uuid
+from contextlib import contextmanager
+from threading import Lock
+from typing import TYPE_CHECKING
+
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
+
+from .settings import webhook_settings
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    from django.core.cache import BaseCache
+
+    from .models import WebhookBase
+
+
+__all__ = [
+    "CacheTokenBuckets",
+    "LocalTokenBuckets",
+    "RateLimiter",
+    "rate_limiter",
+]
+
+
+logger = logging.getLogger(__name__)
+
+
+def take_token(tokens: float, updated: float, now: float, rate: int) -> tuple[float, float]:
+    """
+    Take a token from a token bucket that holds at most 'rate' tokens and is refilled
+    with 'rate' tokens per second. If the bucket is empty, the token is reserved from
+    the tokens that are added to the bucket later, so the number of tokens can go negative.
+
+    :param tokens: Number of tokens in the bucket when it was last updated.
+    :param updated: When the bucket was last updated, in seconds.
+    :param now: Current time, in seconds.
+    :param rate: Number of tokens added to the bucket per second.
+    :return: Number of tokens left in the bucket, and number of seconds to wait until the token is available.
+    """
+    tokens = min(tokens + (now - updated) * rate, rate) - 1
+    delay = 0.0 if tokens >= 0 else -tokens / rate
+    return tokens, delay
+
+
+class LocalTokenBuckets:
+    """Process-local token buckets by key."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._buckets: dict[str, tuple[float, float]] = {}
+
+    def reserve(self, key: str, rate: int) -> float:
+        """Take a token from the bucket with the given key, and return the number of seconds to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated = self._buckets.get(key, (rate, now))
+            tokens, delay = take_token(tokens, updated, now, rate)
+            self._buckets[key] = (tokens, now)
+        return delay
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class CacheTokenBuckets:
+    """
+    Token buckets by key, shared between processes through a cache in the 'CACHES' setting.
+
+    Buckets are updated while holding a lock added to the same cache, so the cache
+    backend's 'add' should be atomic, as it is for the built-in backends. The bucket's
+    timestamp uses wall-clock time, so the clocks of the processes should be in sync.
+    If the lock cannot be acquired in 'lock_wait' seconds, 'TimeoutError' is raised.
+    """
+
+    # Seconds after which a lock is released, even if the process holding it didn't release it.
+    lock_timeout: int = 1
+    # Seconds to wait between attempts to acquire a lock.
+    lock_interval: float = 0.005
+    # Seconds to wait for a lock before giving up.
+    lock_wait: float = 2.0
+
+    def reserve(self, alias: str, key: str, rate: int) -> float:
+        """Take a token from the bucket with the given key, and return the number of seconds to wait for it."""
+        cache = caches[alias]
+        bucket_key = f"{webhook_settings.RATE_LIMIT_KEY_PREFIX}:{key}"
+
+        with self._lock(cache, f"{bucket_key}:lock"):
+            now = time.time()
+            tokens, updated = cache.get(bucket_key) or (rate, now)
+            tokens, delay = take_token(tokens, updated, now, rate)
+            # Bucket is full again after the reserved tokens and one second of refills,
+            # after which a missing bucket is the same as a full one.
+            cache.set(bucket_key, (tokens, now), timeout=math.ceil(delay) + 2)
+
+        return delay
+
+    @contextmanager
+    def _lock(self, cache: BaseCache, lock_key: str) -> Generator[None, None, None]:
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.lock_wait
+        while not cache.add(lock_key, token, timeout=self.lock_timeout):
+            if time.monotonic() >= deadline:
+                msg = f"Could not acquire the rate limit lock {lock_key!r} in {self.lock_wait} seconds."
+                raise TimeoutError(msg)
+            time.sleep(self.lock_interval)
+        try:
+            yield
+        finally:
+            # Don't release a lock that has timed out and was acquired by another process.
+            if cache.get(lock_key) == token:
+                cache.delete(lock_key)
+
+
+class RateLimiter:
+    """
+    Limits the rate of requests sent to webhooks with a 'rate_limit' using token buckets.
+
+    Each webhook has a bucket that holds at most 'rate_limit' tokens, and is refilled with
+    'rate_limit' tokens per second, so short bursts up to the limit are sent right away.
+    Requests over the limit are delayed until a token is available, instead of being dropped.
+
+    Buckets are process-local, unless 'SIGNAL_WEBHOOKS.RATE_LIMIT_BACKEND' is set, in which case
+    they are shared between processes through the cache with that alias. If the shared bucket
+    cannot be locked in time, the process-local bucket is used instead.
+    """
+
+    def __init__(self) -> None:
+        self.local = LocalTokenBuckets()
+        self.shared = CacheTokenBuckets()
+
+    async def wait(self, hook: WebhookBase) -> float:
+        """Wait until the webhook can be sent within its rate limit. Returns the number of seconds waited."""
+        rate: int | None = hook.rate_limit
+        if rate is None:
+            return 0.0
+
+        key = self.key_for(hook)
+        alias: str | None = webhook_settings.RATE_LIMIT_BACKEND
+        if alias is None:
+            delay = self.local.reserve(key, rate)
+        else:
+            # Don't block the thread used for database access while waiting for the lock.
+            try:
+                delay = await sync_to_async(self.shared.reserve, thread_sensitive=False)(alias, key, rate)
+            except TimeoutError as error:
+                logger.warning(f"{error} Using the process-local rate limit for webhook {hook.name!r}.")
+                delay = self.local.reserve(key, rate)
+
+        if delay > 0:
+            logger.debug(f"Webhook {hook.name!r} delayed by {delay:.3f} seconds due to its rate limit.")
+            await asyncio.sleep(delay)
+        return delay
+
+    @staticmethod
+    def key_for(hook: WebhookBase) -> str:
+        return f"{hook._meta.label_lower}:{hook.pk}"
+
+    def clear(self) -> None:
+        self.local.clear()
+
+
+rate_limiter = RateLimiter()
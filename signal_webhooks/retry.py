@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from threading import Lock
+from typing import TYPE_CHECKING
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.utils.http import parse_http_date_safe
+
+from .delivery import delivery_loop
+from .settings import webhook_settings
+from .utils import get_webhook_model
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+    from .models import WebhookBase
+    from .typing import JSONData
+
+
+__all__ = [
+    "RetryScheduler",
+    "is_retryable",
+    "max_attempts",
+    "parse_retry_after",
+    "retry_delay",
+    "retry_scheduler",
+]
+
+
+logger = logging.getLogger(__name__)
+
+
+# Status codes for responses that might succeed if the request is retried.
+RETRYABLE_STATUS_CODES: frozenset[int] = frozenset((408, 425, 429, 500, 502, 503, 504))
+
+
+def is_retryable(response: httpx.Response | None, error: Exception | None = None) -> bool:
+    """Could sending the webhook succeed if it's attempted again?"""
+    if error is not None:
+        return isinstance(error, httpx.TransportError)
+    return response is not None and response.status_code in RETRYABLE_STATUS_CODES
+
+
+def parse_retry_after(response: httpx.Response | None) -> float | None:
+    """Number of seconds to wait before retrying from the 'Retry-After' header of a 429 or 503 response."""
+    if response is None or response.status_code not in (429, 503):
+        return None
+
+    value = response.headers.get("Retry-After", "").strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+
+    timestamp = parse_http_date_safe(value)
+    if timestamp is None:
+        return None
+    return max(timestamp - time.time(), 0.0)
+
+
+def retry_delay(attempts: int, base: float, retry_after: float | None = None) -> float:
+    """
+    Number of seconds to wait before the next attempt to send a webhook.
+
+    The delay grows exponentially with the number of failed attempts, up to
+    'SIGNAL_WEBHOOKS.RETRY_BACKOFF_MAX' seconds, with random jitter, so that
+    webhooks that failed at the same time are not all retried at the same time.
+    A delay given by the receiver in a 'Retry-After' header is used as is,
+    but is still capped to the maximum delay.
+
+    :param attempts: Number of failed attempts so far.
+    :param base: Delay after the first failed attempt.
+    :param retry_after: Delay from the 'Retry-After' header of the last response.
+    """
+    maximum: float = webhook_settings.RETRY_BACKOFF_MAX
+    if retry_after is not None:
+        return min(retry_after, maximum)
+
+    delay = min(base * 2 ** (attempts - 1), maximum)
+    return delay / 2 + random.uniform(0, delay / 2)  # noqa: S311
+
+
+def max_attempts(hook: WebhookBase, default: int) -> int:
+    """Maximum number of times sending the given webhook is attempted."""
+    return hook.max_attempts or default
+
+
+class RetryScheduler:
+    """
+    Schedules failed webhooks to be sent again in the delivery loop.
+
+    Waiting for a retry doesn't block any thread, since the waiting is done
+    in the delivery loop. Retries that are still waiting when the process exits
+    are lost. Use the outbox for retries that should survive restarts.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._futures: set[Future] = set()
+
+    def schedule(self, hook: WebhookBase, data: JSONData, attempt: int, delay: float) -> None:
+        """
+        Send the given webhook again after the given delay.
+
+        The webhook is fetched again before it's sent, so that changes to it since
+        the failed attempt are used, and removed or disabled webhooks are not sent.
+
+        :param hook: Webhook to send.
+        :param data: Data to send.
+        :param attempt: Number of the attempt to make.
+        :param delay: Number of seconds to wait before sending.
+        """
+        logger.info(f"Webhook {hook.name!r} will be attempted again in {delay:.1f} seconds (attempt {attempt}).")
+        future = delivery_loop.submit(self._retry(hook, data, attempt, delay))
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(self._discard)
+
+    @property
+    def pending(self) -> int:
+        """Number of scheduled retries that have not finished yet."""
+        return len(self._futures)
+
+    async def join(self) -> None:
+        """Wait until all scheduled retries, including retries scheduled by them, have finished."""
+        while True:
+            with self._lock:
+                futures = list(self._futures)
+            if not futures:
+                return
+            await asyncio.wait([asyncio.wrap_future(future) for future in futures])
+
+    @staticmethod
+    async def _retry(hook: WebhookBase, data: JSONData, attempt: int, delay: float) -> None:
+        from .handlers import build_client_kwargs_by_hook_id, fire_webhooks  # noqa: PLC0415
+
+        await asyncio.sleep(delay)
+
+        name = hook.name
+        queryset = get_webhook_model().objects.filter(pk=hook.pk, enabled=True)
+        hook = await sync_to_async(queryset.first)()
+        if hook is None:
+            logger.info(f"Webhook {name!r} was removed or disabled. Not attempted again.")
+            return
+
+        await fire_webhooks([hook], data, build_client_kwargs_by_hook_id([hook]), attempt=attempt)
+
+    def _discard(self, future: Future) -> None:
+        with self._lock:
+            self._futures.discard(future)
+
+
+retry_scheduler = RetryScheduler()
@@ -1,15 +1,27 @@
 from __future__ import annotations
 
+import datetime as dt
 import json
 import logging
-from typing import TYPE_CHECKING
+from decimal import Decimal
+from functools import cache
+from typing import TYPE_CHECKING, NamedTuple
 
 from django.core.serializers import python
+from django.db.models import CompositePrimaryKey, Field
+
+from .settings import webhook_settings
 
 if TYPE_CHECKING:
     from django.db import models
+    from django.db.models.base import ModelBase
+
+    from .typing import Any, JSONData
 
 __all__ = [
+    "FieldPlan",
+    "PlannedField",
+    "fast_webhook_serializer",
     "webhook_serializer",
 ]
 
@@ -29,7 +41,130 @@ def handle_m2m_field(self, obj: models.Model, field: models.Field) -> None:
 
     def end_serialization(self) -> None:
         # Convert any non-serializable objects to strings
-        self.objects = json.loads(json.dumps(self.objects[0], default=str))
+        self.objects = json.loads(webhook_settings.JSON_ENCODER(self.objects[0]))
 
 
 webhook_serializer = _WebhookSerializer()
+
+
+class PlannedField(NamedTuple):
+    name: str
+    attname: str
+    field: models.Field
+    # Does the field use the default 'Field.value_to_string', i.e., 'str(value)'?
+    default_to_string: bool
+
+    @classmethod
+    def from_field(cls, field: models.Field) -> PlannedField:
+        default_to_string = type(field).value_to_string is Field.value_to_string
+        return cls(name=field.name, attname=field.attname, field=field, default_to_string=default_to_string)
+
+
+class FieldPlan(NamedTuple):
+    """Precompiled serialization plan for a model."""
+
+    # Fields making up the primary key.
+    pk: tuple[PlannedField, ...]
+    # Is the primary key a composite primary key?
+    composite_pk: bool
+    # Concrete local fields to serialize.
+    fields: tuple[PlannedField, ...]
+    # Many-to-many fields with auto-created through models to serialize.
+    m2m_fields: tuple[models.ManyToManyField, ...]
+
+
+@cache
+def field_plan(model: ModelBase, fields: frozenset[str] | None = None) -> FieldPlan:
+    """
+    Build the serialization plan for the given model. Fields are the same as for Django's python serializer.
+
+    :param model: Model to build the plan for.
+    :param fields: Names of the fields to serialize. If None, all fields are serialized.
+    """
+    # Use the concrete model to avoid 'local_fields' problems for proxy models.
+    opts = model._meta.concrete_model._meta
+    composite_pk = isinstance(opts.pk, CompositePrimaryKey)
+    return FieldPlan(
+        pk=tuple(PlannedField.from_field(field) for field in (opts.pk if composite_pk else [opts.pk])),
+        composite_pk=composite_pk,
+        fields=tuple(
+            PlannedField.from_field(field)
+            for field in opts.local_fields
+            if field.serialize and (fields is None or field.name in fields)
+        ),
+        m2m_fields=tuple(
+            field
+            for field in opts.local_many_to_many
+            if field.serialize
+            and field.remote_field.through._meta.auto_created
+            and (fields is None or field.name in fields)
+        ),
+    )
+
+
+class _FastWebhookSerializer:
+    """
+    Serializer producing the same data as 'webhook_serializer' in a single pass.
+
+    Fields to serialize are compiled once per model into a 'FieldPlan', and values
+    are converted directly to json-acceptable data instead of round-tripping through json.
+    """
+
+    def serialize(self, instance: models.Model, fields: frozenset[str] | None = None) -> JSONData:
+        plan = field_plan(type(instance), fields)
+        data: dict[str, Any] = {}
+
+        for planned in plan.fields:
+            data[planned.name] = self.value_from_field(instance, planned)
+
+        for field in plan.m2m_fields:
+            data[field.name] = self.m2m_value(instance, field)
+
+        return {
+            "model": str(instance._meta),
+            "pk": self.pk_value(instance, plan),
+            "fields": data,
+        }
+
+    def pk_value(self, instance: models.Model, plan: FieldPlan) -> Any:
+        values = [self.value_from_field(instance, planned) for planned in plan.pk]
+        return values if plan.composite_pk else values[0]
+
+    def m2m_value(self, instance: models.Model, field: models.ManyToManyField) -> list[Any]:
+        related_plan = field_plan(field.remote_field.model)
+        try:
+            related = instance._prefetched_objects_cache[field.name]
+        except (AttributeError, KeyError):
+            try:
+                related = list(getattr(instance, field.name).select_related(None).only("pk"))
+            except Exception as error:
+                logger.debug(f"Skip {field.name!r} during post-delete signal.", exc_info=error)
+                return []
+
+        return [self.pk_value(obj, related_plan) for obj in related]
+
+    def value_from_field(self, instance: models.Model, planned: PlannedField) -> Any:
+        value = getattr(instance, planned.attname)
+        # Same conversion as 'python.Serializer._value_from_field' followed by 'json.dumps(..., default=str)'.
+        if value is None or isinstance(value, (int, float)):
+            return value
+        if isinstance(value, (Decimal, dt.date, dt.time)):
+            return str(value)
+        if planned.default_to_string:
+            return str(value)
+        return to_json_data(planned.field.value_to_string(instance))
+
+
+def to_json_data(value: Any) -> JSONData:
+    """Convert any non-serializable values to strings."""
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    if isinstance(value, dict):
+        # Non-string keys are converted the same way as 'json.dumps' does, e.g., True -> "true".
+        return {key if isinstance(key, str) else json.dumps(key): to_json_data(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json_data(item) for item in value]
+    return str(value)
+
+
+fast_webhook_serializer = _FastWebhookSerializer()
@@ -1,15 +1,38 @@
 from __future__ import annotations
 
+import logging
+from typing import TYPE_CHECKING
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured, ValidationError
 from django.test.signals import setting_changed
 from settings_holder import SettingsHolder, reload_settings
 
-from .typing import Any, HooksData, NamedTuple, Union
+from .typing import Any, HooksData, MethodChoices, NamedTuple, Union
+
+if TYPE_CHECKING:
+    from types import EllipsisType
+
+    from django.db.models.base import ModelBase
+
+    from .typing import Callable, Iterable, Method
+
+    # Hooks by model class and method. Default hooks are kept as ... (ellipsis).
+    HookTable = dict[tuple[ModelBase, Method], Callable[..., Any] | EllipsisType]
+
+    # Names and attribute names of watched fields by model class.
+    WatchedFields = dict[ModelBase, frozenset[str]]
+
+    # Names of the fields to serialize by model class.
+    SerializedFields = dict[ModelBase, frozenset[str]]
 
 __all__ = [
     "webhook_settings",
 ]
 
 
+logger = logging.getLogger(__name__)
+
+
 class DefaultSettings(NamedTuple):
     #
     # Defines hooks for models. Key in the dict is the dot import path for a model,
@@ -20,11 +43,56 @@ class DefaultSettings(NamedTuple):
     # 'HooksData') to None will explicitly not allow hooks for that model (or appropriate
     # signal from 'HooksData' key). Webhooks cannot be created without the appropriate
     # definition in this setting.
+    #
+    # A model's hooks dict can also contain 'WATCHED_FIELDS': names of the model fields
+    # whose changes should be sent. Updates saved with 'update_fields' that don't include
+    # any of these fields are ignored before the instance is serialized or webhooks are
+    # looked up. Updates saved without 'update_fields' are always sent.
+    #
+    # A model's hooks dict can also contain 'FIELDS' and/or 'EXCLUDE': names of the model
+    # fields to include in or exclude from the data serialized by the default serializers.
+    # Other fields are not accessed during serialization. The primary key is always included.
     HOOKS: dict[str, HooksData | None] = {}
     #
     # Timeout for responses from webhooks before they fail.
     TIMEOUT: int = 10
     #
+    # Webhooks are sent using an http client that is shared by all webhooks sent from
+    # the same process, so that connections to webhook endpoints can be reused.
+    # These set the maximum number of connections in the client's connection pool,
+    # and the maximum number of idle connections kept alive. None means no limit.
+    CLIENT_MAX_CONNECTIONS: int | None = 100
+    CLIENT_MAX_KEEPALIVE_CONNECTIONS: int | None = 20
+    #
+    # When set, each endpoint host gets its own connection pool with at most this many
+    # connections, and at most this many requests are sent to the same host at once.
+    # Other requests to the host wait for their turn, so that a slow host cannot use up
+    # the connections or block the requests to other hosts. None means that all hosts
+    # share the same connection pool without per-host limits.
+    CLIENT_MAX_CONNECTIONS_PER_HOST: int | None = None
+    #
+    # When enabled, the number of in-flight requests to each endpoint host is adjusted
+    # based on the observed latency of the requests. The limit starts at the initial value,
+    # grows while the requests succeed with stable latency, and is cut by the backoff factor
+    # when requests time out or fail with a retryable error response (e.g., 5xx).
+    # Latency is considered stable while it's within the tolerance multiple of the lowest
+    # recently observed latency. The limit stays between the minimum and
+    # 'CLIENT_MAX_CONNECTIONS_PER_HOST', or 'CLIENT_MAX_CONNECTIONS' if that's not set.
+    # If neither is set, the limit has no upper bound.
+    # Current limits can be inspected with 'delivery_loop.limits()'.
+    ADAPTIVE_CONCURRENCY: bool = False
+    ADAPTIVE_CONCURRENCY_INITIAL: int = 4
+    ADAPTIVE_CONCURRENCY_MIN: int = 1
+    ADAPTIVE_CONCURRENCY_BACKOFF: float = 0.5
+    ADAPTIVE_CONCURRENCY_LATENCY_TOLERANCE: float = 2.0
+    #
+    # Number of seconds an idle connection is kept alive in the connection pool.
+    CLIENT_KEEPALIVE_EXPIRY: float | None = 5.0
+    #
+    # Should HTTP/2 be used for endpoints that support it?
+    # Requires the 'h2' package to be installed, e.g., with 'httpx[http2]'.
+    CLIENT_HTTP2: bool = False
+    #
     # Cipher key to use when encrypting tokens into the database.
     # Should be 16, 24, or 32 bytes converted to base64. You can use
     # 'signal_webhooks.utils.random_cipher_key' to generate one.
@@ -43,8 +111,32 @@ class DefaultSettings(NamedTuple):
     # Can also be overridden on per-model basis by declaring a 'webhook_data'
     # method on the model. This function takes no arguments, and should return
     # data matching 'signal_webhooks.typing.JSONData'.
+    #
+    # 'signal_webhooks.utils.fast_serializer' produces the same data as the default
+    # serializer, but compiles the fields to serialize once per model and converts them
+    # to json-acceptable data in a single pass.
     SERIALIZER: str = "signal_webhooks.utils.default_serializer"
     #
+    # Function to use for encoding webhook data to json. Takes these arguments (data: Any),
+    # and should return the json as utf-8 encoded bytes. Non-serializable values, e.g.,
+    # datetimes, Decimals, and UUIDs, should be converted with 'str'. Used for encoding
+    # webhook payloads and by the default serializer for converting serialized data.
+    #
+    # 'signal_webhooks.utils.orjson_encoder' uses 'orjson', which must be installed separately.
+    JSON_ENCODER: str = "signal_webhooks.utils.default_json_encoder"
+    #
+    # When this is set to True, serialized data is memoized by model, primary key, and
+    # the state of the instance, so that events for an instance whose state hasn't
+    # changed, e.g., updates and many-to-many changes that don't change the serialized
+    # fields, reuse the same data. Data is only memoized during a request, and in code
+    # using 'signal_webhooks.memo.payload_memo.scope()', e.g., in management commands
+    # or tasks. Data memoized in a transaction is dropped when the transaction ends.
+    # 'SERIALIZER' should only depend on the instance's fields and many-to-many relations.
+    PAYLOAD_MEMO: bool = False
+    #
+    # Maximum number of serialized payloads kept in the memo.
+    PAYLOAD_MEMO_SIZE: int = 128
+    #
     # Hook for adding additional arguments for the http client that sends the webhooks.
     # Takes these arguments (hook: Webhook), and should return data matching
     # 'signal_webhooks.typing.ClientKwargs'. Note that the headers from the hook will be
@@ -68,16 +160,154 @@ class DefaultSettings(NamedTuple):
     #
     # Function that starts the hook once it has been found. Takes these arguments
     # (hook: Callable[..., None], **kwargs: Any) and returns None. The default handler
-    # starts a thread that calls the hook with the given kwargs.
+    # starts a thread that calls the hook with the given kwargs. Use
+    # 'signal_webhooks.handlers.loop_task_handler' to send webhooks concurrently in
+    # a single background event loop without starting a thread for each event, or
+    # 'signal_webhooks.handlers.pool_task_handler' to run hooks in a fixed number of
+    # worker threads from a bounded queue, or 'signal_webhooks.handlers.outbox_task_handler'
+    # to save webhooks to the database, to be sent by the 'runwebhookworker' management command.
     TASK_HANDLER: str = "signal_webhooks.handlers.thread_task_handler"
     #
-    # Unique id for the 'signals.post_save' receiver the webhooks are using.
+    # Number of worker threads used by 'signal_webhooks.handlers.pool_task_handler'.
+    TASK_POOL_WORKERS: int = 4
+    #
+    # Maximum number of hooks waiting in the queue of 'signal_webhooks.handlers.pool_task_handler'.
+    TASK_POOL_QUEUE_SIZE: int = 1000
+    #
+    # What to do when the queue of 'signal_webhooks.handlers.pool_task_handler' is full:
+    # "block" waits until there is room in the queue, "drop_newest" drops the new hook,
+    # "drop_oldest" drops the oldest queued hook, and "coalesce" replaces a queued hook for
+    # the same model instance and signal with the new one (waiting if there is none).
+    # Instead of waiting, hooks submitted from the worker threads are run in the submitting thread.
+    # Counts of dropped and coalesced hooks are available from
+    # 'signal_webhooks.pool.worker_pool.stats()'.
+    TASK_POOL_FULL_POLICY: str = "block"
+    #
+    # Maximum number of times sending a webhook is attempted, for webhooks that don't
+    # set 'max_attempts'. Webhooks that fail with a connection error, a timeout, or a
+    # response with status 408, 425, 429, 500, 502, 503, or 504 are retried after a delay
+    # in the background, without blocking the thread that sent them. Scheduled retries
+    # are lost if the process exits. Use the outbox for retries that survive restarts.
+    MAX_ATTEMPTS: int = 1
+    #
+    # Number of seconds to wait before retrying a failed webhook for the first time.
+    # The delay is doubled after each failed attempt, and has random jitter.
+    RETRY_BACKOFF: float = 1.0
+    #
+    # Maximum number of seconds to wait before retrying a failed webhook, also when
+    # the receiver asks for a longer delay with a 'Retry-After' header.
+    RETRY_BACKOFF_MAX: float = 300.0
+    #
+    # When this is set to True, requests to webhook endpoints go through process-local
+    # circuit breakers. When too many requests to an endpoint fail with connection errors,
+    # timeouts, or retryable error responses, the breaker opens, and webhooks to that
+    # endpoint fail immediately with 'WebhookCircuitOpen' without sending a request.
+    # After a timeout, a single probe request is allowed, and if it succeeds,
+    # the breaker closes again.
+    CIRCUIT_BREAKER: bool = False
+    #
+    # Are circuit breakers kept per endpoint "host" (scheme, host and port),
+    # or per "endpoint" (the full endpoint url)?
+    CIRCUIT_BREAKER_SCOPE: str = "host"
+    #
+    # Number of latest requests whose results are used for the failure rate.
+    CIRCUIT_BREAKER_WINDOW: int = 20
+    #
+    # Minimum number of requests in the window before the breaker can open.
+    CIRCUIT_BREAKER_MIN_REQUESTS: int = 5
+    #
+    # Rate of failed requests in the window, between 0 and 1, at which the breaker opens.
+    CIRCUIT_BREAKER_FAILURE_RATE: float = 0.5
+    #
+    # Number of seconds the breaker stays open before a probe request is allowed.
+    CIRCUIT_BREAKER_RESET_TIMEOUT: float = 30.0
+    #
+    # Number of seconds to wait before sending a failed webhook from the outbox again.
+    # The delay is doubled after each failed attempt, and has random jitter, up to
+    # 'RETRY_BACKOFF_MAX'. A 'Retry-After' header in the response is used instead if given.
+    OUTBOX_RETRY_DELAY: int = 60
+    #
+    # Maximum number of times sending a webhook from the outbox is attempted,
+    # for webhooks that don't set 'max_attempts'.
+    OUTBOX_MAX_ATTEMPTS: int = 5
+    #
+    # Number of seconds an outbox worker holds its claim on a batch of outbox entries.
+    # The claim is extended while the batch is being sent. If the worker crashes, other
+    # workers can claim the entries after the claim expires.
+    OUTBOX_LEASE_DURATION: int = 60
+    #
+    # When this is set to True, webhooks for model changes made inside a transaction are
+    # only sent after the transaction is committed, and not at all if it's rolled back.
+    # Multiple changes to the same model instance in the same transaction are coalesced
+    # into a single webhook with the final state of the instance: a create followed by
+    # updates is sent as a create, and any change followed by a delete is sent as a delete.
+    # Changes to many-to-many relations are coalesced separately for each signal.
+    # Has no effect with 'signal_webhooks.handlers.outbox_task_handler', which already
+    # saves the webhooks in the same transaction as the model change.
+    FIRE_ON_COMMIT: bool = False
+    #
+    # When this is set to True, instances deleted by the same delete call, e.g., a parent
+    # and the children deleted by cascade, or the instances in a deleted queryset, are sent
+    # in a single webhook per model with a list of the deleted instances. Deletes are sent
+    # as a list even if only one instance was deleted. The webhooks are sent after the
+    # transaction of the delete is committed. Has no effect with
+    # 'signal_webhooks.handlers.outbox_task_handler', for the same reason as 'FIRE_ON_COMMIT'.
+    BATCH_CASCADE_DELETES: bool = False
+    #
+    # When this is set to True, webhooks for many-to-many changes don't serialize the whole
+    # instance. Instead, they send the changed relation and the primary keys of the related
+    # instances that were added or removed, e.g., {"model": "auth.user", "pk": 1,
+    # "relation": "groups", "added": [2], "removed": [], "cleared": false}.
+    M2M_DELTA_PAYLOADS: bool = False
+    #
+    # When this is set to True, the default hook handler will check that at least one
+    # enabled webhook exists for the model and signal before the instance is serialized
+    # and the task handler is called. This avoids serializing instances on the calling
+    # thread for models that have no webhooks in the database, at the cost of one
+    # extra query when webhooks do exist.
+    CHECK_HOOKS_BEFORE_SERIALIZING: bool = False
+    #
+    # When this is set to True, enabled webhooks are cached in process memory by
+    # model, signal and the arguments from 'FILTER_KWARGS', so that finding the webhooks
+    # to fire doesn't require a database query. The cache is cleared when a webhook
+    # is saved, deleted or updated through the webhook model. To detect changes made
+    # in other processes, set 'CACHE_HOOKS_BACKEND'.
+    CACHE_HOOKS: bool = False
+    #
+    # Alias of a cache in the 'CACHES' setting, used to share a generation token for
+    # the webhook cache between processes. When webhooks are changed in any process,
+    # the token is replaced, and the other processes will clear their webhook cache
+    # the next time they check the token. If None, webhook caches are not shared.
+    CACHE_HOOKS_BACKEND: str | None = None
+    #
+    # Key used to store the webhook cache generation token in 'CACHE_HOOKS_BACKEND'.
+    CACHE_HOOKS_GENERATION_KEY: str = "django-signal-webhooks-generation"
+    #
+    # Minimum number of seconds between checking the webhook cache generation token
+    # from 'CACHE_HOOKS_BACKEND'. This bounds how long a process can use outdated
+    # webhooks. When set to 0, the token is checked every time webhooks are fired.
+    CACHE_HOOKS_CHECK_INTERVAL: float = 0
+    #
+    # Webhooks with a 'rate_limit' are sent at most that many times per second, with bursts
+    # of up to 'rate_limit' requests. Requests over the limit are delayed, not dropped.
+    # By default, the limit is enforced separately in each process. Set this to the alias
+    # of a cache in the 'CACHES' setting to share the limit between processes.
+    RATE_LIMIT_BACKEND: str | None = None
+    #
+    # Prefix for the keys used to store the rate limits in 'RATE_LIMIT_BACKEND'.
+    RATE_LIMIT_KEY_PREFIX: str = "django-signal-webhooks-rate-limit"
+    #
+    # Webhook signal receivers are connected only for the models in 'HOOKS', and
+    # reconnected when the settings change. These are the prefixes for the unique ids
+    # of the receivers, which are completed with the dot import path of the sender model.
+    #
+    # Prefix for the unique ids of the 'signals.post_save' receivers the webhooks are using.
     DISPATCH_UID_POST_SAVE: str = "django-signal-webhooks-post-save"
     #
-    # Unique id for the 'signals.post_delete' receiver the webhooks are using.
+    # Prefix for the unique ids of the 'signals.post_delete' receivers the webhooks are using.
     DISPATCH_UID_POST_DELETE: str = "django-signal-webhooks-post-delete"
     #
-    # Unique id for the 'signals.m2m_changed' receiver the webhooks are using.
+    # Prefix for the unique ids of the 'signals.m2m_changed' receivers the webhooks are using.
     DISPATCH_UID_M2M_CHANGED: str = "django-signal-webhooks-m2m-changed"
 
 
@@ -88,6 +318,7 @@ class DefaultSettings(NamedTuple):
 IMPORT_STRINGS: set[Union[bytes, str]] = {
     "HOOKS",
     "SERIALIZER",
+    "JSON_ENCODER",
     "CLIENT_KWARGS",
     "FILTER_KWARGS",
     "ERROR_HANDLER",
@@ -98,10 +329,122 @@ class DefaultSettings(NamedTuple):
 
 
 class WebhookSettingsHolder(SettingsHolder):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self._hook_table: HookTable | None = None
+        self._watched_fields: WatchedFields | None = None
+        self._serialized_fields: SerializedFields | None = None
+        super().__init__(*args, **kwargs)
+
+    @property
+    def hook_table(self) -> HookTable:
+        """'HOOKS' compiled into a table of hooks by model class and method. See 'compile_hooks'."""
+        if self._hook_table is None:
+            self._hook_table, self._watched_fields, self._serialized_fields = self.compile_hooks()
+        return self._hook_table
+
+    @property
+    def watched_fields(self) -> WatchedFields:
+        """Watched fields from 'HOOKS' by model class. See 'compile_hooks'."""
+        if self._watched_fields is None:
+            self._hook_table, self._watched_fields, self._serialized_fields = self.compile_hooks()
+        return self._watched_fields
+
+    @property
+    def serialized_fields(self) -> SerializedFields:
+        """Fields to serialize from 'HOOKS' by model class. See 'compile_hooks'."""
+        if self._serialized_fields is None:
+            self._hook_table, self._watched_fields, self._serialized_fields = self.compile_hooks()
+        return self._serialized_fields
+
+    def compile_hooks(self) -> tuple[HookTable, WatchedFields, SerializedFields]:
+        """
+        Compile 'HOOKS' into a table of hooks by model class and method,
+        and the watched fields and fields to serialize by model class.
+
+        Models and methods without hooks are left out of the table. Default hooks are
+        kept as ... (ellipsis), and should be replaced with the default hook handler
+        when the hook is used. Watched fields include both the names and the attribute
+        names of the fields, since either can be used in 'update_fields'.
+        Models must be loaded before 'HOOKS' can be compiled.
+        """
+        from .utils import model_from_reference  # noqa: PLC0415
+
+        table: HookTable = {}
+        watched_fields: WatchedFields = {}
+        serialized_fields: SerializedFields = {}
+        for ref, hooks in self.HOOKS.items():
+            if hooks is None:
+                continue
+
+            try:
+                model = model_from_reference(ref, check_hooks=False)
+            except ValidationError as error:
+                logger.warning(f"Webhooks not enabled for {ref!r}. {error.message}")
+                continue
+
+            for method in MethodChoices.values:
+                hook = ... if hooks is ... else hooks.get(method)
+                if hook is not None:
+                    table[model, method] = hook
+
+            if hooks is ...:
+                continue
+
+            if "WATCHED_FIELDS" in hooks:
+                watched_fields[model] = self.compile_watched_fields(ref, model, hooks["WATCHED_FIELDS"])
+
+            if "FIELDS" in hooks or "EXCLUDE" in hooks:
+                serialized_fields[model] = self.compile_serialized_fields(ref, model, hooks)
+
+        return table, watched_fields, serialized_fields
+
+    @classmethod
+    def compile_watched_fields(cls, ref: str, model: ModelBase, field_names: Iterable[str]) -> frozenset[str]:
+        watched: set[str] = set()
+        for field in cls.get_fields(ref, model, "WATCHED_FIELDS", field_names):
+            watched.add(field.name)
+            watched.add(getattr(field, "attname", field.name))
+
+        return frozenset(watched)
+
+    @classmethod
+    def compile_serialized_fields(cls, ref: str, model: ModelBase, hooks: HooksData) -> frozenset[str]:
+        opts = model._meta.concrete_model._meta
+        serialized = {field.name for field in [*opts.local_fields, *opts.local_many_to_many] if field.serialize}
+        if "FIELDS" in hooks:
+            serialized &= {field.name for field in cls.get_fields(ref, model, "FIELDS", hooks["FIELDS"])}
+        if "EXCLUDE" in hooks:
+            serialized -= {field.name for field in cls.get_fields(ref, model, "EXCLUDE", hooks["EXCLUDE"])}
+
+        return frozenset(serialized)
+
+    @staticmethod
+    def get_fields(ref: str, model: ModelBase, key: str, field_names: Iterable[str]) -> list[Any]:
+        fields: list[Any] = []
+        for field_name in field_names:
+            try:
+                fields.append(model._meta.get_field(field_name))
+            except FieldDoesNotExist as error:
+                msg = f"'HOOKS[{ref}][{key}]' contains {field_name!r}, which is not a field on the model."
+                raise ImproperlyConfigured(msg) from error
+
+        return fields
+
+    def reload(self) -> None:
+        super().reload()
+        self._hook_table = None
+        self._watched_fields = None
+        self._serialized_fields = None
+
     def make_imports(self, name: str, value: Any) -> Any:
         if name != "HOOKS":
             return super().make_imports(name, value)
 
+        # Resolve a copy, so that the hooks in the project settings stay as import strings
+        # and can be resolved again when the settings are reloaded.
+        if isinstance(value, dict):
+            value = {ref: hooks.copy() if isinstance(hooks, dict) else hooks for ref, hooks in value.items()}
+
         self.resolve_hooks(name, value)
         return value
 
@@ -122,21 +465,34 @@ def resolve_hooks(self, name: str, value: Any) -> None:
                 msg = f"'HOOKS[{model_path}]' values must be dicts, ellipsis, or None."
                 raise TypeError(msg)
 
-            for method, func_path in webhooks.items():
-                allowed_methods = ("CREATE", "UPDATE", "DELETE", "M2M_ADD", "M2M_REMOVE", "M2M_CLEAR")
+            self.resolve_model_hooks(name, model_path, webhooks)
 
-                if method not in allowed_methods:  # pragma: no cover
-                    msg = f"'HOOKS[{model_path}]' keys must be one of {allowed_methods}. Got {method!r}."
-                    raise TypeError(msg)
+    def resolve_model_hooks(self, name: str, model_path: str, webhooks: dict[str, Any]) -> None:
+        for method, func_path in webhooks.items():
+            allowed_methods = ("CREATE", "UPDATE", "DELETE", "M2M_ADD", "M2M_REMOVE", "M2M_CLEAR")
 
-                if func_path in (..., None):
-                    continue
+            if method in ("WATCHED_FIELDS", "FIELDS", "EXCLUDE"):
+                self.validate_field_names(model_path, method, func_path)
+                continue
 
-                if not isinstance(func_path, str):  # pragma: no cover
-                    msg = f"'HOOKS[{model_path}]' values must be strings, ellipsis, or None. Got {func_path!r}."
-                    raise TypeError(msg)
+            if method not in allowed_methods:  # pragma: no cover
+                msg = f"'HOOKS[{model_path}]' keys must be one of {allowed_methods}. Got {method!r}."
+                raise TypeError(msg)
+
+            if func_path in (..., None):
+                continue
 
-                value[model_path][method] = self.import_from_string(func_path, name)
+            if not isinstance(func_path, str):  # pragma: no cover
+                msg = f"'HOOKS[{model_path}]' values must be strings, ellipsis, or None. Got {func_path!r}."
+                raise TypeError(msg)
+
+            webhooks[method] = self.import_from_string(func_path, name)
+
+    @staticmethod
+    def validate_field_names(model_path: str, key: str, value: Any) -> None:
+        if isinstance(value, str) or not all(isinstance(field_name, str) for field_name in value):  # pragma: no cover
+            msg = f"'HOOKS[{model_path}][{key}]' must be a list of field names. Got {value!r}."
+            raise TypeError(msg)
 
 
 webhook_settings = WebhookSettingsHolder(
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Callable, Coroutine, Generator, Iterator, Mapping, Sequence
+from collections.abc import Callable, Coroutine, Generator, Hashable, Iterable, Iterator, Mapping, Sequence
 from typing import TYPE_CHECKING, Any, Literal, NamedTuple, TypedDict, Union
 
 try:
@@ -32,13 +32,17 @@
     "Callable",
     "ClientKwargs",
     "Coroutine",
+    "DeliveryResult",
     "Generator",
+    "Hashable",
     "HooksData",
+    "Iterable",
     "Iterator",
     "JSONData",
     "JSONValue",
     "Literal",
     "Method",
+    "MethodChoices",
     "NamedTuple",
     "PostDeleteData",
     "PostSaveData",
@@ -97,6 +101,15 @@ class ClientKwargs(TypedDict, total=False):
     extensions: Mapping[str, Any]
 
 
+class DeliveryResult(NamedTuple):
+    # Was the webhook sent successfully?
+    succeeded: bool
+    # Could sending the webhook succeed if it's attempted again?
+    retryable: bool = False
+    # Number of seconds to wait before retrying, from the 'Retry-After' header of the response.
+    retry_after: Union[float, None] = None
+
+
 class HooksData(TypedDict, total=False):
     CREATE: Union[str, Callable, None]
     UPDATE: Union[str, Callable, None]
@@ -104,6 +117,36 @@ class HooksData(TypedDict, total=False):
     M2M_ADD: Union[str, Callable, None]
     M2M_REMOVE: Union[str, Callable, None]
     M2M_CLEAR: Union[str, Callable, None]
+    WATCHED_FIELDS: Iterable[str]
+    FIELDS: Iterable[str]
+    EXCLUDE: Iterable[str]
+
+
+class MethodChoices(models.TextChoices):
+    CREATE = (
+        "CREATE",
+        "Create",
+    )
+    UPDATE = (
+        "UPDATE",
+        "Update",
+    )
+    DELETE = (
+        "DELETE",
+        "Delete",
+    )
+    M2M_ADD = (
+        "M2M_ADD",
+        "M2M add",
+    )
+    M2M_REMOVE = (
+        "M2M_REMOVE",
+        "M2M remove",
+    )
+    M2M_CLEAR = (
+        "M2M_CLEAR",
+        "M2M clear",
+    )
 
 
 class SignalChoices(models.TextChoices):
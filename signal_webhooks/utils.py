@@ -2,6 +2,7 @@
 
 import asyncio
 import base64
+import json
 import logging
 import os
 import sys
@@ -9,11 +10,14 @@
 from importlib import import_module
 from typing import TYPE_CHECKING
 
+import httpx
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.db.models import ManyToManyRel
 from django.db.models.base import ModelBase
+from django.utils.encoding import is_protected_type
 
-from .serializers import webhook_serializer
+from .serializers import fast_webhook_serializer, webhook_serializer
 from .settings import webhook_settings
 from .typing import MAX_COL_SIZE, ClientKwargs
 
@@ -27,10 +31,16 @@
 __all__ = [
     "decode_cipher_key",
     "default_client_kwargs",
+    "default_json_encoder",
     "default_serializer",
+    "encode_payload",
+    "endpoint_host",
+    "fast_serializer",
     "get_webhook_model",
     "is_dict",
+    "m2m_delta_data",
     "model_from_reference",
+    "orjson_encoder",
     "random_cipher_key",
     "reference_for_model",
     "tasks_as_completed",
@@ -73,7 +83,96 @@ def default_serializer(instance: Model) -> JSONData:
     if hasattr(instance, "webhook_data") and callable(instance.webhook_data):
         return instance.webhook_data()
 
-    return webhook_serializer.serialize([instance])
+    fields = webhook_settings.serialized_fields.get(type(instance))
+    return webhook_serializer.serialize([instance], fields=fields)
+
+
+def fast_serializer(instance: Model) -> JSONData:
+    """
+    Serializer producing the same data as 'default_serializer' in a single pass,
+    using a serialization plan compiled once per model.
+    """
+    if hasattr(instance, "webhook_data") and callable(instance.webhook_data):
+        return instance.webhook_data()
+
+    fields = webhook_settings.serialized_fields.get(type(instance))
+    return fast_webhook_serializer.serialize(instance, fields=fields)
+
+
+def encode_payload(data: JSONData) -> bytes:
+    """
+    Encode the data sent by webhooks to json using 'SIGNAL_WEBHOOKS.JSON_ENCODER',
+    so that the payload can be encoded once and shared by all webhooks it's sent to.
+    """
+    return webhook_settings.JSON_ENCODER(data)
+
+
+def default_json_encoder(data: Any) -> bytes:
+    # Same as how httpx encodes its 'json' argument, but non-serializable values are converted to strings.
+    return json.dumps(
+        data,
+        default=str,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        allow_nan=False,
+    ).encode("utf-8")
+
+
+def orjson_encoder(data: Any) -> bytes:
+    import orjson  # noqa: PLC0415
+
+    # Pass datetimes and dataclasses to 'str' for the same output as 'default_json_encoder'.
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+    return orjson.dumps(data, default=str, option=option)
+
+
+def endpoint_host(endpoint: str) -> str:
+    """Scheme, host and port of the given endpoint, e.g., "https://www.example.com:8000"."""
+    url = httpx.URL(endpoint)
+    return f"{url.scheme}://{url.netloc.decode()}"
+
+
+def m2m_delta_data(
+    instance: Model,
+    method: Method,
+    through: ModelBase,
+    reverse: bool,  # noqa: FBT001
+    pk_set: set[Any] | None,
+) -> JSONData:
+    """
+    Data for a many-to-many change containing only the changed relation and the related primary keys.
+
+    :param instance: Model instance whose relation changed.
+    :param method: One of "M2M_ADD", "M2M_REMOVE", or "M2M_CLEAR".
+    :param through: Through model of the relation.
+    :param reverse: Is the relation changed from the reverse side of the many-to-many field?
+    :param pk_set: Primary keys of the added or removed related instances.
+    """
+    pks = sorted(pk if is_protected_type(pk) else str(pk) for pk in pk_set or ())
+    pk = instance.pk if is_protected_type(instance.pk) else str(instance.pk)
+    return {
+        "model": instance._meta.label_lower,
+        "pk": pk,
+        "relation": m2m_relation_name(type(instance), through, reverse),
+        "added": pks if method == "M2M_ADD" else [],
+        "removed": pks if method == "M2M_REMOVE" else [],
+        "cleared": method == "M2M_CLEAR",
+    }
+
+
+@cache
+def m2m_relation_name(model: ModelBase, through: ModelBase, reverse: bool) -> str:  # noqa: FBT001
+    """Name of the many-to-many field or the reverse relation accessor on the model that uses the through model."""
+    for field in model._meta.get_fields():
+        if not field.many_to_many:
+            continue
+        if isinstance(field, ManyToManyRel):
+            if reverse and field.through is through:
+                return field.get_accessor_name()
+        elif not reverse and field.remote_field.through is through:
+            return field.name
+
+    return through._meta.model_name
 
 
 def default_client_kwargs(hook: Webhook) -> ClientKwargs:  # noqa: ARG001
@@ -145,6 +244,7 @@ def model_from_reference(ref: str, check_hooks: bool = True) -> ModelBase:  # no
     return model_type
 
 
+@cache
 def reference_for_model(model: ModelBase) -> str:
     return f"{model.__module__}.{model.__name__}"
 
@@ -3,6 +3,9 @@
 from rest_framework.test import APIClient
 from settings_holder import SettingsWrapper
 
+from signal_webhooks.models import Webhook
+from signal_webhooks.typing import SignalChoices
+
 
 @pytest.fixture(scope="session", autouse=True)
 def setup_django_settings():
@@ -25,6 +28,37 @@ def settings():
         wrapper.finalize()
 
 
+@pytest.fixture()
+def hooks(request, settings):
+    """
+    Send webhooks for the 'User' model synchronously, and create webhooks for them.
+
+    Extra 'SIGNAL_WEBHOOKS' settings and the webhooks to create are given with the 'hooks' marker, e.g.,
+    'pytest.mark.hooks({"FIRE_ON_COMMIT": True}, webhooks=[{"name": "foo", "signal": SignalChoices.CREATE}])'.
+    Webhooks are for the 'User' model and 'http://www.example.com/', unless given otherwise.
+    """
+    marker = request.node.get_closest_marker("hooks")
+    extra_settings = marker.args[0] if marker is not None and marker.args else {}
+    webhooks = marker.kwargs.get("webhooks") if marker is not None else None
+
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "HOOKS": {
+            "django.contrib.auth.models.User": ...,
+        },
+        **extra_settings,
+    }
+
+    for webhook in webhooks or [{"name": "foo", "signal": SignalChoices.CREATE}]:
+        Webhook.objects.create(
+            **{
+                "ref": "django.contrib.auth.models.User",
+                "endpoint": "http://www.example.com/",
+                **webhook,
+            },
+        )
+
+
 @pytest.fixture()
 def mock_user(django_db_blocker) -> User:
     with django_db_blocker.unblock():
@@ -47,3 +81,11 @@ def mock_hook(**kwargs):
 
 def mock_side_effect():
     pass
+
+
+async def mock_async_hook(**kwargs):
+    mock_side_effect()
+
+
+def filter_by_username(instance, method):
+    return {"name": instance.username}
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:23
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('my_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mywebhook',
+            name='max_attempts',
+            field=models.PositiveSmallIntegerField(blank=True, default=None, help_text='How many times sending the webhook is attempted. Uses the default from settings if not set.', null=True, validators=[django.core.validators.MinValueValidator(1)], verbose_name='max attempts'),
+        ),
+    ]
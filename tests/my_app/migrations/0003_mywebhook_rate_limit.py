@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:31
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('my_app', '0002_mywebhook_max_attempts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mywebhook',
+            name='rate_limit',
+            field=models.PositiveIntegerField(blank=True, default=None, help_text='Maximum number of requests per second sent to the endpoint. Not limited if not set.', null=True, validators=[django.core.validators.MinValueValidator(1)], verbose_name='rate limit'),
+        ),
+    ]
@@ -2,6 +2,7 @@
 
 import pytest
 from django.contrib.auth.models import User
+from django.core.cache import caches
 from rest_framework.reverse import reverse
 from rest_framework.test import APIClient
 
@@ -44,6 +45,8 @@ def test_webhook_api(settings, api_client: APIClient):
         "auth_token": "",
         "enabled": True,
         "keep_last_response": False,
+        "max_attempts": None,
+        "rate_limit": None,
     }
 
     user = User(
@@ -92,3 +95,48 @@ def test_webhook_api__exists(settings, api_client: APIClient):
     response = api_client.post(reverse("webhook-list"), data=data, format="json")
 
     assert response.status_code == 400
+
+
+def test_webhook_api__changes_webhook_cache_generation(
+    settings,
+    api_client: APIClient,
+    django_capture_on_commit_callbacks,
+):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "CACHE_HOOKS": True,
+        "CACHE_HOOKS_BACKEND": "default",
+        "HOOKS": {
+            "django.contrib.auth.models.User": ...,
+        },
+    }
+
+    cache = caches["default"]
+    cache.set("django-signal-webhooks-generation", "foo")
+
+    data = {
+        "name": "foo",
+        "signal": SignalChoices.CREATE_UPDATE_DELETE_OR_M2M.value,
+        "ref": "django.contrib.auth.models.User",
+        "endpoint": "https://www.example.com",
+        "headers": {},
+        "auth_token": "",
+        "enabled": True,
+        "keep_last_response": False,
+    }
+
+    # Generation is changed when the transaction is committed.
+    with django_capture_on_commit_callbacks(execute=True):
+        response = api_client.post(reverse("webhook-list"), data=data, format="json")
+        assert response.status_code == 201
+        assert cache.get("django-signal-webhooks-generation") == "foo"
+
+    generation = cache.get("django-signal-webhooks-generation")
+    assert generation != "foo"
+
+    pk = response.json()["id"]
+    with django_capture_on_commit_callbacks(execute=True):
+        response = api_client.delete(reverse("webhook-detail", args=[pk]))
+        assert response.status_code == 204
+
+    assert cache.get("django-signal-webhooks-generation") != generation
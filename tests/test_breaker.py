@@ -0,0 +1,210 @@
+import asyncio
+import logging
+from unittest.mock import patch
+
+import httpx
+import pytest
+from django.contrib.admin.sites import site
+from django.contrib.auth.models import User
+from django.test import RequestFactory
+from freezegun import freeze_time
+from httpx import Response
+
+from signal_webhooks.admin import WebhookAdmin
+from signal_webhooks.breaker import CircuitBreaker, circuit_breakers
+from signal_webhooks.handlers import post_webhook
+from signal_webhooks.models import Webhook
+from signal_webhooks.typing import SignalChoices
+
+pytestmark = [
+    pytest.mark.django_db(transaction=True),
+    pytest.mark.hooks(
+        {"CIRCUIT_BREAKER": True, "CIRCUIT_BREAKER_MIN_REQUESTS": 2},
+        webhooks=[{"name": "foo", "signal": SignalChoices.CREATE, "endpoint": "http://www.example.com/foo"}],
+    ),
+]
+
+
+def create_user(name: str) -> None:
+    User.objects.create(username=name, email="user@user.com")
+
+
+def test_circuit_breaker(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "CIRCUIT_BREAKER_MIN_REQUESTS": 4,
+        "CIRCUIT_BREAKER_FAILURE_RATE": 0.5,
+        "CIRCUIT_BREAKER_RESET_TIMEOUT": 30,
+    }
+
+    with freeze_time("2022-01-01T00:00:00") as frozen_time:
+        breaker = CircuitBreaker()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == "closed"
+
+        # Failure rate reached after minimum number of requests.
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == "open"
+        assert breaker.retry_after == 30
+        assert not breaker.allow_request()
+
+        frozen_time.tick(30)
+        assert breaker.state == "half-open"
+
+        # Only a single probe is allowed.
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+
+        # Probe failed, so the breaker opens again.
+        breaker.record_failure()
+        assert breaker.state == "open"
+
+        frozen_time.tick(30)
+        assert breaker.allow_request()
+
+        # Probe succeeded, so the breaker closes.
+        breaker.record_success()
+        assert breaker.state == "closed"
+        assert breaker.allow_request()
+
+
+def test_circuit_breaker__key(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+    }
+
+    assert circuit_breakers.key_for("http://www.example.com/foo?bar=1") == "http://www.example.com"
+    assert circuit_breakers.key_for("https://www.example.com:8000/foo") == "https://www.example.com:8000"
+
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "CIRCUIT_BREAKER_SCOPE": "endpoint",
+    }
+
+    assert circuit_breakers.key_for("http://www.example.com/foo") == "http://www.example.com/foo"
+
+
+def test_circuit_breaker__open(hooks, caplog):
+    caplog.set_level(logging.INFO)
+
+    Webhook.objects.create(
+        name="bar",
+        signal=SignalChoices.CREATE,
+        ref="django.contrib.auth.models.User",
+        endpoint="http://www.example.com/bar",
+    )
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(502)) as mock_1:
+        create_user("x")
+
+    assert mock_1.call_count == 2
+    assert circuit_breakers.state("http://www.example.com/") == "open"
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock_2:
+        create_user("y")
+
+    # Both endpoints on the host are short-circuited.
+    mock_2.assert_not_called()
+    assert caplog.messages.count("Webhook 'foo' not sent. Circuit breaker for 'http://www.example.com' is open.") == 1
+    assert caplog.messages.count("Webhook 'bar' not sent. Circuit breaker for 'http://www.example.com' is open.") == 1
+
+    hook = Webhook.objects.get(name="foo")
+    assert hook.last_failure is not None
+    assert hook.last_success is None
+
+
+def test_circuit_breaker__client_errors_dont_open(hooks):
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(400)) as mock:
+        create_user("x")
+        create_user("y")
+        create_user("z")
+
+    assert mock.call_count == 3
+    assert circuit_breakers.state("http://www.example.com/") == "closed"
+
+
+def test_circuit_breaker__admin(hooks, settings):
+    admin = WebhookAdmin(Webhook, site)
+    request = RequestFactory().get("/")
+
+    assert "circuit_breaker" in admin.get_list_display(request)
+    assert admin.circuit_breaker(Webhook.objects.get(name="foo")) == "closed"
+
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+    }
+
+    assert "circuit_breaker" not in admin.get_list_display(request)
+
+
+def test_circuit_breaker__cancelled_probe(hooks, settings):
+    settings.SIGNAL_WEBHOOKS = {**settings.SIGNAL_WEBHOOKS, "CIRCUIT_BREAKER_RESET_TIMEOUT": 0}
+
+    breaker = circuit_breakers.get("http://www.example.com/foo")
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "half-open"
+
+    hook = Webhook.objects.get(name="foo")
+
+    async def send():
+        async with httpx.AsyncClient() as client:
+            await post_webhook(client, hook, b"{}", {})
+
+    with (
+        patch("signal_webhooks.handlers.httpx.AsyncClient.post", side_effect=asyncio.CancelledError),
+        pytest.raises(asyncio.CancelledError),
+    ):
+        asyncio.run(send())
+
+    # Cancelled probe doesn't keep other probes from being sent.
+    assert breaker.allow_request()
+
+
+def test_circuit_breaker__open__rate_limit_not_used(hooks):
+    Webhook.objects.update(rate_limit=1)
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(502)):
+        create_user("x")
+        create_user("y")
+
+    assert circuit_breakers.state("http://www.example.com/") == "open"
+
+    with (
+        patch("signal_webhooks.handlers.rate_limiter.wait") as mock_wait,
+        patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock_post,
+    ):
+        create_user("z")
+
+    mock_post.assert_not_called()
+    mock_wait.assert_not_called()
+
+
+def test_circuit_breaker__probing__retry_backoff(hooks, settings):
+    settings.SIGNAL_WEBHOOKS = {
+        **settings.SIGNAL_WEBHOOKS,
+        "CIRCUIT_BREAKER_RESET_TIMEOUT": 0,
+        "MAX_ATTEMPTS": 3,
+        "RETRY_BACKOFF": 10,
+    }
+
+    breaker = circuit_breakers.get("http://www.example.com/foo")
+    breaker.record_failure()
+    breaker.record_failure()
+    # Another request is probing the endpoint.
+    assert breaker.acquire() == "probe"
+
+    with (
+        patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock_post,
+        patch("signal_webhooks.handlers.retry_scheduler.schedule") as mock_schedule,
+    ):
+        create_user("x")
+
+    mock_post.assert_not_called()
+    # Retried with the normal backoff, not immediately.
+    attempt, delay = mock_schedule.call_args.args[2:]
+    assert attempt == 2
+    assert 5 <= delay <= 10
@@ -0,0 +1,140 @@
+import json
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth.models import Group, User
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from httpx import Response
+
+from signal_webhooks.bulk import BulkWebhookQuerySet
+from signal_webhooks.models import Webhook
+from signal_webhooks.typing import SignalChoices
+
+pytestmark = [
+    pytest.mark.django_db(transaction=True),
+    pytest.mark.hooks(webhooks=[{"name": "foo", "signal": SignalChoices.CREATE_UPDATE_DELETE_OR_M2M}]),
+]
+
+
+def usernames(mock) -> list[list[str]]:
+    return [[item["fields"]["username"] for item in json.loads(call.kwargs["content"])] for call in mock.call_args_list]
+
+
+def test_bulk__bulk_create(hooks):
+    users = [User(username=name, email="user@user.com") for name in ("x", "y", "z")]
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock:
+        BulkWebhookQuerySet(User).bulk_create(users)
+
+    assert usernames(mock) == [["x", "y", "z"]]
+
+
+def test_bulk__bulk_create__queries(hooks):
+    users = [User(username=f"user{i}", email="user@user.com") for i in range(20)]
+
+    with (
+        patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock,
+        CaptureQueriesContext(connection) as queries,
+    ):
+        BulkWebhookQuerySet(User).bulk_create(users)
+
+    assert len(usernames(mock)[0]) == 20
+    # Insert in a transaction, and fetching the webhooks.
+    # Many-to-many relations of the created rows are not queried.
+    assert len(queries) == 4
+    assert not [query for query in queries if "auth_user_groups" in query["sql"]]
+
+
+def test_bulk__bulk_update(hooks):
+    with patch("signal_webhooks.handlers.webhook_handler"):
+        users = [User.objects.create(username=name, email="user@user.com") for name in ("x", "y")]
+        group = Group.objects.create(name="foo")
+        users[0].groups.add(group)
+
+    for user in users:
+        user.username += "1"
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock:
+        BulkWebhookQuerySet(User).bulk_update(users, fields=["username"])
+
+    assert usernames(mock) == [["x1", "y1"]]
+    assert json.loads(mock.call_args.kwargs["content"])[0]["fields"]["groups"] == [group.pk]
+
+
+def test_bulk__update(hooks):
+    with patch("signal_webhooks.handlers.webhook_handler"):
+        for name in ("x", "y", "z"):
+            User.objects.create(username=name, email="user@user.com")
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock:
+        BulkWebhookQuerySet(User).filter(username__in=["x", "y"], is_staff=False).update(is_staff=True)
+
+    assert usernames(mock) == [["x", "y"]]
+    assert all(item["fields"]["is_staff"] for item in json.loads(mock.call_args.kwargs["content"]))
+
+
+def test_bulk__update__no_rows(hooks):
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock:
+        BulkWebhookQuerySet(User).filter(username="x").update(is_staff=True)
+
+    mock.assert_not_called()
+
+
+def test_bulk__update__no_hooks(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+    }
+
+    User.objects.create(username="x", email="user@user.com")
+
+    with patch("signal_webhooks.handlers.bulk_webhook_handler") as mock:
+        BulkWebhookQuerySet(User).update(is_staff=True)
+
+    mock.assert_not_called()
+
+
+def test_bulk__fire_on_commit(hooks, settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "FIRE_ON_COMMIT": True,
+        "HOOKS": {
+            "django.contrib.auth.models.User": ...,
+        },
+    }
+
+    users = [User(username=name, email="user@user.com") for name in ("x", "y")]
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock:
+        with transaction.atomic():
+            BulkWebhookQuerySet(User).bulk_create(users)
+            mock.assert_not_called()
+
+    assert usernames(mock) == [["x", "y"]]
+
+
+def test_bulk__filter_kwargs(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "FILTER_KWARGS": "tests.conftest.filter_by_username",
+        "HOOKS": {
+            "django.contrib.auth.models.User": ...,
+        },
+    }
+
+    for name in ("x", "y"):
+        Webhook.objects.create(
+            name=name,
+            signal=SignalChoices.CREATE,
+            ref="django.contrib.auth.models.User",
+            endpoint=f"http://www.example.com/{name}",
+        )
+
+    users = [User(username=name, email="user@user.com") for name in ("x", "y", "z")]
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock:
+        BulkWebhookQuerySet(User).bulk_create(users)
+
+    # Each webhook gets only the instances matching its filtering arguments.
+    sent = {call.args[0]: usernames(mock)[i] for i, call in enumerate(mock.call_args_list)}
+    assert sent == {"http://www.example.com/x": ["x"], "http://www.example.com/y": ["y"]}
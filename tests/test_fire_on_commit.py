@@ -0,0 +1,241 @@
+import json
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth.models import Group, Permission, User
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from httpx import Response
+
+from signal_webhooks.models import Webhook
+from signal_webhooks.typing import SignalChoices
+
+pytestmark = [
+    pytest.mark.django_db(transaction=True),
+    pytest.mark.hooks(
+        {"FIRE_ON_COMMIT": True},
+        webhooks=[
+            {"name": signal.lower(), "signal": signal, "endpoint": f"http://www.example.com/{signal.lower()}"}
+            for signal in (SignalChoices.CREATE, SignalChoices.UPDATE, SignalChoices.DELETE, SignalChoices.M2M)
+        ],
+    ),
+]
+
+
+def sent(mock) -> list[tuple[str, str]]:
+    return [
+        (call.args[0].rsplit("/", 1)[-1], json.loads(call.kwargs["content"])["fields"]["username"])
+        for call in mock.call_args_list
+    ]
+
+
+def test_fire_on_commit__create_and_updates(hooks):
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock:
+        with transaction.atomic():
+            user = User.objects.create(username="x", email="user@user.com")
+            user.username = "y"
+            user.save()
+            user.username = "z"
+            user.save()
+
+            mock.assert_not_called()
+
+    assert sent(mock) == [("create", "z")]
+
+
+def test_fire_on_commit__updates(mock_user, hooks):
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock:
+        with transaction.atomic():
+            mock_user.username = "y"
+            mock_user.save()
+            mock_user.username = "z"
+            mock_user.save()
+
+    assert sent(mock) == [("update", "z")]
+
+
+def test_fire_on_commit__update_and_delete(mock_user, hooks):
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock:
+        with transaction.atomic():
+            mock_user.username = "y"
+            mock_user.save()
+            mock_user.delete()
+
+    assert sent(mock) == [("delete", "y")]
+
+
+def test_fire_on_commit__rolled_back(hooks):
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock:
+        with pytest.raises(ValueError, match="foo"), transaction.atomic():
+            User.objects.create(username="x", email="user@user.com")
+            msg = "foo"
+            raise ValueError(msg)
+
+        mock.assert_not_called()
+
+        # Events from the rolled back transaction are not sent with the next one.
+        with transaction.atomic():
+            User.objects.create(username="y", email="user@user.com")
+
+    assert sent(mock) == [("create", "y")]
+
+
+def test_fire_on_commit__savepoint_rolled_back(mock_user, hooks):
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock:
+        with transaction.atomic():
+            mock_user.username = "y"
+            mock_user.save()
+
+            with pytest.raises(ValueError, match="foo"), transaction.atomic():
+                mock_user.delete()
+                msg = "foo"
+                raise ValueError(msg)
+
+    assert sent(mock) == [("update", "y")]
+
+
+def test_fire_on_commit__m2m(mock_user, hooks):
+    group = Group.objects.create(name="foo")
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock:
+        with transaction.atomic():
+            mock_user.username = "y"
+            mock_user.save()
+            mock_user.groups.add(group)
+
+    assert sent(mock) == [("update", "y"), ("m2m", "y")]
+
+
+def test_fire_on_commit__outside_transaction(hooks):
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock:
+        user = User.objects.create(username="x", email="user@user.com")
+        user.username = "y"
+        user.save()
+
+    assert sent(mock) == [("create", "x"), ("update", "y")]
+
+
+def test_batch_cascade_deletes(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "BATCH_CASCADE_DELETES": True,
+        "HOOKS": {
+            "django.contrib.auth.models.Permission": ...,
+        },
+    }
+
+    Webhook.objects.create(
+        name="foo",
+        signal=SignalChoices.DELETE,
+        ref="django.contrib.auth.models.Permission",
+        endpoint="http://www.example.com/",
+    )
+
+    content_type = ContentType.objects.create(app_label="foo", model="bar")
+    for codename in ("x", "y", "z"):
+        Permission.objects.create(name=codename, codename=codename, content_type=content_type)
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock:
+        content_type.delete()
+
+    mock.assert_called_once()
+    assert sorted(item["fields"]["codename"] for item in json.loads(mock.call_args.kwargs["content"])) == [
+        "x",
+        "y",
+        "z",
+    ]
+
+
+def test_batch_cascade_deletes__check_hooks_before_serializing(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "BATCH_CASCADE_DELETES": True,
+        "CHECK_HOOKS_BEFORE_SERIALIZING": True,
+        "HOOKS": {
+            "django.contrib.auth.models.Permission": ...,
+        },
+    }
+
+    content_type = ContentType.objects.create(app_label="foo", model="bar")
+    for codename in ("x", "y", "z"):
+        Permission.objects.create(name=codename, codename=codename, content_type=content_type)
+
+    # No webhooks exist, so the deleted instances are not serialized.
+    with (
+        patch("signal_webhooks.handlers.serialize_instance") as mock_serialize,
+        patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock_post,
+    ):
+        content_type.delete()
+
+    mock_serialize.assert_not_called()
+    mock_post.assert_not_called()
+
+
+def test_batch_cascade_deletes__queryset(mock_user, hooks, settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "BATCH_CASCADE_DELETES": True,
+        "HOOKS": {
+            "django.contrib.auth.models.User": ...,
+        },
+    }
+
+    with patch("signal_webhooks.handlers.webhook_handler"):
+        User.objects.create(username="y", email="user@user.com")
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock:
+        User.objects.all().delete()
+
+    mock.assert_called_once()
+    assert sorted(item["fields"]["username"] for item in json.loads(mock.call_args.kwargs["content"])) == ["x", "y"]
+
+
+def test_batch_cascade_deletes__single_instance(mock_user, hooks, settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "BATCH_CASCADE_DELETES": True,
+        "HOOKS": {
+            "django.contrib.auth.models.User": ...,
+        },
+    }
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock:
+        mock_user.delete()
+
+    # Still sent as a list, so that the payload doesn't depend on the number of deleted rows.
+    mock.assert_called_once()
+    assert mock.call_args.args[0] == "http://www.example.com/delete"
+    assert [item["fields"]["username"] for item in json.loads(mock.call_args.kwargs["content"])] == ["x"]
+
+
+def test_batch_cascade_deletes__filter_kwargs(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "BATCH_CASCADE_DELETES": True,
+        "FILTER_KWARGS": "tests.conftest.filter_by_username",
+        "HOOKS": {
+            "django.contrib.auth.models.User": ...,
+        },
+    }
+
+    for name in ("x", "y"):
+        Webhook.objects.create(
+            name=name,
+            signal=SignalChoices.DELETE,
+            ref="django.contrib.auth.models.User",
+            endpoint=f"http://www.example.com/{name}",
+        )
+
+    with patch("signal_webhooks.handlers.webhook_handler"):
+        for name in ("x", "y", "z"):
+            User.objects.create(username=name, email="user@user.com")
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock:
+        User.objects.all().delete()
+
+    # Each webhook gets only the instances matching its filtering arguments.
+    sent = {
+        call.args[0]: [item["fields"]["username"] for item in json.loads(call.kwargs["content"])]
+        for call in mock.call_args_list
+    }
+    assert sent == {"http://www.example.com/x": ["x"], "http://www.example.com/y": ["y"]}
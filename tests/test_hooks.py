@@ -1,17 +1,25 @@
 import asyncio
 import re
+import threading
 from time import sleep
 from unittest.mock import AsyncMock, patch
 
 import pytest
 from django.contrib.auth.models import Group, User
 from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
 from httpx import Response
 
+from signal_webhooks.cache import WebhookCache, get_hooks_for_model
+from signal_webhooks.delivery import DeliveryLoop
 from signal_webhooks.exceptions import WebhookCancelled
 from signal_webhooks.models import Webhook
+from signal_webhooks.pool import worker_pool
+from signal_webhooks.settings import webhook_settings
 from signal_webhooks.typing import SignalChoices
 from signal_webhooks.utils import get_webhook_model
+from tests.conftest import mock_hook
 from tests.my_app.models import MyModel, MyWebhook
 
 pytestmark = [
@@ -889,7 +897,7 @@ def test_webhook__single_webhook__webhook_data(settings):
 
     mock_1.assert_called_once_with(
         "http://www.example.com/",
-        json={"fizz": "buzz"},
+        content=b'{"fizz":"buzz"}',
         headers={"Content-Type": "application/json"},
     )
 
@@ -1540,6 +1548,11 @@ def test_webhook__multiple_webhooks(settings):
     mock.assert_called()
     assert mock.call_count == 2
 
+    # The payload is encoded once and shared by all requests.
+    content_1 = mock.call_args_list[0].kwargs["content"]
+    content_2 = mock.call_args_list[1].kwargs["content"]
+    assert content_1 is content_2
+
     hook_1 = Webhook.objects.get(name="foo")
     hook_2 = Webhook.objects.get(name="bar")
 
@@ -1747,3 +1760,721 @@ def test_webhook__swapped_webhook_model__not_a_webhook(settings):
 
     with pytest.raises(ImproperlyConfigured, match=re.escape(msg)):
         user.save()
+
+
+def test_webhook__check_hooks_before_serializing__no_hooks(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "CHECK_HOOKS_BEFORE_SERIALIZING": True,
+        "HOOKS": {
+            "django.contrib.auth.models.User": ...,
+        },
+    }
+
+    user = User(
+        username="x",
+        email="user@user.com",
+        is_staff=True,
+        is_superuser=True,
+    )
+
+    patch_1 = "signal_webhooks.serializers._WebhookSerializer.serialize"
+    patch_2 = "signal_webhooks.handlers.httpx.AsyncClient.post"
+
+    with patch(patch_1) as mock_1, patch(patch_2, return_value=Response(204)) as mock_2:
+        user.save()
+
+    mock_1.assert_not_called()
+    mock_2.assert_not_called()
+
+
+def test_webhook__check_hooks_before_serializing__has_hooks(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "CHECK_HOOKS_BEFORE_SERIALIZING": True,
+        "HOOKS": {
+            "django.contrib.auth.models.User": ...,
+        },
+    }
+
+    Webhook.objects.create(
+        name="foo",
+        signal=SignalChoices.CREATE,
+        ref="django.contrib.auth.models.User",
+        endpoint="http://www.example.com/",
+    )
+
+    user = User(
+        username="x",
+        email="user@user.com",
+        is_staff=True,
+        is_superuser=True,
+    )
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock:
+        user.save()
+
+    mock.assert_called_once()
+
+    hook = Webhook.objects.get(name="foo")
+
+    assert hook.last_success is not None
+    assert hook.last_failure is None
+
+
+def test_webhook__cache_hooks(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "CACHE_HOOKS": True,
+        "HOOKS": {
+            "tests.my_app.models.MyModel": ...,
+        },
+    }
+
+    Webhook.objects.create(
+        name="foo",
+        signal=SignalChoices.CREATE_OR_UPDATE,
+        ref="tests.my_app.models.MyModel",
+        endpoint="http://www.example.com/",
+    )
+
+    item = MyModel(name="x")
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock_1:
+        item.save()
+
+    assert mock_1.call_count == 1
+
+    item.name = "xx"
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock_2:
+        item.save()
+
+    assert mock_2.call_count == 1
+
+    item.name = "xxx"
+
+    with (
+        patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock_3,
+        CaptureQueriesContext(connection) as queries,
+    ):
+        item.save()
+
+    assert mock_3.call_count == 1
+    assert not any(query["sql"].startswith('SELECT "signal_webhooks_webhook"') for query in queries.captured_queries)
+
+    # Adding a webhook clears the cache
+    Webhook.objects.create(
+        name="bar",
+        signal=SignalChoices.CREATE_OR_UPDATE,
+        ref="tests.my_app.models.MyModel",
+        endpoint="http://www.example.org/",
+    )
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock_4:
+        item.save()
+
+    assert mock_4.call_count == 2
+
+    # Disabling a webhook clears the cache
+    hook = Webhook.objects.get(name="bar")
+    hook.enabled = False
+    hook.save()
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock_5:
+        item.save()
+
+    assert mock_5.call_count == 1
+
+    assert Webhook.objects.get(name="foo").last_success is not None
+
+
+def test_webhook__cache_hooks__rolled_back(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "CACHE_HOOKS": True,
+        "HOOKS": {
+            "tests.my_app.models.MyModel": ...,
+        },
+    }
+
+    item = MyModel(name="x")
+
+    with transaction.atomic():
+        Webhook.objects.create(
+            name="foo",
+            signal=SignalChoices.CREATE,
+            ref="tests.my_app.models.MyModel",
+            endpoint="http://www.example.com/",
+        )
+        # Uncommitted webhook is visible in the transaction, but not cached.
+        assert [hook.name for hook in get_hooks_for_model(item, "CREATE")] == ["foo"]
+        transaction.set_rollback(True)
+
+    assert get_hooks_for_model(item, "CREATE") == []
+
+    with transaction.atomic():
+        Webhook.objects.create(
+            name="bar",
+            signal=SignalChoices.CREATE,
+            ref="tests.my_app.models.MyModel",
+            endpoint="http://www.example.com/",
+        )
+        assert [hook.name for hook in get_hooks_for_model(item, "CREATE")] == ["bar"]
+
+    with CaptureQueriesContext(connection) as queries:
+        assert [hook.name for hook in get_hooks_for_model(item, "CREATE")] == ["bar"]
+        assert [hook.name for hook in get_hooks_for_model(item, "CREATE")] == ["bar"]
+
+    # Cached after the first read after the commit.
+    assert len(queries.captured_queries) == 1
+
+
+def test_webhook__cache_hooks__changed_while_fetching(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "CACHE_HOOKS": True,
+        "HOOKS": {
+            "tests.my_app.models.MyModel": ...,
+        },
+    }
+
+    cache = WebhookCache()
+    get_for_ref = Webhook.objects.get_for_ref
+
+    def clear_and_get_for_ref(*args, **kwargs):
+        # Webhooks are changed in another thread while this thread is fetching them.
+        cache.clear()
+        return get_for_ref(*args, **kwargs)
+
+    with patch.object(Webhook.objects, "get_for_ref", side_effect=clear_and_get_for_ref):
+        assert cache.get_hooks(MyModel(name="x"), "CREATE") == []
+
+    assert cache._hooks == {}
+
+
+def test_webhook__cache_hooks__shared_generation(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "CACHE_HOOKS": True,
+        "CACHE_HOOKS_BACKEND": "default",
+        "HOOKS": {
+            "tests.my_app.models.MyModel": ...,
+        },
+    }
+
+    Webhook.objects.create(
+        name="foo",
+        signal=SignalChoices.CREATE_OR_UPDATE,
+        ref="tests.my_app.models.MyModel",
+        endpoint="http://www.example.com/",
+    )
+
+    item = MyModel.objects.create(name="x")
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock_1:
+        item.save()
+
+    assert mock_1.call_count == 1
+
+    # Simulate another process disabling the webhook without this process noticing.
+    with patch("signal_webhooks.cache.webhook_cache.invalidate"):
+        Webhook.objects.filter(name="foo").update(enabled=False)
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock_2:
+        item.save()
+
+    # Cached webhook is still used.
+    assert mock_2.call_count == 1
+
+    # Other process replaces the generation token.
+    WebhookCache().invalidate()
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock_3:
+        item.save()
+
+    assert mock_3.call_count == 0
+
+
+def test_webhook__cache_hooks__shared_generation__transaction(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "CACHE_HOOKS": True,
+        "CACHE_HOOKS_BACKEND": "default",
+        "HOOKS": {
+            "tests.my_app.models.MyModel": ...,
+        },
+    }
+
+    item = MyModel(name="x")
+
+    # Cache of another process.
+    other = WebhookCache()
+    assert other.get_hooks(item, "CREATE") == []
+
+    with transaction.atomic():
+        Webhook.objects.create(
+            name="foo",
+            signal=SignalChoices.CREATE,
+            ref="tests.my_app.models.MyModel",
+            endpoint="http://www.example.com/",
+        )
+        # Other process is not notified before the change is committed,
+        # so it doesn't re-cache the webhooks before the change is visible.
+        assert other.get_hooks(item, "CREATE") == []
+        transaction.set_rollback(True)
+
+    assert other.get_hooks(item, "CREATE") == []
+
+    with transaction.atomic():
+        Webhook.objects.create(
+            name="bar",
+            signal=SignalChoices.CREATE,
+            ref="tests.my_app.models.MyModel",
+            endpoint="http://www.example.com/",
+        )
+        assert other.get_hooks(item, "CREATE") == []
+
+    assert [hook.name for hook in other.get_hooks(item, "CREATE")] == ["bar"]
+
+
+def test_webhook__cache_hooks__check_interval(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "CACHE_HOOKS": True,
+        "CACHE_HOOKS_BACKEND": "default",
+        "CACHE_HOOKS_CHECK_INTERVAL": 60,
+    }
+
+    cache = WebhookCache()
+    cache.check_generation()
+
+    with patch("signal_webhooks.cache.caches") as mock:
+        cache.check_generation()
+
+    mock.assert_not_called()
+
+
+def test_webhook__shared_client(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "HOOKS": {
+            "tests.my_app.models.MyModel": ...,
+        },
+    }
+
+    Webhook.objects.create(
+        name="foo",
+        signal=SignalChoices.CREATE_OR_UPDATE,
+        ref="tests.my_app.models.MyModel",
+        endpoint="http://www.example.com/",
+    )
+
+    clients = []
+
+    async def post(client, *args, **kwargs):
+        clients.append(client)
+        return Response(204)
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", autospec=True, side_effect=post):
+        item = MyModel.objects.create(name="x")
+        item.save()
+
+    assert len(clients) == 2
+    assert clients[0] is clients[1]
+    assert not clients[0].is_closed
+
+
+def test_delivery_loop__lifecycle(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "CLIENT_MAX_CONNECTIONS": 10,
+        "CLIENT_MAX_KEEPALIVE_CONNECTIONS": 5,
+    }
+
+    delivery_loop = DeliveryLoop()
+
+    async def get_client():
+        async with delivery_loop.client() as client:
+            return client
+
+    client = delivery_loop.run(get_client())
+    assert delivery_loop.run(get_client()) is client
+    assert client._transport._pool._max_connections == 10
+    assert client._transport._pool._max_keepalive_connections == 5
+
+    # Outside the delivery loop, a temporary client is used.
+    other_client = asyncio.run(get_client())
+    assert other_client is not client
+    assert other_client.is_closed
+
+    thread = delivery_loop._thread
+    delivery_loop.stop()
+
+    assert client.is_closed
+    assert not thread.is_alive()
+
+    # Loop is restarted when needed.
+    assert delivery_loop.run(get_client()) is not client
+
+    # After fork, the child process forgets the parent's loop.
+    loop = delivery_loop._loop
+    delivery_loop.after_fork()
+    assert delivery_loop._loop is None
+    assert delivery_loop._client is None
+
+    loop.call_soon_threadsafe(loop.stop)
+
+
+def test_delivery_loop__reset_client(settings):
+    delivery_loop = DeliveryLoop()
+    started = threading.Event()
+    release = threading.Event()
+
+    async def get_client():
+        async with delivery_loop.client() as client:
+            return client
+
+    async def use_client():
+        async with delivery_loop.client() as client:
+            started.set()
+            await asyncio.to_thread(release.wait, 5)
+            return client, client.is_closed
+
+    future = delivery_loop.submit(use_client())
+    assert started.wait(5)
+
+    delivery_loop.reset_client()
+
+    # New requests use a new client.
+    new_client = delivery_loop.run(get_client())
+
+    release.set()
+    client, closed_while_in_use = future.result(5)
+
+    # Old client is closed only after the request using it has finished.
+    assert not closed_while_in_use
+    assert new_client is not client
+    delivery_loop.run(asyncio.sleep(0.01))
+    assert client.is_closed
+    assert not new_client.is_closed
+
+    delivery_loop.stop()
+    assert new_client.is_closed
+
+
+def test_delivery_loop__host_clients(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "CLIENT_MAX_CONNECTIONS_PER_HOST": 2,
+        "CLIENT_MAX_KEEPALIVE_CONNECTIONS": 5,
+    }
+
+    delivery_loop = DeliveryLoop()
+
+    async def get_clients():
+        async with delivery_loop.client() as client:
+            async with delivery_loop.host_client(client, "http://www.example.com/foo") as client_1:
+                pass
+            async with delivery_loop.host_client(client, "http://www.example.com/bar") as client_2:
+                pass
+            async with delivery_loop.host_client(client, "http://www.example.org/") as client_3:
+                pass
+            return client, client_1, client_2, client_3
+
+    client, client_1, client_2, client_3 = delivery_loop.run(get_clients())
+
+    assert client_1 is client_2
+    assert client_1 is not client_3
+    assert client_1 is not client
+    assert client_1._transport._pool._max_connections == 2
+    assert client_1._transport._pool._max_keepalive_connections == 2
+
+    delivery_loop.stop()
+
+    assert client.is_closed
+    assert client_1.is_closed
+    assert client_3.is_closed
+
+
+def test_webhook__multiple_webhooks__max_connections_per_host(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "CLIENT_MAX_CONNECTIONS_PER_HOST": 1,
+        "HOOKS": {
+            "django.contrib.auth.models.User": ...,
+        },
+    }
+
+    for name, endpoint in [
+        ("foo", "http://www.example.com/foo"),
+        ("bar", "http://www.example.com/bar"),
+        ("baz", "http://www.example.org/baz"),
+    ]:
+        Webhook.objects.create(
+            name=name,
+            signal=SignalChoices.CREATE,
+            ref="django.contrib.auth.models.User",
+            endpoint=endpoint,
+        )
+
+    in_flight: dict[str, int] = {"www.example.com": 0, "www.example.org": 0}
+    max_in_flight: dict[str, int] = {"www.example.com": 0, "www.example.org": 0, "total": 0}
+
+    async def post(url, **kwargs):
+        host = url.split("/")[2]
+        in_flight[host] += 1
+        max_in_flight[host] = max(max_in_flight[host], in_flight[host])
+        max_in_flight["total"] = max(max_in_flight["total"], sum(in_flight.values()))
+        await asyncio.sleep(0.05)
+        in_flight[host] -= 1
+        return Response(204)
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", side_effect=post) as mock:
+        User.objects.create(username="x", email="user@user.com")
+
+    assert mock.call_count == 3
+    # Requests to the same host are sent one at a time, but other hosts are not blocked by them.
+    assert max_in_flight == {"www.example.com": 1, "www.example.org": 1, "total": 2}
+
+
+def test_webhook__single_webhook__loop_task_handler(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.loop_task_handler",
+        "HOOKS": {
+            "django.contrib.auth.models.User": ...,
+        },
+    }
+
+    Webhook.objects.create(
+        name="foo",
+        signal=SignalChoices.CREATE_UPDATE_DELETE_OR_M2M,
+        ref="django.contrib.auth.models.User",
+        endpoint="http://www.example.com/",
+    )
+
+    user = User(
+        username="x",
+        email="user@user.com",
+        is_staff=True,
+        is_superuser=True,
+    )
+
+    with (
+        patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock,
+        patch("signal_webhooks.handlers.Thread") as mock_thread,
+    ):
+        user.save()
+
+        # wait for the loop to finish
+        sleep(1)
+
+    mock.assert_called_once()
+    mock_thread.assert_not_called()
+
+    hook = Webhook.objects.get(name="foo")
+
+    assert hook.last_success is not None
+    assert hook.last_failure is None
+
+
+def test_webhook__loop_task_handler__custom_hooks(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.loop_task_handler",
+        "HOOKS": {
+            "django.contrib.auth.models.User": {
+                "CREATE": "tests.conftest.mock_hook",
+                "UPDATE": "tests.conftest.mock_async_hook",
+            },
+        },
+    }
+
+    user = User(
+        username="x",
+        email="user@user.com",
+        is_staff=True,
+        is_superuser=True,
+    )
+
+    with patch("tests.conftest.mock_side_effect") as mock:
+        user.save()
+        user.save()
+
+        # wait for the loop to finish
+        sleep(1)
+
+    assert mock.call_count == 2
+
+
+def test_webhook__single_webhook__pool_task_handler(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.pool_task_handler",
+        "HOOKS": {
+            "django.contrib.auth.models.User": ...,
+        },
+    }
+
+    Webhook.objects.create(
+        name="foo",
+        signal=SignalChoices.CREATE_UPDATE_DELETE_OR_M2M,
+        ref="django.contrib.auth.models.User",
+        endpoint="http://www.example.com/",
+    )
+
+    user = User(
+        username="x",
+        email="user@user.com",
+        is_staff=True,
+        is_superuser=True,
+    )
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock:
+        user.save()
+        assert worker_pool.join(timeout=5)
+
+    mock.assert_called_once()
+
+    hook = Webhook.objects.get(name="foo")
+
+    assert hook.last_success is not None
+    assert hook.last_failure is None
+
+
+def test_webhook__receivers_connected_only_for_hooked_models(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "HOOKS": {
+            "django.contrib.auth.models.User": ...,
+        },
+    }
+
+    with patch("signal_webhooks.handlers.webhook_handler") as mock:
+        Group.objects.create(name="foo")
+
+    mock.assert_not_called()
+
+    with patch("signal_webhooks.handlers.webhook_handler") as mock:
+        User.objects.create(username="x", email="user@user.com")
+
+    mock.assert_called_once()
+
+
+def test_webhook__receivers_reconnected_on_settings_change(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "HOOKS": {
+            "django.contrib.auth.models.User": ...,
+        },
+    }
+
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "HOOKS": {
+            "django.contrib.auth.models.Group": ...,
+        },
+    }
+
+    with patch("signal_webhooks.handlers.webhook_handler") as mock:
+        User.objects.create(username="x", email="user@user.com")
+
+    mock.assert_not_called()
+
+    with patch("signal_webhooks.handlers.webhook_handler") as mock:
+        Group.objects.create(name="foo")
+
+    mock.assert_called_once()
+
+
+def test_webhook__receivers_connected_for_reverse_m2m(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "HOOKS": {
+            "django.contrib.auth.models.Group": ...,
+        },
+    }
+
+    group = Group.objects.create(name="foo")
+    user = User.objects.create(username="x", email="user@user.com")
+
+    with patch("signal_webhooks.handlers.webhook_handler") as mock:
+        group.user_set.add(user)
+
+    mock.assert_called_once_with(instance=group, method="M2M_ADD", data=None)
+
+
+def test_webhook__hook_table(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "HOOKS": {
+            "django.contrib.auth.models.User": {
+                "CREATE": ...,
+                "UPDATE": "tests.conftest.mock_hook",
+                "DELETE": None,
+            },
+            "django.contrib.auth.models.Group": None,
+        },
+    }
+
+    assert webhook_settings.hook_table == {
+        (User, "CREATE"): ...,
+        (User, "UPDATE"): mock_hook,
+    }
+
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "HOOKS": {
+            "django.contrib.auth.models.Group": ...,
+        },
+    }
+
+    assert webhook_settings.hook_table == {
+        (Group, "CREATE"): ...,
+        (Group, "UPDATE"): ...,
+        (Group, "DELETE"): ...,
+        (Group, "M2M_ADD"): ...,
+        (Group, "M2M_REMOVE"): ...,
+        (Group, "M2M_CLEAR"): ...,
+    }
+
+
+def test_webhook__watched_fields(settings, mock_user):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "HOOKS": {
+            "django.contrib.auth.models.User": {
+                "CREATE": ...,
+                "UPDATE": ...,
+                "WATCHED_FIELDS": ["username", "email"],
+            },
+        },
+    }
+
+    patch_1 = "signal_webhooks.serializers._WebhookSerializer.serialize"
+    patch_2 = "signal_webhooks.handlers.default_hook_handler"
+
+    with patch(patch_1) as mock_1, patch(patch_2) as mock_2:
+        mock_user.save(update_fields=["last_login"])
+
+    mock_1.assert_not_called()
+    mock_2.assert_not_called()
+
+    with patch(patch_2) as mock_3:
+        mock_user.save(update_fields=["last_login", "email"])
+
+    mock_3.assert_called_once()
+
+    with patch(patch_2) as mock_4:
+        mock_user.save()
+
+    mock_4.assert_called_once()
+
+
+def test_webhook__watched_fields__not_a_field(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+    }
+
+    with pytest.raises(ImproperlyConfigured, match="'foo', which is not a field on the model"):
+        settings.SIGNAL_WEBHOOKS = {
+            "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+            "HOOKS": {
+                "django.contrib.auth.models.User": {
+                    "UPDATE": ...,
+                    "WATCHED_FIELDS": ["foo"],
+                },
+            },
+        }
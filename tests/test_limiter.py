@@ -0,0 +1,146 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth.models import User
+from httpx import Response
+
+from signal_webhooks.delivery import delivery_loop
+from signal_webhooks.limiter import AdaptiveLimiter
+from signal_webhooks.typing import SignalChoices
+
+pytestmark = [
+    pytest.mark.django_db(transaction=True),
+    pytest.mark.hooks(
+        {"ADAPTIVE_CONCURRENCY": True, "ADAPTIVE_CONCURRENCY_INITIAL": 1},
+        webhooks=[
+            {"name": name, "signal": SignalChoices.CREATE, "endpoint": f"http://www.example.com/{name}"}
+            for name in ("foo", "bar", "baz")
+        ],
+    ),
+]
+
+
+def test_adaptive_limiter(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "ADAPTIVE_CONCURRENCY_INITIAL": 2,
+        "ADAPTIVE_CONCURRENCY_MIN": 1,
+        "ADAPTIVE_CONCURRENCY_BACKOFF": 0.5,
+        "ADAPTIVE_CONCURRENCY_LATENCY_TOLERANCE": 2.0,
+    }
+
+    limiter = AdaptiveLimiter(maximum=4)
+    assert limiter.stats() == {"limit": 2, "in_flight": 0, "min_latency": None}
+
+    # Limit grows by one after "limit" successful requests with stable latency.
+    limiter.record(0.1, ok=True)
+    limiter.record(0.1, ok=True)
+    assert limiter.stats()["limit"] == 2
+    limiter.record(0.15, ok=True)
+    assert limiter.stats() == {"limit": 3, "in_flight": 0, "min_latency": 0.1}
+
+    # Higher latency leaves the limit as is.
+    limit = limiter.limit
+    limiter.record(0.5, ok=True)
+    assert limiter.limit == limit
+
+    # Failures cut the limit.
+    limiter.record(10, ok=False)
+    assert limiter.stats()["limit"] == 1
+    limit = limiter.limit
+
+    # Requests started before the last decrease don't decrease the limit again.
+    limiter.record(10, ok=False)
+    limiter.record(10, ok=False)
+    assert limiter.limit == limit
+
+    # Requests started after it do, but not below the minimum.
+    limiter.record(0, ok=False)
+    assert limiter.limit == 1
+    limiter.record(0, ok=False)
+    assert limiter.limit == 1
+
+    # Limit doesn't grow above the maximum.
+    for _ in range(100):
+        limiter.record(0.1, ok=True)
+    assert limiter.limit == 4
+
+
+def test_adaptive_limiter__in_flight(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "ADAPTIVE_CONCURRENCY_INITIAL": 2,
+    }
+
+    limiter = AdaptiveLimiter()
+    in_flight: list[int] = []
+
+    async def request():
+        async with limiter:
+            in_flight.append(limiter.in_flight)
+            await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(*(request() for _ in range(5)))
+
+    asyncio.run(main())
+
+    assert max(in_flight) == 2
+    assert limiter.in_flight == 0
+
+
+def test_adaptive_concurrency(hooks):
+    in_flight: list[int] = [0]
+    max_in_flight: list[int] = [0]
+
+    async def post(url, **kwargs):
+        in_flight[0] += 1
+        max_in_flight[0] = max(max_in_flight[0], in_flight[0])
+        await asyncio.sleep(0.05)
+        in_flight[0] -= 1
+        return Response(204)
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", side_effect=post) as mock:
+        User.objects.create(username="x", email="user@user.com")
+
+    assert mock.call_count == 3
+    # First request was sent alone, the limit grew after it succeeded.
+    assert max_in_flight[0] == 2
+
+    limits = delivery_loop.limits()
+    assert limits["http://www.example.com"]["limit"] == 2
+    assert limits["http://www.example.com"]["in_flight"] == 0
+    assert limits["http://www.example.com"]["min_latency"] >= 0.05
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(503)):
+        User.objects.create(username="y", email="user@user.com")
+
+    assert delivery_loop.limits()["http://www.example.com"]["limit"] == 1
+
+
+def test_adaptive_concurrency__concurrent_failures(hooks, settings):
+    settings.SIGNAL_WEBHOOKS = {**settings.SIGNAL_WEBHOOKS, "ADAPTIVE_CONCURRENCY_INITIAL": 4}
+
+    async def post(url, **kwargs):
+        await asyncio.sleep(0.05)
+        return Response(503)
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", side_effect=post) as mock:
+        User.objects.create(username="x", email="user@user.com")
+
+    assert mock.call_count == 3
+    # Requests failed at the same time, so the limit was only decreased once.
+    assert delivery_loop.limits()["http://www.example.com"]["limit"] == 2
+
+
+def test_adaptive_concurrency__not_enabled(hooks, settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "HOOKS": {
+            "django.contrib.auth.models.User": ...,
+        },
+    }
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)):
+        User.objects.create(username="x", email="user@user.com")
+
+    assert delivery_loop.limits() == {}
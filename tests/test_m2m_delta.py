@@ -0,0 +1,102 @@
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth.models import Group
+from django.db import transaction
+
+from signal_webhooks.typing import SignalChoices
+
+pytestmark = [
+    pytest.mark.django_db(transaction=True),
+    pytest.mark.hooks(
+        {
+            "M2M_DELTA_PAYLOADS": True,
+            "HOOKS": {
+                "django.contrib.auth.models.User": ...,
+                "django.contrib.auth.models.Group": ...,
+            },
+        },
+        webhooks=[
+            {"name": ref.rsplit(".", 1)[-1], "signal": SignalChoices.M2M, "ref": ref}
+            for ref in ("django.contrib.auth.models.User", "django.contrib.auth.models.Group")
+        ],
+    ),
+]
+
+
+@pytest.fixture()
+def groups():
+    with patch("signal_webhooks.handlers.webhook_handler"):
+        return [Group.objects.create(name=name) for name in ("foo", "bar")]
+
+
+def test_m2m_delta__add(mock_user, groups, hooks):
+    with patch("signal_webhooks.handlers.default_hook_handler") as mock:
+        mock_user.groups.add(*groups)
+
+    assert mock.call_args.kwargs["data"] == {
+        "model": "auth.user",
+        "pk": mock_user.pk,
+        "relation": "groups",
+        "added": sorted(group.pk for group in groups),
+        "removed": [],
+        "cleared": False,
+    }
+
+
+def test_m2m_delta__remove(mock_user, groups, hooks):
+    with patch("signal_webhooks.handlers.webhook_handler"):
+        mock_user.groups.add(*groups)
+
+    with patch("signal_webhooks.handlers.default_hook_handler") as mock:
+        mock_user.groups.remove(groups[0])
+
+    data = mock.call_args.kwargs["data"]
+    assert data["added"] == []
+    assert data["removed"] == [groups[0].pk]
+    assert data["cleared"] is False
+
+
+def test_m2m_delta__clear(mock_user, groups, hooks):
+    with patch("signal_webhooks.handlers.webhook_handler"):
+        mock_user.groups.add(*groups)
+
+    with patch("signal_webhooks.handlers.default_hook_handler") as mock:
+        mock_user.groups.clear()
+
+    data = mock.call_args.kwargs["data"]
+    assert data["added"] == []
+    assert data["removed"] == []
+    assert data["cleared"] is True
+
+
+def test_m2m_delta__reverse(mock_user, groups, hooks):
+    with patch("signal_webhooks.handlers.default_hook_handler") as mock:
+        groups[0].user_set.add(mock_user)
+
+    assert mock.call_args.kwargs["data"] == {
+        "model": "auth.group",
+        "pk": groups[0].pk,
+        "relation": "user_set",
+        "added": [mock_user.pk],
+        "removed": [],
+        "cleared": False,
+    }
+
+
+def test_m2m_delta__fire_on_commit__not_coalesced(mock_user, groups, hooks, settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "M2M_DELTA_PAYLOADS": True,
+        "FIRE_ON_COMMIT": True,
+        "HOOKS": {
+            "django.contrib.auth.models.User": ...,
+        },
+    }
+
+    with patch("signal_webhooks.handlers.default_hook_handler") as mock:
+        with transaction.atomic():
+            mock_user.groups.add(groups[0])
+            mock_user.groups.add(groups[1])
+
+    assert [call.kwargs["data"]["added"] for call in mock.call_args_list] == [[groups[0].pk], [groups[1].pk]]
@@ -0,0 +1,152 @@
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth.models import Group
+from django.core.signals import request_finished, request_started
+from django.db import transaction
+
+from signal_webhooks.memo import _scope, payload_memo
+from signal_webhooks.serializers import webhook_serializer
+from signal_webhooks.typing import SignalChoices
+
+pytestmark = [
+    pytest.mark.django_db(transaction=True),
+    pytest.mark.hooks(
+        {"PAYLOAD_MEMO": True},
+        webhooks=[{"name": "foo", "signal": SignalChoices.CREATE_UPDATE_DELETE_OR_M2M}],
+    ),
+]
+
+
+@pytest.fixture(autouse=True)
+def memo_scope():
+    with payload_memo.scope():
+        yield
+
+
+@pytest.fixture()
+def serialize():
+    with patch.object(webhook_serializer, "serialize", wraps=webhook_serializer.serialize) as mock:
+        yield mock
+
+
+def test_memo__unchanged_update(mock_user, hooks, serialize):
+    with patch("signal_webhooks.handlers.default_hook_handler") as mock:
+        mock_user.save()
+        mock_user.save()
+
+    assert serialize.call_count == 1
+    assert mock.call_args_list[0].kwargs["data"] is mock.call_args_list[1].kwargs["data"]
+
+
+def test_memo__changed_update(mock_user, hooks, serialize):
+    with patch("signal_webhooks.handlers.default_hook_handler") as mock:
+        mock_user.save()
+        mock_user.username = "y"
+        mock_user.save()
+
+    assert serialize.call_count == 2
+    assert mock.call_args.kwargs["data"]["fields"]["username"] == "y"
+
+
+def test_memo__m2m_changed(mock_user, hooks, serialize):
+    with patch("signal_webhooks.handlers.webhook_handler"):
+        group = Group.objects.create(name="foo")
+
+    with patch("signal_webhooks.handlers.default_hook_handler") as mock:
+        mock_user.save()
+        mock_user.groups.add(group)
+
+    assert serialize.call_count == 2
+    assert mock.call_args.kwargs["data"]["fields"]["groups"] == [group.pk]
+
+
+def test_memo__m2m_changed__not_serialized(mock_user, settings, serialize):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "PAYLOAD_MEMO": True,
+        "HOOKS": {
+            "django.contrib.auth.models.User": {
+                "UPDATE": ...,
+                "M2M_ADD": ...,
+                "EXCLUDE": ["groups", "user_permissions"],
+            },
+        },
+    }
+
+    with patch("signal_webhooks.handlers.webhook_handler"):
+        group = Group.objects.create(name="foo")
+
+    with patch("signal_webhooks.handlers.default_hook_handler") as mock:
+        mock_user.save()
+        mock_user.groups.add(group)
+
+    assert serialize.call_count == 1
+    assert mock.call_count == 2
+
+
+def test_memo__cleared_on_request(mock_user, hooks, serialize):
+    with patch("signal_webhooks.handlers.default_hook_handler"):
+        mock_user.save()
+        request_started.send(sender=None)
+        mock_user.save()
+
+    assert serialize.call_count == 2
+
+
+def test_memo__outside_scope(mock_user, hooks, serialize):
+    request_finished.send(sender=None)
+
+    with patch("signal_webhooks.handlers.default_hook_handler"):
+        mock_user.save()
+        mock_user.save()
+
+    assert serialize.call_count == 2
+
+
+def test_memo__rolled_back(mock_user, hooks, serialize):
+    with patch("signal_webhooks.handlers.webhook_handler"):
+        group = Group.objects.create(name="foo")
+
+    with patch("signal_webhooks.handlers.default_hook_handler") as mock:
+        with transaction.atomic():
+            mock_user.groups.add(group)
+            mock_user.save()
+            transaction.set_rollback(True)
+
+        mock_user.save()
+
+    assert serialize.call_count == 3
+    # Data memoized in the rolled back transaction is not used.
+    assert mock.call_args.kwargs["data"]["fields"]["groups"] == []
+
+
+def test_memo__not_enabled(mock_user, hooks, settings, serialize):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "HOOKS": {
+            "django.contrib.auth.models.User": ...,
+        },
+    }
+
+    with patch("signal_webhooks.handlers.default_hook_handler"):
+        mock_user.save()
+        mock_user.save()
+
+    assert serialize.call_count == 2
+
+
+def test_memo__size(mock_user, hooks, settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "PAYLOAD_MEMO": True,
+        "PAYLOAD_MEMO_SIZE": 2,
+    }
+
+    for name in ("x", "y", "z"):
+        mock_user.username = name
+        payload_memo.serialize(mock_user)
+
+    scope = _scope.get()
+    assert len(scope.data) == 2
+    assert payload_memo.key_for(mock_user) in scope.data
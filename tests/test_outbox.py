@@ -0,0 +1,289 @@
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+from freezegun import freeze_time
+from httpx import Response
+
+from signal_webhooks.models import OutboxEntry, Webhook
+from signal_webhooks.outbox import deliver_outbox
+from signal_webhooks.typing import SignalChoices
+from tests.my_app.models import MyModel
+
+pytestmark = [
+    pytest.mark.django_db(transaction=True),
+]
+
+
+def test_outbox(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.outbox_task_handler",
+        "HOOKS": {
+            "tests.my_app.models.MyModel": ...,
+        },
+    }
+
+    Webhook.objects.create(
+        name="foo",
+        signal=SignalChoices.CREATE,
+        ref="tests.my_app.models.MyModel",
+        endpoint="http://www.example.com/",
+    )
+    Webhook.objects.create(
+        name="bar",
+        signal=SignalChoices.CREATE,
+        ref="tests.my_app.models.MyModel",
+        endpoint="http://www.example.org/",
+    )
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock_1:
+        MyModel.objects.create(name="x")
+
+    mock_1.assert_not_called()
+
+    entries = list(OutboxEntry.objects.all())
+    assert len(entries) == 2
+    assert entries[0].event_id == entries[1].event_id
+    assert entries[0].ref == "tests.my_app.models.MyModel"
+    assert entries[0].method == "CREATE"
+    assert entries[0].payload == {"fizz": "buzz"}
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock_2:
+        call_command("runwebhookworker", "--once")
+
+    assert mock_2.call_count == 2
+    assert OutboxEntry.objects.count() == 0
+
+    hook = Webhook.objects.get(name="foo")
+    assert hook.last_success is not None
+    assert hook.last_failure is None
+
+
+def test_outbox__transaction_rolled_back(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.outbox_task_handler",
+        "HOOKS": {
+            "tests.my_app.models.MyModel": ...,
+        },
+    }
+
+    Webhook.objects.create(
+        name="foo",
+        signal=SignalChoices.CREATE,
+        ref="tests.my_app.models.MyModel",
+        endpoint="http://www.example.com/",
+    )
+
+    with pytest.raises(ValueError, match="foo"), transaction.atomic():
+        MyModel.objects.create(name="x")
+        assert OutboxEntry.objects.count() == 1
+        msg = "foo"
+        raise ValueError(msg)
+
+    assert OutboxEntry.objects.count() == 0
+
+
+def test_outbox__fire_on_commit(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.outbox_task_handler",
+        "FIRE_ON_COMMIT": True,
+        "HOOKS": {
+            "tests.my_app.models.MyModel": ...,
+        },
+    }
+
+    Webhook.objects.create(
+        name="foo",
+        signal=SignalChoices.CREATE,
+        ref="tests.my_app.models.MyModel",
+        endpoint="http://www.example.com/",
+    )
+
+    # Outbox entries are saved in the same transaction, not after it's committed.
+    with transaction.atomic():
+        MyModel.objects.create(name="x")
+        assert OutboxEntry.objects.count() == 1
+
+    assert OutboxEntry.objects.count() == 1
+
+
+def test_outbox__failure(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.outbox_task_handler",
+        "OUTBOX_RETRY_DELAY": 0,
+        "OUTBOX_MAX_ATTEMPTS": 2,
+        "HOOKS": {
+            "tests.my_app.models.MyModel": ...,
+        },
+    }
+
+    Webhook.objects.create(
+        name="foo",
+        signal=SignalChoices.CREATE,
+        ref="tests.my_app.models.MyModel",
+        endpoint="http://www.example.com/",
+    )
+
+    MyModel.objects.create(name="x")
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(502)) as mock_1:
+        assert deliver_outbox() == 1
+
+    mock_1.assert_called_once()
+
+    entry = OutboxEntry.objects.get()
+    assert entry.attempts == 1
+
+    hook = Webhook.objects.get(name="foo")
+    assert hook.last_failure is not None
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(502)) as mock_2:
+        assert deliver_outbox() == 1
+
+    mock_2.assert_called_once()
+
+    # Gave up after max attempts.
+    assert OutboxEntry.objects.count() == 0
+
+
+def test_outbox__webhook_disabled(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.outbox_task_handler",
+        "HOOKS": {
+            "tests.my_app.models.MyModel": ...,
+        },
+    }
+
+    Webhook.objects.create(
+        name="foo",
+        signal=SignalChoices.CREATE,
+        ref="tests.my_app.models.MyModel",
+        endpoint="http://www.example.com/",
+    )
+
+    MyModel.objects.create(name="x")
+    Webhook.objects.update(enabled=False)
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock:
+        assert deliver_outbox() == 1
+
+    mock.assert_not_called()
+    assert OutboxEntry.objects.count() == 0
+
+
+def test_outbox__custom_hook(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.outbox_task_handler",
+        "HOOKS": {
+            "tests.my_app.models.MyModel": {
+                "CREATE": "tests.conftest.mock_hook",
+            },
+        },
+    }
+
+    with patch("tests.conftest.mock_side_effect") as mock:
+        MyModel.objects.create(name="x")
+
+    mock.assert_called_once()
+    assert OutboxEntry.objects.count() == 0
+
+
+def test_outbox__claimed_entries_are_skipped(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.outbox_task_handler",
+        "HOOKS": {
+            "tests.my_app.models.MyModel": ...,
+        },
+    }
+
+    Webhook.objects.create(
+        name="foo",
+        signal=SignalChoices.CREATE,
+        ref="tests.my_app.models.MyModel",
+        endpoint="http://www.example.com/",
+    )
+
+    MyModel.objects.create(name="x")
+    MyModel.objects.create(name="y")
+
+    claimed = OutboxEntry.objects.claim("worker-1", batch_size=1)
+    assert len(claimed) == 1
+    assert claimed[0].locked_by == "worker-1"
+    assert claimed[0].locked_until is not None
+
+    # Another worker only gets the entry that wasn't claimed yet.
+    other = OutboxEntry.objects.claim("worker-2", batch_size=10)
+    assert len(other) == 1
+    assert other[0].id != claimed[0].id
+
+    assert OutboxEntry.objects.claim("worker-3", batch_size=10) == []
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock:
+        assert deliver_outbox(worker_id="worker-3") == 0
+
+    mock.assert_not_called()
+    assert OutboxEntry.objects.count() == 2
+
+
+def test_outbox__expired_claims_are_released(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.outbox_task_handler",
+        "HOOKS": {
+            "tests.my_app.models.MyModel": ...,
+        },
+    }
+
+    Webhook.objects.create(
+        name="foo",
+        signal=SignalChoices.CREATE,
+        ref="tests.my_app.models.MyModel",
+        endpoint="http://www.example.com/",
+    )
+
+    MyModel.objects.create(name="x")
+
+    with freeze_time("2024-01-01T00:00:00Z"):
+        OutboxEntry.objects.update(next_attempt_at=timezone.now())
+        assert len(OutboxEntry.objects.claim("crashed-worker", batch_size=10)) == 1
+        assert OutboxEntry.objects.release_expired() == 0
+
+    # Claim has expired, so the entry is released, and another worker can send it.
+    assert OutboxEntry.objects.release_expired() == 1
+
+    entry = OutboxEntry.objects.get()
+    assert entry.locked_by == ""
+    assert entry.locked_until is None
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock:
+        call_command("runwebhookworker", "--once", "--worker-id", "worker-1")
+
+    mock.assert_called_once()
+    assert OutboxEntry.objects.count() == 0
+
+
+def test_outbox__failed_entries_are_released(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.outbox_task_handler",
+        "HOOKS": {
+            "tests.my_app.models.MyModel": ...,
+        },
+    }
+
+    Webhook.objects.create(
+        name="foo",
+        signal=SignalChoices.CREATE,
+        ref="tests.my_app.models.MyModel",
+        endpoint="http://www.example.com/",
+    )
+
+    MyModel.objects.create(name="x")
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(502)):
+        assert deliver_outbox(worker_id="worker-1") == 1
+
+    entry = OutboxEntry.objects.get()
+    assert entry.attempts == 1
+    assert entry.locked_by == ""
+    assert entry.locked_until is None
@@ -0,0 +1,204 @@
+from threading import Event
+from unittest.mock import MagicMock
+
+from signal_webhooks.pool import WorkerPool
+from tests.my_app.models import MyModel
+
+
+def block_until(event: Event, **kwargs):
+    event.wait(timeout=5)
+
+
+def test_worker_pool(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_POOL_WORKERS": 2,
+    }
+
+    pool = WorkerPool()
+    hook = MagicMock()
+
+    for i in range(10):
+        pool.submit(hook, index=i)
+
+    assert pool.join(timeout=5)
+
+    assert hook.call_count == 10
+    assert len(pool._workers) == 2
+    assert pool.stats() == {
+        "submitted": 10,
+        "processed": 10,
+        "failed": 0,
+        "dropped": 0,
+        "coalesced": 0,
+        "queued": 0,
+    }
+
+
+def test_worker_pool__failed(settings):
+    pool = WorkerPool()
+    hook = MagicMock(side_effect=ValueError("foo"))
+
+    pool.submit(hook)
+
+    assert pool.join(timeout=5)
+    assert pool.stats()["failed"] == 1
+
+
+def test_worker_pool__drop_newest(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_POOL_WORKERS": 1,
+        "TASK_POOL_QUEUE_SIZE": 2,
+        "TASK_POOL_FULL_POLICY": "drop_newest",
+    }
+
+    pool = WorkerPool()
+    event = Event()
+    hook = MagicMock()
+
+    pool.submit(block_until, event=event)
+    pool.join(timeout=0.1)  # Let the worker pick up the blocking task
+
+    for i in range(4):
+        pool.submit(hook, index=i)
+
+    event.set()
+    assert pool.join(timeout=5)
+
+    assert [call.kwargs["index"] for call in hook.call_args_list] == [0, 1]
+    assert pool.stats()["dropped"] == 2
+
+
+def test_worker_pool__drop_oldest(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_POOL_WORKERS": 1,
+        "TASK_POOL_QUEUE_SIZE": 2,
+        "TASK_POOL_FULL_POLICY": "drop_oldest",
+    }
+
+    pool = WorkerPool()
+    event = Event()
+    hook = MagicMock()
+
+    pool.submit(block_until, event=event)
+    pool.join(timeout=0.1)  # Let the worker pick up the blocking task
+
+    for i in range(4):
+        pool.submit(hook, index=i)
+
+    event.set()
+    assert pool.join(timeout=5)
+
+    assert [call.kwargs["index"] for call in hook.call_args_list] == [2, 3]
+    assert pool.stats()["dropped"] == 2
+
+
+def test_worker_pool__drop_oldest__no_queue(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_POOL_WORKERS": 1,
+        "TASK_POOL_QUEUE_SIZE": 0,
+        "TASK_POOL_FULL_POLICY": "drop_oldest",
+    }
+
+    pool = WorkerPool()
+    hook = MagicMock()
+
+    # There is no older task to drop, so the new one is dropped.
+    pool.submit(hook)
+
+    assert pool.join(timeout=5)
+    hook.assert_not_called()
+    assert pool.stats()["dropped"] == 1
+
+
+def test_worker_pool__block__submitted_from_worker(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_POOL_WORKERS": 1,
+        "TASK_POOL_QUEUE_SIZE": 1,
+        "TASK_POOL_FULL_POLICY": "block",
+    }
+
+    pool = WorkerPool()
+    event = Event()
+    hook = MagicMock()
+
+    def submit_more(**kwargs):
+        # Queue is full, and the only worker is this one.
+        pool.submit(block_until, event=event)
+        pool.submit(hook, index=0)
+
+    pool.submit(submit_more)
+
+    # Task submitted to the full queue was run in the worker instead of waiting.
+    assert not pool.join(timeout=0.5)
+    hook.assert_called_once_with(index=0)
+
+    event.set()
+    assert pool.join(timeout=5)
+    assert pool.stats()["processed"] == 3
+
+
+def test_worker_pool__coalesce(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_POOL_WORKERS": 1,
+        "TASK_POOL_FULL_POLICY": "coalesce",
+    }
+
+    pool = WorkerPool()
+    event = Event()
+    hook = MagicMock()
+
+    pool.submit(block_until, event=event)
+    pool.join(timeout=0.1)  # Let the worker pick up the blocking task
+
+    item_1 = MyModel(pk=1, name="x")
+    item_2 = MyModel(pk=2, name="y")
+
+    pool.submit(hook, instance=item_1, data={"name": "x"}, method="UPDATE")
+    pool.submit(hook, instance=item_2, data={"name": "y"}, method="UPDATE")
+    pool.submit(hook, instance=item_1, data={"name": "xx"}, method="UPDATE")
+    pool.submit(hook, instance=item_1, data={"name": "xx"}, method="DELETE")
+
+    event.set()
+    assert pool.join(timeout=5)
+
+    assert [(call.kwargs["data"], call.kwargs["method"]) for call in hook.call_args_list] == [
+        ({"name": "xx"}, "UPDATE"),
+        ({"name": "y"}, "UPDATE"),
+        ({"name": "xx"}, "DELETE"),
+    ]
+    assert pool.stats()["coalesced"] == 1
+
+
+def test_worker_pool__coalesce__partial_data(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_POOL_WORKERS": 1,
+        "TASK_POOL_FULL_POLICY": "coalesce",
+        "M2M_DELTA_PAYLOADS": True,
+    }
+
+    pool = WorkerPool()
+    event = Event()
+    hook = MagicMock()
+
+    pool.submit(block_until, event=event)
+    pool.join(timeout=0.1)  # Let the worker pick up the blocking task
+
+    item_1 = MyModel(pk=1, name="x")
+
+    # Bulk payloads for the same first instance contain different instances.
+    pool.submit(hook, instance=item_1, data=[{"name": "x"}, {"name": "y"}], method="UPDATE")
+    pool.submit(hook, instance=item_1, data=[{"name": "x"}, {"name": "z"}], method="UPDATE")
+    # Many-to-many deltas only contain their own changes.
+    pool.submit(hook, instance=item_1, data={"added": [1]}, method="M2M_ADD")
+    pool.submit(hook, instance=item_1, data={"added": [2]}, method="M2M_ADD")
+
+    event.set()
+    assert pool.join(timeout=5)
+
+    assert [call.kwargs["data"] for call in hook.call_args_list] == [
+        [{"name": "x"}, {"name": "y"}],
+        [{"name": "x"}, {"name": "z"}],
+        {"added": [1]},
+        {"added": [2]},
+    ]
+    assert pool.stats()["coalesced"] == 0
@@ -0,0 +1,124 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from freezegun import freeze_time
+from httpx import Response
+
+from signal_webhooks.models import Webhook
+from signal_webhooks.ratelimit import CacheTokenBuckets, LocalTokenBuckets, RateLimiter, take_token
+from signal_webhooks.typing import SignalChoices
+
+pytestmark = [
+    pytest.mark.django_db(transaction=True),
+    pytest.mark.hooks(
+        webhooks=[
+            {"name": "foo", "signal": SignalChoices.CREATE, "endpoint": "http://www.example.com/foo", "rate_limit": 2},
+            {"name": "bar", "signal": SignalChoices.CREATE, "endpoint": "http://www.example.com/bar"},
+        ],
+    ),
+]
+
+
+def test_take_token():
+    assert take_token(tokens=2, updated=0, now=0, rate=2) == (1, 0)
+    assert take_token(tokens=0, updated=0, now=0, rate=2) == (-1, 0.5)
+    assert take_token(tokens=-1, updated=0, now=0, rate=2) == (-2, 1)
+    # Tokens are refilled at the rate, up to the rate.
+    assert take_token(tokens=-1, updated=0, now=1, rate=2) == (0, 0)
+    assert take_token(tokens=0, updated=0, now=10, rate=2) == (1, 0)
+
+
+def test_local_token_buckets():
+    buckets = LocalTokenBuckets()
+
+    with freeze_time("2022-01-01T00:00:00"):
+        assert buckets.reserve("foo", rate=2) == 0
+        assert buckets.reserve("foo", rate=2) == 0
+        assert buckets.reserve("foo", rate=2) == 0.5
+        assert buckets.reserve("foo", rate=2) == 1
+        # Other buckets are not affected.
+        assert buckets.reserve("bar", rate=2) == 0
+
+
+def test_cache_token_buckets(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "RATE_LIMIT_KEY_PREFIX": "rate-limit",
+    }
+
+    buckets = CacheTokenBuckets()
+
+    with freeze_time("2022-01-01T00:00:00"):
+        assert buckets.reserve("default", "foo", rate=2) == 0
+        assert buckets.reserve("default", "foo", rate=2) == 0
+        assert buckets.reserve("default", "foo", rate=2) == 0.5
+
+        # Buckets are shared through the cache.
+        assert CacheTokenBuckets().reserve("default", "foo", rate=2) == 1
+        assert caches["default"].get("rate-limit:foo") == (-2, 1640995200)
+        assert caches["default"].get("rate-limit:foo:lock") is None
+
+    caches["default"].clear()
+
+
+def test_cache_token_buckets__lock_timeout(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "RATE_LIMIT_KEY_PREFIX": "rate-limit",
+    }
+
+    # Lock is held by another process.
+    caches["default"].add("rate-limit:foo:lock", "x", timeout=60)
+
+    with (
+        patch.object(CacheTokenBuckets, "lock_wait", 0.01),
+        pytest.raises(TimeoutError, match="Could not acquire the rate limit lock 'rate-limit:foo:lock'"),
+    ):
+        CacheTokenBuckets().reserve("default", "foo", rate=2)
+
+    caches["default"].clear()
+
+
+def test_rate_limit__lock_timeout(hooks, settings, caplog):
+    settings.SIGNAL_WEBHOOKS = {
+        **settings.SIGNAL_WEBHOOKS,
+        "RATE_LIMIT_BACKEND": "default",
+        "RATE_LIMIT_KEY_PREFIX": "rate-limit",
+    }
+
+    hook = Webhook.objects.get(name="foo")
+    caches["default"].add(f"rate-limit:{RateLimiter.key_for(hook)}:lock", "x", timeout=60)
+
+    with (
+        patch.object(CacheTokenBuckets, "lock_wait", 0.01),
+        patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock,
+    ):
+        User.objects.create(username="x", email="user@user.com")
+
+    # Process-local bucket was used instead.
+    assert mock.call_count == 2
+    assert "Using the process-local rate limit for webhook 'foo'." in caplog.text
+
+    caches["default"].clear()
+
+
+@pytest.mark.parametrize("backend", [None, "default"])
+def test_rate_limit(hooks, settings, backend):
+    settings.SIGNAL_WEBHOOKS = {**settings.SIGNAL_WEBHOOKS, "RATE_LIMIT_BACKEND": backend}
+
+    with (
+        freeze_time("2022-01-01T00:00:00"),
+        patch("signal_webhooks.ratelimit.asyncio.sleep", new_callable=AsyncMock) as mock_sleep,
+        patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(204)) as mock_post,
+    ):
+        User.objects.create(username="x", email="user@user.com")
+        User.objects.create(username="y", email="user@user.com")
+        mock_sleep.assert_not_called()
+
+        # Delayed rather than dropped.
+        User.objects.create(username="z", email="user@user.com")
+        mock_sleep.assert_called_once_with(0.5)
+
+    assert mock_post.call_count == 6
+
+    caches["default"].clear()
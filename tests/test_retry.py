@@ -0,0 +1,210 @@
+import datetime
+from unittest.mock import patch
+
+import httpx
+import pytest
+from django.contrib.auth.models import User
+from django.utils import timezone
+from django.utils.http import http_date
+from freezegun import freeze_time
+from httpx import Response
+
+from signal_webhooks.delivery import delivery_loop
+from signal_webhooks.models import OutboxEntry, Webhook
+from signal_webhooks.outbox import deliver_outbox
+from signal_webhooks.retry import is_retryable, parse_retry_after, retry_delay, retry_scheduler
+from signal_webhooks.typing import SignalChoices
+from tests.my_app.models import MyModel
+
+pytestmark = [
+    pytest.mark.django_db(transaction=True),
+    pytest.mark.hooks({"MAX_ATTEMPTS": 3, "RETRY_BACKOFF": 0}),
+]
+
+
+def create_user() -> None:
+    User.objects.create(username="x", email="user@user.com")
+    delivery_loop.run(retry_scheduler.join())
+
+
+def test_retry_delay(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "RETRY_BACKOFF_MAX": 100,
+    }
+
+    assert 5 <= retry_delay(1, base=10) <= 10
+    assert 10 <= retry_delay(2, base=10) <= 20
+    assert 20 <= retry_delay(3, base=10) <= 40
+    assert 50 <= retry_delay(10, base=10) <= 100
+    assert retry_delay(1, base=10, retry_after=30) == 30
+    assert retry_delay(1, base=10, retry_after=1000) == 100
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(Response(429, headers={"Retry-After": "120"})) == 120
+    assert parse_retry_after(Response(503, headers={"Retry-After": "foo"})) is None
+    assert parse_retry_after(Response(503)) is None
+    assert parse_retry_after(Response(500, headers={"Retry-After": "120"})) is None
+
+    with freeze_time("2022-01-01T00:00:00"):
+        retry_at = datetime.datetime(2022, 1, 1, 0, 1, tzinfo=datetime.UTC)
+        response = Response(503, headers={"Retry-After": http_date(retry_at.timestamp())})
+        assert parse_retry_after(response) == 60
+
+
+def test_is_retryable():
+    assert is_retryable(Response(502))
+    assert is_retryable(Response(429))
+    assert not is_retryable(Response(400))
+    assert not is_retryable(Response(404))
+    assert is_retryable(None, httpx.ConnectTimeout("foo"))
+    assert not is_retryable(None, ValueError("foo"))
+
+
+def test_retry(hooks):
+    responses = [Response(502), Response(503), Response(204)]
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", side_effect=responses) as mock:
+        create_user()
+
+    assert mock.call_count == 3
+
+    hook = Webhook.objects.get(name="foo")
+    assert hook.last_success is not None
+
+
+def test_retry__gives_up(hooks):
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(502)) as mock:
+        create_user()
+
+    assert mock.call_count == 3
+
+    hook = Webhook.objects.get(name="foo")
+    assert hook.last_success is None
+    assert hook.last_failure is not None
+
+
+def test_retry__not_retryable(hooks):
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(400)) as mock:
+        create_user()
+
+    assert mock.call_count == 1
+
+
+def test_retry__webhook_max_attempts(hooks):
+    Webhook.objects.update(max_attempts=5)
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(502)) as mock:
+        create_user()
+
+    assert mock.call_count == 5
+
+
+def test_retry__not_enabled(hooks, settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "HOOKS": {
+            "django.contrib.auth.models.User": ...,
+        },
+    }
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(502)) as mock:
+        create_user()
+
+    assert mock.call_count == 1
+
+
+def test_retry__webhook_disabled(hooks):
+    def post(*args, **kwargs):
+        # Webhook is disabled after the first attempt.
+        Webhook.objects.update(enabled=False)
+        return Response(502)
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", side_effect=post) as mock:
+        create_user()
+
+    assert mock.call_count == 1
+
+
+def test_retry__webhook_changed(hooks):
+    responses = [Response(502), Response(204)]
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", side_effect=responses) as mock:
+        User.objects.create(username="x", email="user@user.com")
+        Webhook.objects.update(endpoint="http://www.example.org/", headers={"Authorization": "foo"})
+        delivery_loop.run(retry_scheduler.join())
+
+    assert mock.call_count == 2
+    # Retry uses the current endpoint and headers of the webhook.
+    assert mock.call_args.args[0] == "http://www.example.org/"
+    assert mock.call_args.kwargs["headers"]["Authorization"] == "foo"
+
+
+def test_retry__retry_after(hooks):
+    response = Response(429, headers={"Retry-After": "30"})
+    with (
+        patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=response),
+        patch("signal_webhooks.handlers.retry_scheduler.schedule") as mock,
+    ):
+        create_user()
+
+    assert mock.call_args.args[2:] == (2, 30)
+
+
+@freeze_time("2022-01-01T00:00:00")
+def test_retry__outbox(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.outbox_task_handler",
+        "HOOKS": {
+            "tests.my_app.models.MyModel": ...,
+        },
+    }
+
+    Webhook.objects.create(
+        name="foo",
+        signal=SignalChoices.CREATE,
+        ref="tests.my_app.models.MyModel",
+        endpoint="http://www.example.com/",
+        max_attempts=2,
+    )
+
+    MyModel.objects.create(name="x")
+
+    response = Response(503, headers={"Retry-After": "120"})
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=response):
+        assert deliver_outbox() == 1
+
+    entry = OutboxEntry.objects.get()
+    assert entry.attempts == 1
+    assert entry.next_attempt_at == timezone.now() + datetime.timedelta(seconds=120)
+
+    with (
+        freeze_time("2022-01-01T00:02:00"),
+        patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(502)),
+    ):
+        assert deliver_outbox() == 1
+
+    # Gave up after the webhook's max attempts.
+    assert OutboxEntry.objects.count() == 0
+
+
+def test_retry__outbox__not_retryable(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.outbox_task_handler",
+        "HOOKS": {
+            "tests.my_app.models.MyModel": ...,
+        },
+    }
+
+    Webhook.objects.create(
+        name="foo",
+        signal=SignalChoices.CREATE,
+        ref="tests.my_app.models.MyModel",
+        endpoint="http://www.example.com/",
+    )
+
+    MyModel.objects.create(name="x")
+
+    with patch("signal_webhooks.handlers.httpx.AsyncClient.post", return_value=Response(400)):
+        assert deliver_outbox() == 1
+
+    assert OutboxEntry.objects.count() == 0
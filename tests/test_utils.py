@@ -1,18 +1,26 @@
+import datetime
 import random
 import re
 import string
+import uuid
+from decimal import Decimal
 
 import pytest
-from django.contrib.auth.models import Group, User
-from django.core.exceptions import ValidationError
+from django.contrib.auth.models import Group, Permission, User
+from django.core.exceptions import ImproperlyConfigured, ValidationError
 from freezegun import freeze_time
 
+from signal_webhooks.models import Webhook
 from signal_webhooks.typing import MAX_COL_SIZE
 from signal_webhooks.utils import (
     decode_cipher_key,
+    default_json_encoder,
     default_serializer,
+    encode_payload,
+    fast_serializer,
     is_dict,
     model_from_reference,
+    orjson_encoder,
     random_cipher_key,
     truncate,
 )
@@ -200,3 +208,151 @@ def test_default_serializer__mymodel():
     data = default_serializer(mymodel)
 
     assert data == {"fizz": "buzz"}
+
+
+@freeze_time("2022-01-01T00:00:00")
+@pytest.mark.django_db()
+def test_fast_serializer__user():
+    user = User.objects.create(username="x", email="user@user.com")
+    user.groups.add(Group.objects.create(name="x"), Group.objects.create(name="y"))
+    user.user_permissions.add(Permission.objects.first())
+
+    assert fast_serializer(user) == default_serializer(user)
+
+    user = User.objects.prefetch_related("groups").get(pk=user.pk)
+
+    assert fast_serializer(user) == default_serializer(user)
+
+
+@freeze_time("2022-01-01T00:00:00")
+@pytest.mark.django_db()
+def test_fast_serializer__webhook(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "CIPHER_KEY": random_cipher_key(),
+    }
+
+    hook = Webhook.objects.create(
+        name="foo",
+        ref="django.contrib.auth.models.User",
+        endpoint="http://www.example.com/",
+        headers={"foo": "bar", "fizz": [1, None, True]},
+        auth_token="Bearer foo",
+    )
+
+    assert fast_serializer(hook) == default_serializer(hook)
+
+
+@pytest.mark.django_db()
+def test_fast_serializer__foreign_key():
+    permission = Permission.objects.first()
+
+    assert fast_serializer(permission) == default_serializer(permission)
+
+
+@pytest.mark.django_db()
+def test_fast_serializer__deleted():
+    user = User.objects.create(username="x", email="user@user.com")
+    user.groups.add(Group.objects.create(name="x"))
+    user.delete()
+
+    assert fast_serializer(user) == default_serializer(user)
+
+
+@pytest.mark.django_db()
+def test_fast_serializer__mymodel():
+    mymodel = MyModel.objects.create(name="x")
+
+    assert fast_serializer(mymodel) == {"fizz": "buzz"}
+
+
+JSON_DATA = {
+    "datetime": datetime.datetime(2022, 1, 1, tzinfo=datetime.UTC),
+    "date": datetime.date(2022, 1, 1),
+    "decimal": Decimal("1.10"),
+    "uuid": uuid.UUID("2a5b4c8f-1f6e-4bd6-9b4a-6fd3f0c0e0a1"),
+    "list": [1, 1.5, None, True, "ä"],
+    1: "x",
+}
+
+JSON_BYTES = (
+    '{"datetime":"2022-01-01 00:00:00+00:00","date":"2022-01-01","decimal":"1.10",'
+    '"uuid":"2a5b4c8f-1f6e-4bd6-9b4a-6fd3f0c0e0a1","list":[1,1.5,null,true,"ä"],"1":"x"}'
+).encode()
+
+
+def test_default_json_encoder():
+    assert default_json_encoder(JSON_DATA) == JSON_BYTES
+
+
+def test_orjson_encoder():
+    pytest.importorskip("orjson")
+
+    assert orjson_encoder(JSON_DATA) == JSON_BYTES
+
+
+def test_encode_payload__json_encoder(settings):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "JSON_ENCODER": "signal_webhooks.utils.orjson_encoder",
+    }
+    pytest.importorskip("orjson")
+
+    assert encode_payload(JSON_DATA) == JSON_BYTES
+
+
+@pytest.mark.parametrize("serializer", [default_serializer, fast_serializer])
+@pytest.mark.django_db()
+def test_serializer__fields(settings, serializer):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "HOOKS": {
+            "django.contrib.auth.models.User": {
+                "CREATE": ...,
+                "FIELDS": ["username", "email", "groups"],
+            },
+        },
+    }
+
+    user = User.objects.create(username="x", email="user@user.com")
+
+    assert serializer(user) == {
+        "fields": {"email": "user@user.com", "groups": [], "username": "x"},
+        "model": "auth.user",
+        "pk": user.pk,
+    }
+
+
+@pytest.mark.parametrize("serializer", [default_serializer, fast_serializer])
+@pytest.mark.django_db()
+def test_serializer__exclude(settings, serializer):
+    settings.SIGNAL_WEBHOOKS = {
+        "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+        "HOOKS": {
+            "django.contrib.auth.models.Permission": {
+                "CREATE": ...,
+                "EXCLUDE": ["name", "content_type"],
+            },
+        },
+    }
+
+    permission = Permission.objects.first()
+
+    assert serializer(permission) == {
+        "fields": {"codename": permission.codename},
+        "model": "auth.permission",
+        "pk": permission.pk,
+    }
+
+
+def test_serializer__fields__not_a_field(settings):
+    with pytest.raises(ImproperlyConfigured, match="'HOOKS\\[django.contrib.auth.models.User\\]\\[EXCLUDE\\]' contains 'foo'"):
+        settings.SIGNAL_WEBHOOKS = {
+            "TASK_HANDLER": "signal_webhooks.handlers.sync_task_handler",
+            "HOOKS": {
+                "django.contrib.auth.models.User": {
+                    "CREATE": ...,
+                    "EXCLUDE": ["foo"],
+                },
+            },
+        }